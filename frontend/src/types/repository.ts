@@ -11,9 +11,11 @@ export interface Repository {
   has_package_swift: boolean;
   swift_tools_version: string;
   dependencies_count: number;
+  transitive_dependents: number;
   linux_compatible: boolean;
   android_compatible: boolean;
   current_state: string;
+  priority_score: number | null;
   created_at: string;
   updated_at: string;
   pushed_at: string | null;
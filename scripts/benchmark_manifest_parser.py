@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Package.swift dependency parser against the legacy regex
+extractor on every stored manifest.
+
+Usage:
+  python scripts/benchmark_manifest_parser.py                  # Stored manifests
+  python scripts/benchmark_manifest_parser.py --dir MANIFESTS  # Also *.swift files
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.manifest_parser import _parse_dependencies, extract_dependencies
+
+
+def extract_dependencies_legacy(package_content: str) -> List[Dict]:
+    """Regex-based extractor src.manifest_parser replaced."""
+    dependencies = []
+
+    # Look for .package patterns
+    package_patterns = re.findall(r"\.package\([^)]+\)", package_content)
+
+    for pattern in package_patterns:
+        dep_info = {}
+
+        # Extract URL
+        url_match = re.search(r'url:\s*["\']([^"\']+)["\']', pattern)
+        if url_match:
+            dep_info["url"] = url_match.group(1)
+
+        # Extract version requirements
+        version_match = re.search(r'from:\s*["\']([^"\']+)["\']', pattern)
+        if version_match:
+            dep_info["version_requirement"] = f"from: {version_match.group(1)}"
+
+        if dep_info:
+            dependencies.append(dep_info)
+
+    return dependencies
+
+
+def load_manifests(manifest_dir=None):
+    """Return (label, content) for stored manifests and any *.swift files."""
+    from src.models import Repository, SessionLocal
+
+    db = SessionLocal()
+    try:
+        manifests = [
+            (url, content)
+            for url, content in db.query(
+                Repository.url, Repository.package_swift_content
+            ).filter(Repository.package_swift_content.isnot(None))
+        ]
+    finally:
+        db.close()
+
+    if manifest_dir:
+        for path in sorted(Path(manifest_dir).rglob("*.swift")):
+            manifests.append((str(path), path.read_text(errors="replace")))
+    return manifests
+
+
+def time_parser(parser, contents, repeat: int):
+    """Return (results, CPU seconds per pass over contents)."""
+    start = time.process_time()
+    for _ in range(repeat):
+        results = [parser(content) for content in contents]
+    return results, (time.process_time() - start) / repeat
+
+
+def sources(dependencies):
+    """The url/path/id of each dependency."""
+    return {
+        dep.get("url") or dep.get("path") or dep.get("id")
+        for dep in dependencies
+        if dep.get("url") or dep.get("path") or dep.get("id")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", help="Directory of additional Package.swift files")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per manifest (default: 3)"
+    )
+    parser.add_argument(
+        "--show", type=int, default=5, help="Differing manifests to list (default: 5)"
+    )
+    args = parser.parse_args()
+
+    manifests = load_manifests(args.dir)
+    if not manifests:
+        print("No stored manifests found (package_swift_content is empty)")
+        return 1
+    labels, contents = zip(*manifests)
+
+    legacy, legacy_time = time_parser(
+        extract_dependencies_legacy, contents, args.repeat
+    )
+    parsed, parse_time = time_parser(_parse_dependencies, contents, args.repeat)
+    for content in contents:  # Fill the memo so the timed runs are all hits
+        extract_dependencies(content)
+    _, cached_time = time_parser(extract_dependencies, contents, args.repeat)
+
+    total_bytes = sum(len(content) for content in contents)
+    print(f"Manifests: {len(contents)} ({total_bytes / 1024:.0f} KiB)")
+    for name, seconds in (
+        ("Legacy regex", legacy_time),
+        ("Tokenizer", parse_time),
+        ("Memoized", cached_time),
+    ):
+        rate = len(contents) / seconds if seconds else float("inf")
+        print(
+            f"{name + ':':14}{seconds / len(contents) * 1000:8.3f} ms/manifest"
+            f"  {rate:10.0f} manifests/s"
+        )
+
+    legacy_found = parsed_found = missed = spurious = 0
+    legacy_requirements = parsed_requirements = 0
+    differing = []
+    for label, old, new in zip(labels, legacy, parsed):
+        old_sources, new_sources = sources(old), sources(new)
+        legacy_found += len(old)
+        parsed_found += len(new)
+        legacy_requirements += sum(1 for dep in old if "version_requirement" in dep)
+        parsed_requirements += sum(1 for dep in new if "version_requirement" in dep)
+        missed += len(new_sources - old_sources)
+        spurious += len(old_sources - new_sources) + (len(old) - len(old_sources))
+        if old_sources != new_sources:
+            differing.append((label, old_sources, new_sources))
+
+    print(f"Dependencies found:     legacy {legacy_found}, tokenizer {parsed_found}")
+    print(
+        f"With a requirement:     legacy {legacy_requirements}, "
+        f"tokenizer {parsed_requirements}"
+    )
+    print(f"Missed by legacy:       {missed}")
+    print(f"Legacy-only entries:    {spurious} (comments, duplicates, no source)")
+    print(f"Manifests that differ:  {len(differing)}/{len(contents)}")
+    for label, old_sources, new_sources in differing[: args.show]:
+        print(f"  {label}")
+        for source in sorted(new_sources - old_sources):
+            print(f"    + {source}")
+        for source in sorted(old_sources - new_sources):
+            print(f"    - {source}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
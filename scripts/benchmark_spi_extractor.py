@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Swift Package Index compatibility extractor against the legacy
+full-page parser on a corpus of saved SPI pages.
+
+Usage:
+  python scripts/benchmark_spi_extractor.py PAGES_DIR               # Compare and time
+  python scripts/benchmark_spi_extractor.py PAGES_DIR --download 50 # Save 50 pages first
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.spi_extractor import extract_android_support
+
+logger = logging.getLogger(__name__)
+
+
+def parse_spi_page_legacy(content: bytes) -> Optional[bool]:
+    """Parse a full Swift Package Index page with the original four strategies.
+
+    The reference implementation extract_android_support is compared against.
+    """
+    try:
+        soup = BeautifulSoup(content, "html.parser")
+
+        # Strategy 1: Look for platform compatibility badges/buttons with Android text
+        # These usually have classes like 'badge', 'platform', 'btn', etc.
+        android_elements = soup.find_all(
+            ["span", "div", "button", "a"],
+            string=lambda text: text and "android" in text.lower(),
+        )
+
+        for element in android_elements:
+            # Check the element and its parents for styling indicators
+            elements_to_check = [element] + list(element.parents)[
+                :3
+            ]  # Check element + up to 3 parents
+
+            for elem in elements_to_check:
+                # Get style attribute
+                style = elem.get("style", "").lower()
+
+                # Get class attributes
+                class_attr = elem.get("class", [])
+                if isinstance(class_attr, str):
+                    class_attr = [class_attr]
+                classes = " ".join(class_attr).lower()
+
+                # Check for green indicators (supported) - Swift Package Index specific
+                green_indicators = [
+                    "green",
+                    "success",
+                    "enabled",
+                    "supported",
+                    "active",
+                    # Swift Package Index enabled Android colors
+                    "rgb(14, 191, 76)",
+                    "rgb(255, 255, 255)",
+                    "#0ebf4c",
+                    "#ffffff",
+                    # Swift Package Index CSS classes - be specific to avoid matching "incompatible"
+                    "result compatible",
+                    # Additional common green variations
+                    "rgb(34, 197, 94)",
+                    "rgb(22, 163, 74)",
+                    "#22c55e",
+                    "#16a34a",
+                    "bg-green",
+                    "text-green",
+                    "border-green",
+                ]
+
+                # Check for grey/disabled indicators (not supported) - Swift Package Index specific
+                grey_indicators = [
+                    "grey",
+                    "gray",
+                    "disabled",
+                    "inactive",
+                    "muted",
+                    "unavailable",
+                    "incompatible",
+                    # Swift Package Index disabled Android colors
+                    "rgb(25, 25, 35)",
+                    "rgb(154, 154, 154)",
+                    "#191923",
+                    "#9a9a9a",
+                    # Swift Package Index CSS classes
+                    "result incompatible",
+                    "incompatible",
+                    "result unknown",
+                    "unknown",
+                    # Additional common grey variations
+                    "rgb(156, 163, 175)",
+                    "rgb(107, 114, 128)",
+                    "#9ca3af",
+                    "#6b7280",
+                    "bg-gray",
+                    "text-gray",
+                    "border-gray",
+                    "opacity-50",
+                    "opacity-25",
+                ]
+
+                # Check style and classes for indicators
+                content_to_check = f"{style} {classes}"
+
+                if any(indicator in content_to_check for indicator in green_indicators):
+                    logger.debug("Found Android with green/supported styling")
+                    return True
+                elif any(
+                    indicator in content_to_check for indicator in grey_indicators
+                ):
+                    logger.debug("Found Android with grey/disabled styling")
+                    return False
+
+        # Strategy 2: Look for platform grids/lists and check Android element styling
+        platform_containers = soup.find_all(
+            ["div", "ul", "ol"],
+            class_=lambda x: x
+            and any(
+                keyword in str(x).lower()
+                for keyword in ["platform", "compatibility", "support", "badge"]
+            ),
+        )
+
+        for container in platform_containers:
+            # Find all elements in container that might contain Android
+            child_elements = container.find_all(["span", "div", "li", "button", "a"])
+
+            for child in child_elements:
+                text = child.get_text().lower()
+                if "android" in text:
+                    # Check styling of this specific child
+                    style = child.get("style", "").lower()
+                    classes = " ".join(child.get("class", [])).lower()
+                    content_to_check = f"{style} {classes}"
+
+                    green_indicators = [
+                        "green",
+                        "success",
+                        "enabled",
+                        "supported",
+                        "active",
+                        # Swift Package Index enabled colors
+                        "rgb(14, 191, 76)",
+                        "rgb(255, 255, 255)",
+                        "#0ebf4c",
+                        "#ffffff",
+                        # Swift Package Index CSS classes - be specific to avoid matching "incompatible"
+                        "result compatible",
+                        # Additional variations
+                        "rgb(34, 197, 94)",
+                        "#22c55e",
+                        "bg-green",
+                    ]
+                    grey_indicators = [
+                        "grey",
+                        "gray",
+                        "disabled",
+                        "inactive",
+                        "muted",
+                        "incompatible",
+                        # Swift Package Index disabled colors
+                        "rgb(25, 25, 35)",
+                        "rgb(154, 154, 154)",
+                        "#191923",
+                        "#9a9a9a",
+                        # Swift Package Index CSS classes
+                        "result incompatible",
+                        "incompatible",
+                        "result unknown",
+                        "unknown",
+                        # Additional variations
+                        "rgb(156, 163, 175)",
+                        "#9ca3af",
+                        "bg-gray",
+                        "opacity-50",
+                    ]
+
+                    if any(
+                        indicator in content_to_check for indicator in green_indicators
+                    ):
+                        logger.debug(
+                            "Found Android with green styling in platform container"
+                        )
+                        return True
+                    elif any(
+                        indicator in content_to_check for indicator in grey_indicators
+                    ):
+                        logger.debug(
+                            "Found Android with grey styling in platform container"
+                        )
+                        return False
+
+        # Strategy 3: Look for images/icons with Android in alt/title and check parent styling
+        images = soup.find_all("img")
+        for img in images:
+            alt_text = img.get("alt", "").lower()
+            title = img.get("title", "").lower()
+            src = img.get("src", "").lower()
+
+            if any("android" in text for text in [alt_text, title, src]):
+                # Check parent elements for styling
+                for parent in list(img.parents)[:3]:
+                    style = parent.get("style", "").lower()
+                    classes = " ".join(parent.get("class", [])).lower()
+                    content_to_check = f"{style} {classes}"
+
+                    if any(
+                        indicator in content_to_check
+                        for indicator in ["green", "success", "enabled"]
+                    ):
+                        logger.debug("Found Android icon with green parent styling")
+                        return True
+                    elif any(
+                        indicator in content_to_check
+                        for indicator in ["grey", "gray", "disabled"]
+                    ):
+                        logger.debug("Found Android icon with grey parent styling")
+                        return False
+
+        # Strategy 4: Fallback - if we found Android mentioned but no clear styling indicators,
+        # look for general patterns that might indicate support
+        page_text = soup.get_text().lower()
+        if "android" in page_text:
+            # Look for positive indicators near Android mentions
+            if any(
+                phrase in page_text
+                for phrase in [
+                    "android support",
+                    "supports android",
+                    "android compatible",
+                ]
+            ):
+                logger.debug("Found positive Android support text")
+                return True
+
+        # No clear Android support indicators found
+        logger.debug("No clear Android support indicators found")
+        return False  # Default to False (not supported) instead of None
+
+    except Exception as e:
+        logger.warning(f"Error parsing SPI page content: {e}")
+        return None
+
+
+def download_pages(pages_dir: Path, count: int):
+    """Save SPI pages for the first packages in the source CSV."""
+    import pandas as pd
+    import requests
+
+    from src.config import config
+
+    urls = pd.read_csv(config.csv_file_path, header=None, names=["url"])["url"]
+    session = requests.Session()
+    saved = 0
+
+    for url in urls.str.strip('"'):
+        if saved >= count:
+            break
+        owner, name = url.replace(".git", "").rstrip("/").split("/")[-2:]
+        path = pages_dir / f"{owner}__{name}.html"
+        if path.exists():
+            continue
+
+        response = session.get(
+            f"https://swiftpackageindex.com/{owner}/{name}",
+            headers={"User-Agent": "Mozilla/5.0 (spm-android-support-tracking)"},
+            timeout=15,
+        )
+        if response.status_code == 200:
+            path.write_bytes(response.content)
+            saved += 1
+            print(f"Saved {path.name}")
+        time.sleep(config.spi_request_interval)
+
+
+def time_parser(parser, content: bytes, repeat: int):
+    """Return (verdict, CPU seconds per call) for one page."""
+    start = time.process_time()
+    for _ in range(repeat):
+        verdict = parser(content)
+    return verdict, (time.process_time() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pages_dir", help="Directory of saved SPI pages (*.html)")
+    parser.add_argument(
+        "--download", type=int, default=0, help="Download N more pages first"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per page (default: 3)"
+    )
+    args = parser.parse_args()
+
+    pages_dir = Path(args.pages_dir)
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    if args.download:
+        download_pages(pages_dir, args.download)
+
+    pages = sorted(pages_dir.glob("*.html"))
+    if not pages:
+        print(f"No pages found in {pages_dir}")
+        return 1
+
+    legacy_total = 0.0
+    fast_total = 0.0
+    mismatches = []
+
+    for page in pages:
+        content = page.read_bytes()
+        legacy_verdict, legacy_time = time_parser(
+            parse_spi_page_legacy, content, args.repeat
+        )
+        fast_verdict, fast_time = time_parser(
+            extract_android_support, content, args.repeat
+        )
+        legacy_total += legacy_time
+        fast_total += fast_time
+        if legacy_verdict != fast_verdict:
+            mismatches.append((page.name, legacy_verdict, fast_verdict))
+
+    print(f"Pages: {len(pages)}")
+    print(f"Matching verdicts: {len(pages) - len(mismatches)}/{len(pages)}")
+    for name, legacy_verdict, fast_verdict in mismatches:
+        print(f"  MISMATCH {name}: legacy={legacy_verdict} fast={fast_verdict}")
+    print(f"Legacy parser: {legacy_total / len(pages) * 1000:.2f} ms CPU/page")
+    print(f"Extractor:     {fast_total / len(pages) * 1000:.2f} ms CPU/page")
+    if fast_total > 0:
+        print(f"Speedup:       {legacy_total / fast_total:.1f}x")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,89 +2,109 @@
 Analysis and visualization tools for Swift Package support data.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
+from sqlalchemy import select
 
-from src.models import Repository, SessionLocal
+from src.dependency_graph import DependencyGraph
+from src.models import ReadSessionLocal, Repository
+
+# Repository fields loaded for analysis
+ANALYSIS_COLUMNS = [
+    "owner",
+    "name",
+    "stars",
+    "forks",
+    "watchers",
+    "issues_count",
+    "open_issues_count",
+    "language",
+    "license_name",
+    "has_package_swift",
+    "swift_tools_version",
+    "dependencies_count",
+    "linux_compatible",
+    "android_compatible",
+    "current_state",
+    "transitive_dependents",
+    "priority_score",
+    "created_at",
+    "updated_at",
+    "pushed_at",
+]
+# Counts stored as NULL are analyzed as 0
+ZERO_DEFAULT_COLUMNS = [
+    "stars",
+    "forks",
+    "watchers",
+    "issues_count",
+    "open_issues_count",
+    "dependencies_count",
+    "transitive_dependents",
+]
+# Low-cardinality labels, stored as pandas categoricals
+CATEGORICAL_COLUMNS = ["language", "license_name", "current_state"]
+BOOLEAN_COLUMNS = ["has_package_swift", "linux_compatible", "android_compatible"]
+DATETIME_COLUMNS = ["created_at", "updated_at", "pushed_at"]
+
+# States of repositories still being tracked for migration
+TRACKING_STATES = ["tracking", "in_progress", "unknown"]
+
+
+def repositories_frame(data) -> pd.DataFrame:
+    """Build a typed analysis DataFrame from ANALYSIS_COLUMNS data.
+
+    data is anything pandas accepts, such as a list of row dicts or a frame
+    read from SQL. Counts become int64, labels categoricals and flags
+    nullable booleans.
+    """
+    df = pd.DataFrame(data, columns=ANALYSIS_COLUMNS)
+    for column in ZERO_DEFAULT_COLUMNS:
+        df[column] = df[column].fillna(0).astype("int64")
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype("category")
+    for column in BOOLEAN_COLUMNS:
+        df[column] = df[column].astype("boolean")
+    for column in DATETIME_COLUMNS:
+        df[column] = pd.to_datetime(df[column])
+    return df
 
 
 class PackageAnalyzer:
-    """Analyzes Swift Package data and generates insights."""
+    """Analyzes Swift Package data and generates insights.
+
+    Completed repositories are read once per analyzer and shared by every
+    accessor; create a new analyzer to see later writes.
+    """
 
     def __init__(self):
-        self.db = SessionLocal()
+        self.db = ReadSessionLocal()
+        self._completed: Optional[pd.DataFrame] = None
+
+    def use_repositories(self, rows: List[Dict[str, Any]]):
+        """Analyze already loaded completed repositories instead of querying.
+
+        Lets a caller that has read the repositories for another purpose,
+        such as an export, share that read with the analysis.
+        """
+        self._completed = repositories_frame(rows)
 
     def get_completed_repositories(self) -> pd.DataFrame:
         """Get all completed repositories as a pandas DataFrame."""
-        repos = (
-            self.db.query(Repository)
-            .filter(Repository.processing_status == "completed")
-            .all()
-        )
-
-        data = []
-        for repo in repos:
-            data.append(
-                {
-                    "owner": repo.owner,
-                    "name": repo.name,
-                    "stars": repo.stars or 0,
-                    "forks": repo.forks or 0,
-                    "watchers": repo.watchers or 0,
-                    "issues_count": repo.issues_count or 0,
-                    "open_issues_count": repo.open_issues_count or 0,
-                    "language": repo.language,
-                    "license_name": repo.license_name,
-                    "has_package_swift": repo.has_package_swift,
-                    "swift_tools_version": repo.swift_tools_version,
-                    "dependencies_count": repo.dependencies_count or 0,
-                    "linux_compatible": repo.linux_compatible,
-                    "android_compatible": repo.android_compatible,
-                    "current_state": repo.current_state,
-                    "created_at": repo.created_at,
-                    "updated_at": repo.updated_at,
-                    "pushed_at": repo.pushed_at,
-                }
+        if self._completed is None:
+            query = select(
+                *[getattr(Repository, column) for column in ANALYSIS_COLUMNS]
+            ).where(Repository.processing_status == "completed")
+            self._completed = repositories_frame(
+                pd.read_sql(query, self.db.connection())
             )
-
-        return pd.DataFrame(data)
+        return self._completed
 
     def get_tracking_repositories(self) -> pd.DataFrame:
         """Get repositories that are currently being tracked for migration."""
-        repos = (
-            self.db.query(Repository)
-            .filter(
-                Repository.processing_status == "completed",
-                Repository.current_state.in_(["tracking", "in_progress", "unknown"]),
-            )
-            .all()
-        )
-        data = []
-        for repo in repos:
-            data.append(
-                {
-                    "owner": repo.owner,
-                    "name": repo.name,
-                    "stars": repo.stars or 0,
-                    "forks": repo.forks or 0,
-                    "watchers": repo.watchers or 0,
-                    "issues_count": repo.issues_count or 0,
-                    "open_issues_count": repo.open_issues_count or 0,
-                    "language": repo.language,
-                    "license_name": repo.license_name,
-                    "has_package_swift": repo.has_package_swift,
-                    "swift_tools_version": repo.swift_tools_version,
-                    "dependencies_count": repo.dependencies_count or 0,
-                    "linux_compatible": repo.linux_compatible,
-                    "android_compatible": repo.android_compatible,
-                    "current_state": repo.current_state,
-                    "created_at": repo.created_at,
-                    "updated_at": repo.updated_at,
-                    "pushed_at": repo.pushed_at,
-                }
-            )
-        return pd.DataFrame(data)
+        df = self.get_completed_repositories()
+        return df[df["current_state"].isin(TRACKING_STATES)].reset_index(drop=True)
 
     def generate_popularity_analysis(self) -> Dict[str, Any]:
         """Analyze repository popularity metrics."""
@@ -114,6 +134,46 @@ class PackageAnalyzer:
 
         return analysis
 
+    def generate_priority_analysis(self, limit: int = 10) -> Dict[str, Any]:
+        """Rank tracked repositories by their stored migration priority score."""
+        df = self.get_tracking_repositories().dropna(subset=["priority_score"])
+        if df.empty:
+            return {"error": "No priority scores available"}
+
+        columns = [
+            "owner",
+            "name",
+            "priority_score",
+            "stars",
+            "transitive_dependents",
+            "current_state",
+        ]
+        top = df.nlargest(limit, "priority_score")[columns]
+        return {
+            "scored_repositories": len(df),
+            "mean_score": df["priority_score"].mean(),
+            "top_priorities": top.astype({"current_state": str}).to_dict("records"),
+        }
+
+    def generate_dependency_analysis(
+        self, limit: int = 10, graph: Optional[DependencyGraph] = None
+    ) -> Dict[str, Any]:
+        """Rank packages by how many dataset packages depend on them.
+
+        The dependency graph is loaded unless one is passed in.
+        """
+        if graph is None:
+            graph = DependencyGraph.from_database(self.db)
+        if not graph.edge_count:
+            return {"error": "No dependency data available"}
+
+        return {
+            "total_packages": len(graph),
+            "internal_dependencies": graph.edge_count,
+            "external_dependencies": graph.unresolved,
+            "most_depended_upon": graph.impact(limit),
+        }
+
     def close(self):
         """Close database connection."""
         self.db.close()
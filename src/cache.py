@@ -0,0 +1,267 @@
+"""
+Persistent on-disk caches used by the GitHub fetch path.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Size-bounded key/value cache stored in a standalone SQLite file.
+
+    Values are stored as JSON. When the number of entries exceeds max_entries
+    the least recently used entries are evicted, and entries older than
+    ttl_seconds (if set) are treated as missing. The cache file is separate
+    from the main database so it can be persisted (or discarded) on its own.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        max_entries: int = 5000,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table} (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, include_expired: bool = False) -> Optional[Any]:
+        """Return the cached value for a key, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if (
+                not include_expired
+                and self.ttl_seconds is not None
+                and time.time() - row[1] > self.ttl_seconds
+            ):
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+        return self._decode(row[0])
+
+    def set(self, key: str, value: Any):
+        """Store a value, evicting least recently used entries if over capacity."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, self._encode(value), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _encode(self, value: Any):
+        """Serialize a value for storage."""
+        return json.dumps(value, default=str)
+
+    def _decode(self, raw) -> Any:
+        """Deserialize a stored value."""
+        return json.loads(raw)
+
+    def delete(self, key: str):
+        """Remove a key from the cache."""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop the least recently used entries beyond max_entries."""
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,),
+            )
+            logger.debug(f"Evicted {excess} entries from {self.table} cache")
+
+    def record_hit(self):
+        """Count a request that was served from the cache."""
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        """Count a request that had to be fetched from the source."""
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for this cache."""
+        with self._lock:
+            (entries,) = self._conn.execute(
+                f"SELECT COUNT(*) FROM {self.table}"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) * 100 if total else 0,
+            "entries": entries,
+        }
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class ConditionalRequestCache(DiskCache):
+    """Stores ETag/Last-Modified validators and payloads per request URL.
+
+    GitHub answers a matching conditional request with 304 Not Modified, which
+    does not count against the rate limit, so unchanged resources can be served
+    from the stored payload.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000):
+        super().__init__(path, "http_validators", max_entries)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers from a cached entry."""
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, headers: Dict[str, str], payload: Any):
+        """Store the validators from a 200 response together with its payload."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        self.set(
+            url,
+            {"etag": etag, "last_modified": last_modified, "payload": payload},
+        )
+
+
+class ManifestStore(DiskCache):
+    """Content-addressed store of parsed Package.swift manifests.
+
+    Entries are keyed by git blob SHA, so a manifest that has not changed is
+    recognised before it is downloaded or parsed again, even when it moved
+    between repositories (forks, renames).
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000):
+        super().__init__(path, "manifests", max_entries)
+
+    def lookup(self, sha: Optional[str]) -> Optional[Dict]:
+        """Return the stored manifest for a blob SHA, counting hits and misses."""
+        entry = self.get(sha) if sha else None
+        if entry is None:
+            self.record_miss()
+        else:
+            self.record_hit()
+        return entry
+
+    def store(
+        self,
+        sha: str,
+        content: str,
+        swift_tools_version: Optional[str],
+        dependencies: List[Dict],
+    ) -> Dict:
+        """Store a manifest with its parsed fields and return the entry."""
+        entry = {
+            "sha": sha,
+            "content": content,
+            "swift_tools_version": swift_tools_version,
+            "dependencies": dependencies,
+        }
+        self.set(sha, entry)
+        return entry
+
+
+class SpiCache(DiskCache):
+    """Swift Package Index results keyed by owner/repo, stored compressed.
+
+    In "result" mode only the Android verdict and a hash of the page are kept;
+    "page" mode also keeps the HTML so pages can be re-parsed offline. A
+    verdict of None with missing=True records a package SPI does not list.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "result",
+        max_entries: int = 5000,
+        ttl_seconds: Optional[float] = None,
+    ):
+        super().__init__(path, "spi_results", max_entries, ttl_seconds)
+        self.mode = mode
+
+    def _encode(self, value: Any) -> bytes:
+        return zlib.compress(json.dumps(value).encode("utf-8"))
+
+    def _decode(self, raw) -> Any:
+        return json.loads(zlib.decompress(raw).decode("utf-8"))
+
+    def store(
+        self,
+        key: str,
+        verdict: Optional[bool],
+        content: Optional[bytes] = None,
+        missing: bool = False,
+    ):
+        """Store a verdict together with the hash (and optionally the page)."""
+        entry = {
+            "verdict": verdict,
+            "missing": missing,
+            "page_hash": page_hash(content) if content is not None else None,
+        }
+        if self.mode == "page" and content is not None:
+            entry["page"] = content.decode("utf-8", errors="replace")
+        self.set(key, entry)
+
+
+def page_hash(content: bytes) -> str:
+    """Hash a downloaded page so unchanged pages need not be parsed again."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def git_blob_sha(content: str) -> str:
+    """Compute the git blob SHA of a text file, as GitHub reports it."""
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
@@ -0,0 +1,89 @@
+"""
+Cheap change detection for incremental repository refreshes.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from src.config import config
+from src.github_graphql import parse_github_datetime
+from src.models import Repository
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeProbe:
+    """Detects which repositories changed since they were last fetched.
+
+    Each repository is probed for its star count and last push time, batched
+    through GraphQL when a token is available. Without a token each probe is a
+    single conditional REST request, which GitHub answers with a free 304 when
+    nothing changed. Repositories that cannot be probed count as changed.
+    """
+
+    def __init__(self, fetcher):
+        self.fetcher = fetcher
+
+    def probe(self, urls: List[str]) -> Dict[str, Optional[Dict]]:
+        """Probe repositories, returning {"stars", "pushed_at"} per probed URL."""
+        repositories = {}
+        for url in urls:
+            try:
+                repositories[self.fetcher.parse_github_url(url)] = url
+            except ValueError as e:
+                logger.warning(str(e))
+
+        if self.fetcher.token_pool.authenticated:
+            results = self._probe_graphql(list(repositories.keys()))
+        else:
+            results = self._probe_rest(list(repositories.keys()))
+
+        return {repositories[key]: probe for key, probe in results.items()}
+
+    def _probe_graphql(self, keys: List) -> Dict:
+        """Probe repositories in batched GraphQL queries."""
+        results = {}
+        batch_size = config.graphql_batch_size
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i : i + batch_size]
+            pooled = self.fetcher._use_token("graphql")
+            graphql = self.fetcher.graphql_client(pooled)
+            self.fetcher._wait_for_rate_limit("graphql")
+            try:
+                results.update(graphql.fetch_probes(batch))
+            except Exception as e:
+                logger.warning(f"Change probe batch failed: {e}")
+        return results
+
+    def _probe_rest(self, keys: List) -> Dict:
+        """Probe repositories one REST request at a time."""
+        results = {}
+        for owner, name in keys:
+            try:
+                if self.fetcher.http_cache:
+                    payload = self.fetcher._conditional_get_json(
+                        f"/repos/{owner}/{name}"
+                    )
+                    probe = {
+                        "stars": payload.get("stargazers_count") or 0,
+                        "pushed_at": parse_github_datetime(payload.get("pushed_at")),
+                    }
+                else:
+                    repo = self.fetcher._github_call(
+                        self.fetcher.github.get_repo, f"{owner}/{name}"
+                    )
+                    probe = {
+                        "stars": repo.stargazers_count or 0,
+                        "pushed_at": repo.pushed_at,
+                    }
+                results[(owner, name)] = probe
+            except Exception as e:
+                logger.debug(f"Change probe failed for {owner}/{name}: {e}")
+        return results
+
+    @staticmethod
+    def has_changed(repo: Optional[Repository], probe: Optional[Dict]) -> bool:
+        """Whether a probe differs from the stored repository row."""
+        if repo is None or probe is None or repo.pushed_at is None:
+            return True
+        return probe["pushed_at"] != repo.pushed_at or probe["stars"] != repo.stars
@@ -2,14 +2,13 @@
 """
 Main CLI script for Swift Package support data processing.
 """
-from datetime import datetime
-from pathlib import Path
 
 from src.config import config
 from src.fetcher import DataProcessor
 from src.models import (
     ProcessingLog,
     Repository,
+    ReadSessionLocal,
     SessionLocal,
     create_tables,
 )
@@ -23,49 +22,26 @@ def init_database(args):
 
 def show_status(args):
     """Show processing status and statistics."""
-    db = SessionLocal()
+    from src.stats import get_stats
+
+    db = ReadSessionLocal()
+    stats = get_stats(db)
 
     # Repository statistics
-    total_repos = db.query(Repository).count()
-    completed_repos = (
-        db.query(Repository).filter(Repository.processing_status == "completed").count()
-    )
-    error_repos = (
-        db.query(Repository).filter(Repository.processing_status == "error").count()
-    )
-    pending_repos = (
-        db.query(Repository).filter(Repository.processing_status == "pending").count()
-    )
+    completed_repos = stats["completed_repositories"]
 
     print("Repository Processing Status:")
-    print(f"  Total repositories: {total_repos}")
+    print(f"  Total repositories: {stats['total_repositories']}")
     print(f"  Completed: {completed_repos}")
-    print(f"  Errors: {error_repos}")
-    print(f"  Pending: {pending_repos}")
+    print(f"  Errors: {stats['processing_status']['error']}")
+    print(f"  Pending: {stats['processing_status']['pending']}")
 
     if completed_repos > 0:
         # Repository insights
-        avg_stars = (
-            db.query(Repository)
-            .filter(Repository.processing_status == "completed")
-            .with_entities(Repository.stars)
-            .all()
-        )
-        avg_stars = sum(r[0] for r in avg_stars if r[0]) / len(
-            [r for r in avg_stars if r[0]]
-        )
-
-        has_package_swift = (
-            db.query(Repository)
-            .filter(
-                Repository.processing_status == "completed",
-                Repository.has_package_swift.is_(True),
-            )
-            .count()
-        )
+        has_package_swift = stats["with_package_swift"]
 
         print("\nRepository Insights:")
-        print(f"  Average stars: {avg_stars:.1f}")
+        print(f"  Average stars: {stats['average_stars'] or 0:.1f}")
         print(f"  Repositories with Package.swift: {has_package_swift}")
         print(
             f"  Package.swift coverage: {(has_package_swift/completed_repos)*100:.1f}%"
@@ -76,35 +52,14 @@ def show_status(args):
 
         print("\nPackage Migration States:")
         for state in PACKAGE_STATES.keys():
-            count = (
-                db.query(Repository)
-                .filter(
-                    Repository.processing_status == "completed",
-                    Repository.current_state == state,
-                )
-                .count()
-            )
+            count = stats["states"][state]
             if count > 0:
                 percentage = (count / completed_repos) * 100
                 print(f"  {state.capitalize()}: {count} ({percentage:.1f}%)")
 
         # Show migrated vs tracking counts
-        migrated_count = (
-            db.query(Repository)
-            .filter(
-                Repository.processing_status == "completed",
-                Repository.current_state == "migrated",
-            )
-            .count()
-        )
-        tracking_count = (
-            db.query(Repository)
-            .filter(
-                Repository.processing_status == "completed",
-                Repository.current_state == "tracking",
-            )
-            .count()
-        )
+        migrated_count = stats["states"].get("migrated", 0)
+        tracking_count = stats["states"].get("tracking", 0)
 
         print(f"\nMigration Progress:")
         print(f"  Migrated packages: {migrated_count}")
@@ -129,131 +84,51 @@ def show_status(args):
 
 def export_data(args):
     """Export repository data."""
-    import json
+    from src.exporter import export_repositories
 
-    import pandas as pd
+    db = ReadSessionLocal()
+    try:
+        summary = export_repositories(db, {args.format: args.output})
+    finally:
+        db.close()
 
-    db = SessionLocal()
+    print_export_summary(summary, args.output)
 
-    # Query completed repositories
-    repos = (
-        db.query(Repository).filter(Repository.processing_status == "completed").all()
-    )
 
-    if not repos:
+def print_export_summary(summary, output):
+    """Report the result of export_repositories for one output file."""
+    if not summary:
         print("No data available for export")
         return
 
-    # Convert to dictionary format
-    data = []
-    for repo in repos:
-        repo_data = {
-            "url": repo.url,
-            "owner": repo.owner,
-            "name": repo.name,
-            "description": repo.description,
-            "stars": repo.stars,
-            "forks": repo.forks,
-            "watchers": repo.watchers,
-            "language": repo.language,
-            "license_name": repo.license_name,
-            "has_package_swift": repo.has_package_swift,
-            "swift_tools_version": repo.swift_tools_version,
-            "dependencies_count": repo.dependencies_count,
-            "linux_compatible": repo.linux_compatible,
-            "android_compatible": repo.android_compatible,
-            "current_state": repo.current_state,
-            "created_at": repo.created_at.isoformat() if repo.created_at else None,
-            "updated_at": repo.updated_at.isoformat() if repo.updated_at else None,
-            "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
-            "last_fetched": (
-                repo.last_fetched.isoformat() if repo.last_fetched else None
-            ),
-        }
-        data.append(repo_data)
-
-    # Create output directory
-    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-
-    # Add status change transactions metadata
-    from src.models import StateTransition
-
-    status_transactions = db.query(StateTransition).all()
-
-    transactions_metadata = None
-    if status_transactions:
-        github_transactions = [t for t in status_transactions if t.issue_number]
-        transactions_metadata = {
-            "total_transactions": len(status_transactions),
-            "github_issue_transactions": len(github_transactions),
-            "status_breakdown": {},
-            "recent_transactions": [],
-        }
-
-        for transition in status_transactions:
-            status = transition.to_state
-            if status not in transactions_metadata["status_breakdown"]:
-                transactions_metadata["status_breakdown"][status] = 0
-            transactions_metadata["status_breakdown"][status] += 1
-
-            # Get repository info
-            repo = (
-                db.query(Repository)
-                .filter(Repository.id == transition.repository_id)
-                .first()
-            )
-            if repo:
-                transaction_data = {
-                    "owner": repo.owner,
-                    "name": repo.name,
-                    "from_state": transition.from_state,
-                    "to_state": transition.to_state,
-                    "reason": transition.reason,
-                    "changed_by": transition.changed_by,
-                    "date": (
-                        transition.created_at.isoformat()
-                        if transition.created_at
-                        else None
-                    ),
-                }
-
-                # Add GitHub issue metadata if present
-                if transition.issue_number:
-                    transaction_data["github_issue"] = transition.issue_number
-
-                transactions_metadata["recent_transactions"].append(transaction_data)
-
-    # Export data
-    if args.format == "csv":
-        df = pd.DataFrame(data)
-        df.to_csv(args.output, index=False)
-    elif args.format == "json":
-        export_data = {
-            "repositories": data,
-            "metadata": {
-                "export_date": datetime.now().isoformat(),
-                "total_repositories": len(data),
-            },
-        }
-
-        # Add status change transactions if any
-        if transactions_metadata:
-            export_data["status_transactions"] = transactions_metadata
-
-        with open(args.output, "w") as f:
-            json.dump(export_data, f, indent=2, default=str)
-
-    print(f"Exported {len(data)} repositories to {args.output}")
-    if transactions_metadata:
+    print(f"Exported {summary['total_repositories']} repositories to {output}")
+    transactions = summary["transactions"]
+    if transactions:
         print(
-            f"Included {transactions_metadata['total_transactions']} status change transactions ({transactions_metadata['github_issue_transactions']} from GitHub issues)"
+            f"Included {transactions['total_transactions']} status change transactions ({transactions['github_issue_transactions']} from GitHub issues)"
         )
-    db.close()
+
+
+def rebuild_summary(args):
+    """Recompute the transition summary from the state transition ledger."""
+    from src.models import rebuild_transition_summary
+
+    db = SessionLocal()
+    try:
+        total = rebuild_transition_summary(db)
+        db.commit()
+        print(f"Rebuilt transition summary from {total} transitions")
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding transition summary: {e}")
+    finally:
+        db.close()
 
 
 def set_package_state(args):
     """Set the migration state for a package."""
     from src.models import PACKAGE_STATES
+    from src.repository_keys import repository_key, url_key
 
     # Process GitHub issues if requested
     if hasattr(args, "process_issues") and args.process_issues:
@@ -270,19 +145,18 @@ def set_package_state(args):
 
     db = SessionLocal()
     try:
-        # Find repository by URL or owner/name
+        # Find repository by URL or owner/name, in any spelling
         if args.url:
-            repo = db.query(Repository).filter(Repository.url == args.url).first()
+            key = url_key(args.url)
         elif args.owner and args.name:
-            repo = (
-                db.query(Repository)
-                .filter(Repository.owner == args.owner, Repository.name == args.name)
-                .first()
-            )
+            key = repository_key(args.owner, args.name)
         else:
             print("Must specify either --url or both --owner and --name")
             return
 
+        repo = None
+        if key:
+            repo = db.query(Repository).filter(Repository.repo_key == key).first()
         if not repo:
             print("Repository not found")
             return
@@ -357,8 +231,8 @@ def process_github_issues(args):
                 print(
                     f"  GitHub issue transactions: {summary['github_issue_transactions']}"
                 )
-                for status, repos in summary["status_breakdown"].items():
-                    print(f"  {status.capitalize()}: {len(repos)} transitions")
+                for status, count in summary["status_breakdown"].items():
+                    print(f"  {status.capitalize()}: {count} transitions")
 
     except Exception as e:
         print(f"Error processing status updates: {e}")
@@ -465,49 +339,31 @@ def list_states(args):
     print("\nCurrent State Distribution:")
     print("=" * 50)
 
-    db = SessionLocal()
+    from src.stats import get_stats
+
+    db = ReadSessionLocal()
     try:
-        completed_repos = (
-            db.query(Repository)
-            .filter(Repository.processing_status == "completed")
-            .count()
-        )
+        stats = get_stats(db)
+        completed_repos = stats["completed_repositories"]
 
         if completed_repos > 0:
             for state in PACKAGE_STATES.keys():
-                count = (
-                    db.query(Repository)
-                    .filter(
-                        Repository.processing_status == "completed",
-                        Repository.current_state == state,
-                    )
-                    .count()
-                )
+                count = stats["states"][state]
                 percentage = (
                     (count / completed_repos) * 100 if completed_repos > 0 else 0
                 )
                 print(f"  {state:<12} : {count:4d} repos ({percentage:5.1f}%)")
 
             # Show status change transactions summary
-            from src.models import StateTransition
-
-            all_transitions = db.query(StateTransition).all()
-            github_transitions = [t for t in all_transitions if t.issue_number]
+            transitions = stats["transitions"]
 
-            if all_transitions:
+            if transitions["total"]:
                 print(f"\nStatus Change Transactions:")
-                print(f"  Total transactions: {len(all_transitions)}")
-                print(f"  GitHub issue transactions: {len(github_transitions)}")
+                print(f"  Total transactions: {transitions['total']}")
+                print(f"  GitHub issue transactions: {transitions['github_issue']}")
 
                 # Show breakdown by new status
-                status_breakdown = {}
-                for transition in all_transitions:
-                    status = transition.to_state
-                    if status not in status_breakdown:
-                        status_breakdown[status] = 0
-                    status_breakdown[status] += 1
-
-                for status, count in status_breakdown.items():
+                for status, count in transitions["by_state"].items():
                     print(f"    {status.capitalize()}: {count} transactions")
         else:
             print("  No completed repositories found")
@@ -0,0 +1,136 @@
+"""
+Concurrent collection engine for repository data.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from tqdm import tqdm
+
+from src.config import config
+from src.fetch_planner import FetchPlan
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrentCollector:
+    """Runs repository fetches as a two-stage pipeline on top of a DataProcessor.
+
+    Each repository goes through a GitHub stage and then a Swift Package Index
+    stage. The stages hold separate slots, so SPI pages for one repository are
+    fetched while GitHub requests for the next are in flight. Network-bound
+    work runs on a thread pool driven by an asyncio loop, while all database
+    work stays on the calling thread so the processor's session is never
+    shared. Per-host spacing and in-flight limits are enforced by the shared
+    GitHubFetcher's HostScheduler, so raising concurrency never makes either
+    host see more traffic than configured; it only removes idle time.
+    """
+
+    def __init__(self, processor, concurrency: int = 4):
+        self.processor = processor
+        self.fetcher = processor.fetcher
+        self.concurrency = max(1, concurrency)
+        self.spi_concurrency = max(1, config.spi_max_in_flight)
+
+    def process_batch(self, urls: List[str]) -> Dict[str, int]:
+        """Process a batch of repositories through the pipeline with progress tracking."""
+        return asyncio.run(self._process_batch(urls))
+
+    async def _process_batch(self, urls: List[str]) -> Dict[str, int]:
+        results = {"success": 0, "error": 0, "skipped": 0, "unchanged": 0}
+        batch_start = time.time()
+
+        existing_repos = self.processor.get_existing_repositories(urls)
+
+        progress_bar = tqdm(
+            total=len(urls), desc="Processing repositories", unit="repo"
+        )
+
+        # Fetch plans need the database, so build them up front on this thread
+        plans = {}
+        for url in urls:
+            plan = self.processor.planner.plan(existing_repos.get(url))
+            if plan.is_empty():
+                logger.debug(f"Skipping {url} - recently processed")
+                self.processor.record_result(results, "skipped")
+                progress_bar.update(1)
+            else:
+                plans[url] = plan
+        pending_urls = list(plans)
+
+        logger.info(
+            f"Fetching {len(pending_urls)} repositories with concurrency "
+            f"{self.concurrency} (GitHub) / {self.spi_concurrency} (SPI)"
+        )
+
+        loop = asyncio.get_running_loop()
+        github_slots = asyncio.Semaphore(self.concurrency)
+        spi_slots = asyncio.Semaphore(self.spi_concurrency)
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency + self.spi_concurrency,
+            thread_name_prefix="collector",
+        ) as executor:
+
+            async def fetch(url: str):
+                plan = plans[url]
+                async with github_slots:
+                    result = await loop.run_in_executor(
+                        executor, self._fetch_github, url, plan
+                    )
+
+                # The GitHub slot is free again, so the next repository's
+                # GitHub stage overlaps this repository's SPI stage
+                metadata = result[2]
+                if metadata is not None and plan.spi:
+                    async with spi_slots:
+                        await loop.run_in_executor(
+                            executor, self.fetcher.fetch_spi_stage, metadata
+                        )
+                return result
+
+            tasks = [asyncio.create_task(fetch(url)) for url in pending_urls]
+
+            for next_result in asyncio.as_completed(tasks):
+                url, start_time, metadata, error = await next_result
+
+                if error is not None:
+                    logger.error(f"Unexpected error processing {url}: {error}")
+                    self.processor._log_processing_error(url, str(error), start_time)
+                    result = "error"
+                else:
+                    result = self.processor.store_repository_metadata(
+                        url, metadata, existing_repos.get(url), start_time
+                    )
+
+                self.processor.record_result(results, result)
+                progress_bar.update(1)
+                progress_bar.set_postfix(
+                    {
+                        "Success": results["success"],
+                        "Errors": results["error"],
+                        "Skipped": results["skipped"],
+                    }
+                )
+
+        progress_bar.close()
+
+        batch_duration = time.time() - batch_start
+        logger.info(f"Batch completed in {batch_duration:.1f}s: {results}")
+
+        return results
+
+    def _fetch_github(
+        self, url: str, plan: FetchPlan
+    ) -> Tuple[str, datetime, Optional[Dict], Optional[Exception]]:
+        """Fetch the planned GitHub stages for one repository on a worker thread."""
+        start_time = datetime.now()
+        try:
+            metadata = self.fetcher.fetch_github_stages(url, plan)
+            return url, start_time, metadata, None
+        except Exception as e:
+            return url, start_time, None, e
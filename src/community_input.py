@@ -13,6 +13,7 @@ from github import Github, GithubException
 
 from src.config import config
 from src.models import Repository, SessionLocal, PackageState, ValidationError
+from src.repository_keys import repository_key
 
 logger = logging.getLogger(__name__)
 
@@ -94,7 +95,7 @@ class GitHubIssueParser:
         try:
             repo = (
                 db.query(Repository)
-                .filter(Repository.owner == owner, Repository.name == name)
+                .filter(Repository.repo_key == repository_key(owner, name))
                 .first()
             )
             return repo is not None
@@ -164,7 +165,7 @@ class TransactionProcessor:
             # Find repository
             repo = (
                 self.db.query(Repository)
-                .filter(Repository.owner == owner, Repository.name == name)
+                .filter(Repository.repo_key == repository_key(owner, name))
                 .first()
             )
 
@@ -269,60 +270,22 @@ class TransactionProcessor:
 
         return results
 
-    def get_transactions_summary(self) -> Dict:
-        """Get summary of all status change transactions."""
-        try:
-            from src.models import StateTransition
-
-            # Get all state transitions with metadata
-            transactions = self.db.query(StateTransition).all()
-
-            # Separate GitHub issue-based transactions from others
-            github_transactions = [t for t in transactions if t.issue_number]
-            total_transactions = len(transactions)
-            github_transaction_count = len(github_transactions)
-
-            # Group by new status
-            status_breakdown = {}
-            for transition in transactions:
-                status = transition.to_state
-                if status not in status_breakdown:
-                    status_breakdown[status] = []
-
-                # Get repository info
-                repo = (
-                    self.db.query(Repository)
-                    .filter(Repository.id == transition.repository_id)
-                    .first()
-                )
-
-                transaction_data = {
-                    "repository_url": transition.repository_url,
-                    "from_state": transition.from_state,
-                    "reason": transition.reason,
-                    "changed_by": transition.changed_by,
-                    "date": (
-                        transition.created_at.isoformat()
-                        if transition.created_at
-                        else None
-                    ),
-                }
-
-                # Add GitHub issue metadata if present
-                if transition.issue_number:
-                    transaction_data["github_issue"] = transition.issue_number
+    def get_transactions_summary(self, recent_limit: int = 20) -> Dict:
+        """Get summary of all status change transactions.
 
-                # Add repository details if available
-                if repo:
-                    transaction_data["owner"] = repo.owner
-                    transaction_data["name"] = repo.name
-
-                status_breakdown[status].append(transaction_data)
+        Counts come from the transition summary table; only the most recent
+        recent_limit transitions are loaded.
+        """
+        try:
+            from src.stats import get_transition_summary, recent_transitions
 
+            summary = get_transition_summary(self.db)
             return {
-                "total_transactions": total_transactions,
-                "github_issue_transactions": github_transaction_count,
-                "status_breakdown": status_breakdown,
+                "total_transactions": summary["total"],
+                "github_issue_transactions": summary["github_issue"],
+                "manual_transactions": summary["manual"],
+                "status_breakdown": summary["by_state"],
+                "recent_transactions": recent_transitions(self.db, recent_limit),
                 "last_updated": datetime.utcnow().isoformat(),
             }
 
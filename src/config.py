@@ -3,9 +3,9 @@ Configuration management for Swift Package support data processing.
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
@@ -19,18 +19,78 @@ class Config:
 
     # Database settings
     database_url: str = "sqlite:///swift_packages.db"
+    database_profile: str = "default"  # SQLite pragmas: default, ci or compat
 
     # GitHub API settings
     github_token: Optional[str] = None
+    github_tokens: List[str] = field(default_factory=list)  # Token pool for rotation
     github_api_base_url: str = "https://api.github.com"
+    graphql_batch_size: int = 25  # Repositories per aliased GraphQL query
 
     # Rate limiting settings
     requests_per_hour: int = 5000  # GitHub API limit
+    rate_limit_reserve: int = 50  # Requests left untouched in each rate limit bucket
     repositories_per_batch: int = 40  # ~3 requests per repo = 120 requests per batch
     batch_delay_minutes: int = (
         2  # 60 minutes / 29 batches = ~2.1 minutes (70% utilization)
     )
 
+    # Per-host politeness (spacing between request starts, concurrent requests)
+    github_request_interval: float = 0.0  # Seconds between GitHub API requests
+    github_max_in_flight: int = 4
+    spi_request_interval: float = 1.0  # Seconds between Swift Package Index requests
+    spi_max_in_flight: int = 1
+
+    # Collection settings
+    collection_concurrency: int = 1  # Repositories in the GitHub stage at once
+    parse_workers: int = 0  # Processes for SPI page/manifest parsing (0 = inline)
+    write_batch_size: int = 50  # Repositories written per database transaction
+
+    # Freshness TTLs per field group; only expired groups are refetched
+    metadata_ttl_hours: int = 24
+    issues_ttl_hours: int = 72
+    manifest_ttl_hours: int = 168
+    spi_ttl_hours: int = 72
+
+    # Incremental refresh settings (probe for changes before fetching)
+    probe_interval_hours: int = 1  # Replaces metadata_ttl_hours when incremental
+
+    # HTTP cache settings (conditional requests with ETag/Last-Modified)
+    http_cache_enabled: bool = True
+    http_cache_path: str = "data/cache/http_cache.db"
+    http_cache_max_entries: int = 5000  # ~2 entries per repository
+
+    # Issue count cache (counts change slowly, refetched when a repo changes)
+    issue_count_cache_path: str = "data/cache/issue_counts.db"
+    issue_count_ttl_hours: int = 168
+    issue_count_cache_max_entries: int = 5000  # One entry per repository
+
+    # Parsed Package.swift manifests, keyed by git blob SHA
+    manifest_cache_path: str = "data/cache/manifests.db"
+    manifest_cache_max_entries: int = 5000  # One entry per manifest blob
+
+    # Swift Package Index results ("result" keeps verdicts, "page" also HTML)
+    spi_cache_enabled: bool = True
+    spi_cache_mode: str = "result"
+    spi_cache_path: str = "data/cache/spi_cache.db"
+    spi_cache_ttl_hours: int = 72
+    spi_cache_max_entries: int = 5000
+
+    # Migration priority score: relative weights of its components and the
+    # number of days after which a push counts half as recent
+    priority_weight_stars: float = 0.35
+    priority_weight_forks: float = 0.15
+    priority_weight_activity: float = 0.2
+    priority_weight_dependents: float = 0.3
+    priority_activity_half_life_days: float = 180.0
+
+    # Dependency crawler: how many dependency hops below the tracked packages
+    # to follow, and the GitHub requests one run may spend
+    crawl_max_depth: int = 2
+    crawl_request_budget: int = 500
+    crawl_requests_per_repository: int = 4  # Estimate until a run measures it
+    crawl_max_attempts: int = 3  # Failed fetches before a package is given up
+
     # Data processing settings
     csv_file_path: str = "data/linux-compatible-android-incompatible.csv"
 
@@ -44,7 +104,43 @@ class Config:
     def __post_init__(self):
         """Load environment variables and validate configuration."""
         self.github_token = os.getenv("GITHUB_TOKEN", self.github_token)
+
+        # GITHUB_TOKENS is a comma-separated pool; GITHUB_TOKEN joins it if set
+        pool = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",")]
+        self.github_tokens = [t for t in pool if t] or self.github_tokens
+        if self.github_token and self.github_token not in self.github_tokens:
+            self.github_tokens.insert(0, self.github_token)
+        if not self.github_token and self.github_tokens:
+            self.github_token = self.github_tokens[0]
         self.database_url = os.getenv("DATABASE_URL", self.database_url)
+        self.database_profile = os.getenv("DATABASE_PROFILE", self.database_profile)
+        self.spi_cache_enabled = (
+            os.getenv("SPI_CACHE_ENABLED", str(self.spi_cache_enabled)).lower()
+            == "true"
+        )
+        self.spi_cache_mode = os.getenv("SPI_CACHE_MODE", self.spi_cache_mode)
+        if self.spi_cache_mode not in ("result", "page"):
+            raise ValueError(
+                f"Invalid SPI_CACHE_MODE: {self.spi_cache_mode} (use 'result' or 'page')"
+            )
+        self.github_request_interval = float(
+            os.getenv("GITHUB_REQUEST_INTERVAL", self.github_request_interval)
+        )
+        self.spi_request_interval = float(
+            os.getenv("SPI_REQUEST_INTERVAL", self.spi_request_interval)
+        )
+        self.http_cache_enabled = (
+            os.getenv("HTTP_CACHE_ENABLED", str(self.http_cache_enabled)).lower()
+            == "true"
+        )
+        self.issue_count_cache_max_entries = int(
+            os.getenv(
+                "ISSUE_COUNT_CACHE_MAX_ENTRIES", self.issue_count_cache_max_entries
+            )
+        )
+        self.manifest_cache_max_entries = int(
+            os.getenv("MANIFEST_CACHE_MAX_ENTRIES", self.manifest_cache_max_entries)
+        )
 
         # Create necessary directories
         Path("logs").mkdir(exist_ok=True)
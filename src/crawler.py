@@ -0,0 +1,229 @@
+"""
+Breadth-first discovery of second-tier dependencies outside the source CSV.
+"""
+
+import json
+import logging
+import math
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.config import config
+from src.fetcher import DataProcessor
+from src.models import CrawlFrontier, PackageState, Repository
+from src.repository_keys import (
+    RepositoryResolver,
+    parse_repository_url,
+    repository_key,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyCrawler:
+    """Collects the packages that tracked packages depend on, breadth first.
+
+    Tracked packages are depth 0. A dependency first reached through a
+    package at depth d is queued in crawl_frontier at depth d + 1, at most
+    once per repo_key. Each run fetches the shallowest pending packages
+    through the collection pipeline, stores them in the "dependency" state
+    and queues their own dependencies. A failed package stays pending for
+    the next run and is marked error after max_attempts failures. It stops when nothing is pending
+    within max_depth or the next batch would not fit in the request budget.
+    Batches are sized from the highest number of GitHub requests a package
+    has cost so far, so a run ends within about one package's requests of
+    the budget.
+    """
+
+    def __init__(
+        self,
+        processor: DataProcessor,
+        max_depth: int = config.crawl_max_depth,
+        request_budget: int = config.crawl_request_budget,
+        max_attempts: int = config.crawl_max_attempts,
+    ):
+        self.processor = processor
+        self.db = processor.db
+        self.max_depth = max_depth
+        self.request_budget = request_budget
+        self.max_attempts = max_attempts
+
+    def discover(self, keys: Optional[Iterable[str]] = None) -> int:
+        """Queue the unseen dependencies of stored packages.
+
+        Scans every completed repository, or only those with the given
+        keys. Packages already stored are never queued; queued packages
+        found closer to the tracked set move up to the smaller depth.
+        Returns the number of frontier rows inserted or moved up.
+        """
+        resolver = RepositoryResolver.from_database(self.db)
+        frontier = {
+            key: (depth, status)
+            for key, depth, status in self.db.query(
+                CrawlFrontier.repo_key, CrawlFrontier.depth, CrawlFrontier.status
+            )
+        }
+
+        query = self.db.query(
+            Repository.repo_key, Repository.current_state, Repository.dependencies_json
+        ).filter(
+            Repository.processing_status == "completed",
+            Repository.dependencies_json.isnot(None),
+            Repository.repo_key.isnot(None),
+        )
+        if keys is not None:
+            query = query.filter(Repository.repo_key.in_(list(keys)))
+
+        found: Dict[str, Dict] = {}
+        for repo_key, state, dependencies_json in query:
+            depth = 0
+            if state == PackageState.DEPENDENCY.value:
+                depth = frontier.get(repo_key, (0, None))[0]
+            if depth >= self.max_depth:
+                continue
+
+            try:
+                entries = json.loads(dependencies_json)
+            except (TypeError, ValueError):
+                continue
+            for entry in entries:
+                url = entry.get("url") if isinstance(entry, dict) else None
+                parsed = parse_repository_url(url)
+                if parsed is None or resolver.resolve(url):
+                    continue
+                key = repository_key(*parsed)
+                if key in found and found[key]["depth"] <= depth + 1:
+                    continue
+                found[key] = {
+                    "repo_key": key,
+                    "url": f"https://github.com/{parsed[0]}/{parsed[1]}",
+                    "depth": depth + 1,
+                    "discovered_from": repo_key,
+                    "status": "pending",
+                    "discovered_at": datetime.utcnow(),
+                }
+
+        # New packages, and pending ones now reached in fewer hops
+        changed = [
+            row
+            for row in found.values()
+            if row["repo_key"] not in frontier
+            or (
+                frontier[row["repo_key"]][1] == "pending"
+                and row["depth"] < frontier[row["repo_key"]][0]
+            )
+        ]
+        if changed:
+            stmt = sqlite_insert(CrawlFrontier)
+            self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[CrawlFrontier.repo_key],
+                    set_={
+                        "depth": stmt.excluded.depth,
+                        "discovered_from": stmt.excluded.discovered_from,
+                    },
+                    where=(CrawlFrontier.status == "pending")
+                    & (stmt.excluded.depth < CrawlFrontier.depth),
+                ),
+                changed,
+            )
+            self.db.commit()
+        logger.info(f"Crawler queued or moved up {len(changed)} dependencies")
+        return len(changed)
+
+    def next_batch(self, limit: int, attempted_before: Optional[datetime] = None):
+        """Shallowest pending frontier rows within max_depth, oldest first.
+
+        Rows last attempted at or after attempted_before are left for a
+        later run. Rows whose package has since been stored some other way
+        (for example by --collect) are marked skipped instead.
+        """
+        resolver = RepositoryResolver.from_database(self.db)
+        pending = self.db.query(CrawlFrontier).filter(
+            CrawlFrontier.status == "pending",
+            CrawlFrontier.depth <= self.max_depth,
+        )
+        if attempted_before is not None:
+            pending = pending.filter(
+                or_(
+                    CrawlFrontier.fetched_at.is_(None),
+                    CrawlFrontier.fetched_at < attempted_before,
+                )
+            )
+        pending = pending.order_by(CrawlFrontier.depth, CrawlFrontier.id).limit(limit)
+        while True:
+            rows = pending.all()
+            batch = []
+            for row in rows:
+                if resolver.resolve(row.url):
+                    row.status = "skipped"
+                else:
+                    batch.append(row)
+            self.db.commit()
+            if batch or not rows:
+                return batch
+
+    def run(self, batch_size: int, concurrency: int = 1) -> Dict[str, int]:
+        """Crawl until the frontier or the request budget is exhausted."""
+        fetcher = self.processor.fetcher
+        start_requests = fetcher.request_count
+        started = datetime.utcnow()
+        cost = config.crawl_requests_per_repository
+        results = {"queued": self.discover(), "fetched": 0, "error": 0, "batches": 0}
+
+        while True:
+            remaining = self.request_budget - (fetcher.request_count - start_requests)
+            limit = min(batch_size, remaining // cost)
+            if limit < 1:
+                logger.info(f"Crawler stopping with {remaining} requests left")
+                break
+            # Packages that failed in this run wait for the next one
+            batch = self.next_batch(limit, attempted_before=started)
+            if not batch:
+                logger.info("Crawler frontier exhausted")
+                break
+
+            before = fetcher.request_count
+            self.processor.process_batch([row.url for row in batch], concurrency)
+            spent = fetcher.request_count - before
+            cost = max(cost, math.ceil(spent / len(batch)))
+
+            stored = {
+                key
+                for (key,) in self.db.query(Repository.repo_key).filter(
+                    Repository.repo_key.in_([row.repo_key for row in batch]),
+                    Repository.processing_status == "completed",
+                )
+            }
+            now = datetime.utcnow()
+            for row in batch:
+                row.fetched_at = now
+                if row.repo_key in stored:
+                    row.status = "fetched"
+                    continue
+                row.attempts = (row.attempts or 0) + 1
+                if row.attempts >= self.max_attempts:
+                    row.status = "error"
+            self.db.commit()
+
+            results["fetched"] += len(stored)
+            results["error"] += len(batch) - len(stored)
+            results["batches"] += 1
+            results["queued"] += self.discover(stored)
+
+        results["requests"] = fetcher.request_count - start_requests
+        return results
+
+    def frontier_status(self) -> Dict[int, Dict[str, int]]:
+        """Frontier row counts per depth and status."""
+        status: Dict[int, Dict[str, int]] = {}
+        for depth, row_status, count in (
+            self.db.query(CrawlFrontier.depth, CrawlFrontier.status, func.count())
+            .group_by(CrawlFrontier.depth, CrawlFrontier.status)
+            .order_by(CrawlFrontier.depth)
+        ):
+            status.setdefault(depth, {})[row_status] = count
+        return status
@@ -4,11 +4,12 @@ Dependency Analysis System for Swift Packages
 Provides data structures and parsing utilities for Package.swift files.
 """
 
-import re
 import logging
 from typing import Dict, List, Set, Tuple, Optional, Any
 from dataclasses import dataclass
 
+from src.repository_keys import parse_repository_url
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,24 +31,7 @@ class PackageDependency:
 
     def _parse_github_url(self, url: str) -> Tuple[Optional[str], Optional[str]]:
         """Parse GitHub URL to extract owner and repository name."""
-        try:
-            # Remove .git suffix and clean URL
-            clean_url = url.rstrip(".git")
-
-            # Handle various GitHub URL formats
-            patterns = [
-                r"github\.com[:/]([^/]+)/([^/]+)",
-                r"github\.com/([^/]+)/([^/]+)",
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, clean_url)
-                if match:
-                    return match.group(1), match.group(2)
-
-            return None, None
-        except Exception:
-            return None, None
+        return parse_repository_url(url) or (None, None)
 
 
 @dataclass
@@ -0,0 +1,265 @@
+"""
+Integer-indexed dependency graph over the repositories in the dataset.
+"""
+
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.dependencies import DependencyNode, PackageDependency
+from src.models import Repository
+from src.repository_keys import repository_key
+
+logger = logging.getLogger(__name__)
+
+
+def _csr(
+    sources: np.ndarray, targets: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Build (indptr, indices) so targets of node i are indices[indptr[i]:indptr[i + 1]]."""
+    order = np.argsort(sources, kind="stable")
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=size), out=indptr[1:])
+    return indptr, targets[order].astype(np.int32)
+
+
+def _neighbors(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray):
+    """Concatenated adjacency lists of several nodes, without a Python loop."""
+    starts, ends = indptr[nodes], indptr[nodes + 1]
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if not total:
+        return indices[:0]
+    # Position of every wanted entry: each run's start plus its offset in the run
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return indices[np.repeat(starts, lengths) + offsets]
+
+
+class DependencyGraph:
+    """Dependency edges between dataset repositories in CSR form.
+
+    Node i is the i-th loaded repository; keys[i] is its owner/name key and
+    ids[i] its database id. An edge i -> j means repository i declares a
+    dependency on repository j. Edges are stored forward (dependencies) and
+    reversed (dependents) as indptr/indices arrays, so adjacency lookups are
+    array slices and traversals run on NumPy arrays rather than objects.
+    Dependencies on packages outside the dataset are only counted.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        edges: Iterable[Tuple[int, int]],
+        ids: Optional[List[int]] = None,
+        attributes: Optional[Dict[str, np.ndarray]] = None,
+        unresolved: int = 0,
+    ):
+        self.keys = list(keys)
+        self.ids = np.asarray(ids if ids is not None else range(len(keys)))
+        self.attributes = attributes or {}
+        self.unresolved = unresolved
+        self._index = {key: i for i, key in enumerate(self.keys)}
+        self._depths: Optional[np.ndarray] = None
+
+        size = len(self.keys)
+        pairs = np.array(sorted(set(edges)), dtype=np.int32).reshape(-1, 2)
+        # A manifest naming its own repository is not a dependency
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        self.edge_count = len(pairs)
+        self.dep_indptr, self.dep_indices = _csr(pairs[:, 0], pairs[:, 1], size)
+        self.rev_indptr, self.rev_indices = _csr(pairs[:, 1], pairs[:, 0], size)
+
+    @classmethod
+    def from_database(cls, db) -> "DependencyGraph":
+        """Load every repository and resolve its stored dependencies to rows."""
+        rows = db.query(
+            Repository.id,
+            Repository.repo_key,
+            Repository.url,
+            Repository.stars,
+            Repository.forks,
+            Repository.has_package_swift,
+            Repository.linux_compatible,
+            Repository.android_compatible,
+            Repository.dependencies_json,
+        ).order_by(Repository.id)
+
+        ids, keys, manifests = [], [], []
+        columns = {
+            "url": [],
+            "stars": [],
+            "forks": [],
+            "has_package_swift": [],
+            "linux_compatible": [],
+            "android_compatible": [],
+        }
+        # Rows without a key duplicate another row's repository
+        for row in rows.filter(Repository.repo_key.isnot(None)):
+            ids.append(row.id)
+            keys.append(row.repo_key)
+            manifests.append(row.dependencies_json)
+            for column, values in columns.items():
+                values.append(getattr(row, column))
+
+        attributes = {
+            "url": np.array(columns["url"], dtype=object),
+            "stars": np.array([v or 0 for v in columns["stars"]], dtype=np.int64),
+            "forks": np.array([v or 0 for v in columns["forks"]], dtype=np.int64),
+        }
+        for column in ("has_package_swift", "linux_compatible", "android_compatible"):
+            attributes[column] = np.array([bool(v) for v in columns[column]])
+
+        index = {key: i for i, key in enumerate(keys)}
+        edges, unresolved = [], 0
+        for source, dependencies_json in enumerate(manifests):
+            for dependency in cls._parse_dependencies(dependencies_json):
+                target = index.get(
+                    repository_key(dependency.resolved_owner, dependency.resolved_repo)
+                )
+                if target is None:
+                    unresolved += 1
+                else:
+                    edges.append((source, target))
+
+        graph = cls(keys, edges, ids, attributes, unresolved)
+        logger.info(
+            f"Dependency graph: {len(keys)} packages, {graph.edge_count} edges, "
+            f"{unresolved} dependencies outside the dataset"
+        )
+        return graph
+
+    @staticmethod
+    def _parse_dependencies(dependencies_json: Optional[str]):
+        """Turn a stored dependencies_json value into PackageDependency objects."""
+        if not dependencies_json:
+            return []
+        try:
+            entries = json.loads(dependencies_json)
+        except (TypeError, ValueError):
+            return []
+        return [
+            PackageDependency(
+                name=entry["url"].rsplit("/", 1)[-1],
+                url=entry["url"],
+                version_requirement=entry.get("version_requirement"),
+            )
+            for entry in entries
+            if isinstance(entry, dict) and entry.get("url")
+        ]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def index(self, key: str) -> Optional[int]:
+        """Node index of an owner/name key, or None if not in the dataset."""
+        return self._index.get(key.lower())
+
+    def dependencies(self, node: int) -> np.ndarray:
+        """Direct dependencies of a node."""
+        return self.dep_indices[self.dep_indptr[node] : self.dep_indptr[node + 1]]
+
+    def dependents(self, node: int) -> np.ndarray:
+        """Packages that declare a direct dependency on a node."""
+        return self.rev_indices[self.rev_indptr[node] : self.rev_indptr[node + 1]]
+
+    def fan_in(self) -> np.ndarray:
+        """Number of direct dependents of every node."""
+        return np.diff(self.rev_indptr)
+
+    def fan_out(self) -> np.ndarray:
+        """Number of direct in-dataset dependencies of every node."""
+        return np.diff(self.dep_indptr)
+
+    def _reachable(self, indptr, indices, nodes) -> np.ndarray:
+        """Nodes reachable from any of nodes in one or more steps."""
+        seen = np.zeros(len(self), dtype=bool)
+        frontier = np.unique(np.asarray(nodes, dtype=np.int32))
+        while frontier.size:
+            reached = _neighbors(indptr, indices, frontier)
+            frontier = np.unique(reached[~seen[reached]])
+            seen[frontier] = True
+        return np.flatnonzero(seen)
+
+    def transitive_dependents(self, node: int) -> np.ndarray:
+        """Every package that depends on a node directly or indirectly."""
+        reached = self._reachable(self.rev_indptr, self.rev_indices, [node])
+        return reached[reached != node]
+
+    def transitive_dependencies(self, nodes) -> np.ndarray:
+        """Every package some of nodes depend on, directly or indirectly."""
+        return self._reachable(self.dep_indptr, self.dep_indices, nodes)
+
+    def transitive_dependent_counts(self) -> np.ndarray:
+        """Number of direct and indirect dependents of every node.
+
+        Only nodes with at least one dependent are traversed.
+        """
+        counts = np.zeros(len(self), dtype=np.int64)
+        for node in np.flatnonzero(self.fan_in()):
+            counts[node] = len(self.transitive_dependents(node))
+        return counts
+
+    def depths(self) -> np.ndarray:
+        """Length of the longest in-dataset dependency chain below every node.
+
+        Packages without in-dataset dependencies have depth 0. Packages on or
+        above a dependency cycle have no defined depth and get -1. Computed
+        once per graph; the returned array is read-only.
+        """
+        if self._depths is not None:
+            return self._depths
+
+        depth = np.full(len(self), -1, dtype=np.int64)
+        remaining = self.fan_out().copy()
+        level = np.flatnonzero(remaining == 0)
+        current = 0
+        while level.size:
+            depth[level] = current
+            # Each finished node releases one dependency of its dependents
+            released = _neighbors(self.rev_indptr, self.rev_indices, level)
+            np.subtract.at(remaining, released, 1)
+            candidates = np.unique(released)
+            level = candidates[remaining[candidates] == 0]
+            current += 1
+        depth.setflags(write=False)
+        self._depths = depth
+        return depth
+
+    def node(self, index: int) -> DependencyNode:
+        """Describe one package as a DependencyNode."""
+        owner, name = self.keys[index].split("/", 1)
+        attributes = {}
+        for column, values in self.attributes.items():
+            value = values[index]
+            attributes[column] = (
+                value.item() if isinstance(value, np.generic) else value
+            )
+        return DependencyNode(
+            package_id=self.keys[index],
+            name=name,
+            owner=owner,
+            repo=name,
+            url=attributes.pop("url", ""),
+            dependents=[self.keys[i] for i in self.dependents(index)],
+            depth=int(self.depths()[index]),
+            **attributes,
+        )
+
+    def impact(self, limit: int = 10) -> List[Dict]:
+        """Packages with the most transitive dependents, most depended-upon first."""
+        transitive = self.transitive_dependent_counts()
+        fan_in = self.fan_in()
+        depths = self.depths()
+        ranked = np.lexsort((-fan_in, -transitive))
+        return [
+            {
+                "package": self.keys[i],
+                "transitive_dependents": int(transitive[i]),
+                "direct_dependents": int(fan_in[i]),
+                "depth": int(depths[i]),
+            }
+            for i in ranked[:limit]
+            if transitive[i] > 0
+        ]
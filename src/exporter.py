@@ -0,0 +1,260 @@
+"""
+Streaming export of repository data to JSON and CSV.
+"""
+
+import csv
+import itertools
+import json
+import textwrap
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.models import Repository, StateTransition
+from src.stats import get_transition_summary
+
+# Exported repository fields, in output order
+EXPORT_COLUMNS = [
+    "url",
+    "owner",
+    "name",
+    "description",
+    "stars",
+    "forks",
+    "watchers",
+    "language",
+    "license_name",
+    "has_package_swift",
+    "swift_tools_version",
+    "dependencies_count",
+    "transitive_dependents",
+    "linux_compatible",
+    "android_compatible",
+    "current_state",
+    "priority_score",
+    "created_at",
+    "updated_at",
+    "pushed_at",
+    "last_fetched",
+]
+DATETIME_COLUMNS = {"created_at", "updated_at", "pushed_at", "last_fetched"}
+
+# Stands in for the streamed transition list while the JSON tail is rendered
+_RECENT_MARKER = "\0recent_transactions\0"
+
+
+def iter_repository_rows(
+    db, columns: List[str] = EXPORT_COLUMNS, chunk_size: int = 500
+) -> Iterator[Dict]:
+    """Yield completed repositories as dicts of raw column values, in chunks.
+
+    Only the requested columns are selected, so manifest text and other
+    large fields never leave the database.
+    """
+    query = (
+        db.query(*[getattr(Repository, column) for column in columns])
+        .filter(Repository.processing_status == "completed")
+        .order_by(Repository.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for values in query:
+        yield dict(zip(columns, values))
+
+
+def export_record(row: Dict) -> Dict:
+    """Build the exported form of a repository row."""
+    record = {column: row[column] for column in EXPORT_COLUMNS}
+    for column in DATETIME_COLUMNS:
+        if record[column]:
+            record[column] = record[column].isoformat()
+    return record
+
+
+def collect_transactions(db) -> Optional[Dict]:
+    """Summarize state transitions for the export.
+
+    Counts come from the transition summary table; the transitions
+    themselves are streamed by iter_transactions.
+    """
+    summary = get_transition_summary(db)
+    if not summary["total"]:
+        return None
+
+    return {
+        "total_transactions": summary["total"],
+        "github_issue_transactions": summary["github_issue"],
+        "status_breakdown": summary["by_state"],
+    }
+
+
+def iter_transactions(db, chunk_size: int = 500) -> Iterator[Dict]:
+    """Yield every state transition with its repository, in chunks."""
+    transitions = (
+        db.query(
+            Repository.owner,
+            Repository.name,
+            StateTransition.from_state,
+            StateTransition.to_state,
+            StateTransition.reason,
+            StateTransition.changed_by,
+            StateTransition.created_at,
+            StateTransition.issue_number,
+        )
+        .join(Repository, Repository.id == StateTransition.repository_id)
+        .order_by(StateTransition.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for transition in transitions:
+        transaction_data = {
+            "owner": transition.owner,
+            "name": transition.name,
+            "from_state": transition.from_state,
+            "to_state": transition.to_state,
+            "reason": transition.reason,
+            "changed_by": transition.changed_by,
+            "date": (
+                transition.created_at.isoformat() if transition.created_at else None
+            ),
+        }
+
+        # Add GitHub issue metadata if present
+        if transition.issue_number:
+            transaction_data["github_issue"] = transition.issue_number
+
+        yield transaction_data
+
+
+class JsonExportSink:
+    """Writes the JSON export one repository at a time.
+
+    The output is identical to json.dump(..., indent=2, default=str) of the
+    whole document, without holding the document in memory.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.count = 0
+        self.file = open(path, "w")
+        self.file.write('{\n  "repositories": [\n')
+
+    def write(self, row: Dict):
+        if self.count:
+            self.file.write(",\n")
+        self.file.write(textwrap.indent(json.dumps(row, indent=2, default=str), "    "))
+        self.count += 1
+
+    def close(
+        self,
+        transactions: Optional[Dict] = None,
+        recent: Optional[Iterable[Dict]] = None,
+    ):
+        tail = {
+            "metadata": {
+                "export_date": datetime.now().isoformat(),
+                "total_repositories": self.count,
+            }
+        }
+
+        # Add status change transactions if any; their list is streamed
+        # in place of the marker
+        if transactions:
+            tail["status_transactions"] = dict(
+                transactions, recent_transactions=_RECENT_MARKER
+            )
+
+        # Continue the open document: drop the tail's own opening brace
+        self.file.write("\n  ],\n")
+        text = json.dumps(tail, indent=2, default=str)[2:]
+        if transactions:
+            head, rest = text.split(json.dumps(_RECENT_MARKER))
+            self.file.write(head)
+            self._write_list(recent or (), "      ")
+            text = rest
+        self.file.write(text)
+        self.file.close()
+
+    def _write_list(self, items: Iterable[Dict], indent: str):
+        """Write a JSON list nested at indent, one item at a time."""
+        empty = True
+        for item in items:
+            self.file.write("[\n" if empty else ",\n")
+            self.file.write(
+                textwrap.indent(json.dumps(item, indent=2, default=str), indent)
+            )
+            empty = False
+        self.file.write("[]" if empty else f"\n{indent[:-2]}]")
+
+
+class CsvExportSink:
+    """Writes the CSV export one repository at a time, formatted like
+    DataFrame.to_csv(index=False)."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.count = 0
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file, lineterminator="\n")
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, row: Dict):
+        self.writer.writerow([row[column] for column in EXPORT_COLUMNS])
+        self.count += 1
+
+    def close(
+        self,
+        transactions: Optional[Dict] = None,
+        recent: Optional[Iterable[Dict]] = None,
+    ):
+        self.file.close()
+
+
+EXPORT_SINKS = {"json": JsonExportSink, "csv": CsvExportSink}
+
+
+def export_repositories(
+    db, outputs: Dict[str, str], keep_columns: Optional[List[str]] = None
+) -> Optional[Dict]:
+    """Export completed repositories to several files in a single read.
+
+    outputs maps a format in EXPORT_SINKS to its output path; every row is
+    written to all of them as it is read. When keep_columns is given, those
+    columns are also kept in memory and returned under "repositories" so
+    callers such as the analyzer can reuse the same read. Only rows marked
+    linux_compatible are written to the files and counted. Returns a summary
+    with the repository count and transactions, or None (writing nothing)
+    when there are no completed repositories.
+    """
+    keep_columns = keep_columns or []
+    columns = EXPORT_COLUMNS + [c for c in keep_columns if c not in EXPORT_COLUMNS]
+    rows = iter_repository_rows(db, columns)
+    first = next(rows, None)
+    if first is None:
+        return None
+
+    sinks = {fmt: EXPORT_SINKS[fmt](path) for fmt, path in outputs.items()}
+    kept = []
+    count = 0
+    for row in itertools.chain([first], rows):
+        if keep_columns:
+            kept.append({column: row[column] for column in keep_columns})
+        # Only Linux-compatible packages are published; crawled dependencies
+        # are kept for analysis
+        if not row["linux_compatible"]:
+            continue
+        record = export_record(row)
+        for sink in sinks.values():
+            sink.write(record)
+        count += 1
+
+    transactions = collect_transactions(db)
+    for sink in sinks.values():
+        # Each sink that lists transitions reads them in its own pass
+        sink.close(transactions, iter_transactions(db) if transactions else None)
+
+    return {
+        "total_repositories": count,
+        "transactions": transactions,
+        "repositories": kept,
+    }
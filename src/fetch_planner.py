@@ -0,0 +1,109 @@
+"""
+Per-repository fetch planning based on field-group freshness.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, or_
+
+from src.config import config
+from src.models import Repository
+
+# Field groups that are fetched and timestamped independently
+FETCH_STAGES = ("metadata", "issues", "manifest", "spi")
+
+
+@dataclass
+class FetchPlan:
+    """The sub-fetches that are due for one repository."""
+
+    metadata: bool = True  # Stars, forks, description, license, branch, dates
+    issues: bool = True  # Total issue count
+    manifest: bool = True  # Package.swift, tools version and dependencies
+    spi: bool = True  # Swift Package Index Android compatibility
+
+    # Last push time on record; a newer push also makes the manifest due
+    pushed_at: Optional[datetime] = None
+    # Last update time on record, for stages that run without fresh metadata
+    updated_at: Optional[datetime] = None
+
+    @property
+    def stages(self) -> List[str]:
+        """Names of the planned stages."""
+        return [stage for stage in FETCH_STAGES if getattr(self, stage)]
+
+    def is_empty(self) -> bool:
+        """Whether nothing is due."""
+        return not self.stages
+
+
+class FetchPlanner:
+    """Builds fetch plans from per-group TTLs and last_fetched_* timestamps.
+
+    Star counts move daily while manifests and Android status rarely do, so
+    each field group is only refetched once its own TTL has expired.
+    """
+
+    def __init__(self, ttl_hours: Optional[Dict[str, float]] = None):
+        self.ttl_hours = {
+            "metadata": config.metadata_ttl_hours,
+            "issues": config.issues_ttl_hours,
+            "manifest": config.manifest_ttl_hours,
+            "spi": config.spi_ttl_hours,
+        }
+        self.ttl_hours.update(ttl_hours or {})
+
+    def plan(
+        self, repo: Optional[Repository], now: Optional[datetime] = None
+    ) -> FetchPlan:
+        """Plan the stages that are due for a repository (all of them if new)."""
+        if repo is None:
+            return FetchPlan()
+
+        now = now or datetime.now()
+
+        # Failed repositories are retried once the metadata TTL expires
+        if (
+            repo.processing_status == "error"
+            and repo.last_fetched
+            and not self._is_due(repo.last_fetched, "metadata", now)
+        ):
+            return FetchPlan(
+                metadata=False,
+                issues=False,
+                manifest=False,
+                spi=False,
+                pushed_at=repo.pushed_at,
+                updated_at=repo.updated_at,
+            )
+
+        due = {
+            stage: self._is_due(getattr(repo, f"last_fetched_{stage}"), stage, now)
+            for stage in FETCH_STAGES
+        }
+        return FetchPlan(pushed_at=repo.pushed_at, updated_at=repo.updated_at, **due)
+
+    def _is_due(self, last_fetched: Optional[datetime], stage: str, now: datetime):
+        """Whether a stage's TTL has expired."""
+        if last_fetched is None:
+            return True
+        return now - last_fetched >= timedelta(hours=self.ttl_hours[stage])
+
+    def due_filter(self, stage: str, now: Optional[datetime] = None):
+        """SQLAlchemy filter matching repositories for which a stage is due."""
+        column = getattr(Repository, f"last_fetched_{stage}")
+        cutoff = (now or datetime.now()) - timedelta(hours=self.ttl_hours[stage])
+        return or_(column.is_(None), column <= cutoff)
+
+    def due_counts(self, db) -> Dict[str, int]:
+        """Count the repositories for which each stage is due, in one scan."""
+        now = datetime.now()
+        counts = db.query(
+            *[
+                func.sum(case((self.due_filter(stage, now), 1), else_=0))
+                for stage in FETCH_STAGES
+            ]
+        ).one()
+        return {stage: count or 0 for stage, count in zip(FETCH_STAGES, counts)}
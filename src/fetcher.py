@@ -2,20 +2,47 @@
 Data fetcher for GitHub repository information with rate limiting.
 """
 
+import base64
 import json
 import logging
+import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlparse
 
 import requests
 from github import Github, RateLimitExceededException, GithubException
-from tqdm import tqdm
-from bs4 import BeautifulSoup
-
+from github.Repository import Repository as GithubRepository
+from sqlalchemy import or_
+
+from src.cache import (
+    ConditionalRequestCache,
+    ManifestStore,
+    SpiCache,
+    git_blob_sha,
+    page_hash,
+)
+from src.collector import ConcurrentCollector
 from src.config import config
-from src.models import ProcessingLog, Repository, SessionLocal
+from src.dependency_graph import DependencyGraph
+from src.fetch_planner import FETCH_STAGES, FetchPlan, FetchPlanner
+from src.github_graphql import GitHubGraphQLClient
+from src.host_scheduler import GITHUB_HOST, SPI_HOST, HostScheduler
+from src.issue_counts import IssueCountProvider
+from src.models import (
+    DEFAULT_STATE,
+    PackageState,
+    ReadSessionLocal,
+    Repository,
+    SessionLocal,
+)
+from src.parse_pool import ParsePool
+from src.priority import PriorityScorer
+from src.rate_limit import to_timestamp
+from src.repository_keys import RepositoryResolver, parse_repository_url
+from src.result_writer import BulkResultWriter
+from src.stats import get_stats
+from src.token_pool import PooledToken, TokenPool
 
 # Configure logging
 logging.basicConfig(
@@ -29,123 +56,356 @@ logger = logging.getLogger(__name__)
 class GitHubFetcher:
     """Handles fetching repository data from GitHub API with rate limiting."""
 
-    def __init__(self):
-        self.github = Github(config.github_token) if config.github_token else Github()
+    def __init__(self, parse_workers: int = 0):
+        # Every token gets its own client and rate limit budget
+        self.token_pool = TokenPool(
+            config.github_tokens,
+            requests_per_hour=config.requests_per_hour,
+            reserve=config.rate_limit_reserve,
+        )
+        self._local = threading.local()
         self.session = requests.Session()
-        self.last_request_time = datetime.now()
         self.request_count = 0
         self.success_count = 0
         self.error_count = 0
 
+        # Lock so a single fetcher can be shared by concurrent collection workers
+        self._stats_lock = threading.Lock()
+
+        # Politeness budgets for api.github.com and swiftpackageindex.com
+        self.scheduler = HostScheduler.from_config()
+
+        # GraphQL batch prefetch results, keyed by URL
+        self._prefetched: Dict[str, Optional[Dict]] = {}
+        self._prefetch_lock = threading.Lock()
+
+        # Conditional request cache for REST calls (304s are free)
+        self.http_cache = (
+            ConditionalRequestCache(
+                config.http_cache_path, max_entries=config.http_cache_max_entries
+            )
+            if config.http_cache_enabled
+            else None
+        )
+
+        # Long-lived issue counts, refetched only when a repository changes
+        self.issue_counts = IssueCountProvider(self)
+
+        # Swift Package Index verdicts, refetched only once they expire
+        self.spi_cache = (
+            SpiCache(
+                config.spi_cache_path,
+                mode=config.spi_cache_mode,
+                max_entries=config.spi_cache_max_entries,
+                ttl_seconds=config.spi_cache_ttl_hours * 3600,
+            )
+            if config.spi_cache_enabled
+            else None
+        )
+
+        # Parsed Package.swift manifests keyed by blob SHA
+        self.manifests = ManifestStore(
+            config.manifest_cache_path, max_entries=config.manifest_cache_max_entries
+        )
+
+        # SPI pages and manifests are parsed inline or on worker processes
+        self.parser = ParsePool(parse_workers)
+
         # Check rate limit on initialization
         self._check_rate_limit_status()
 
+    @property
+    def current_token(self) -> PooledToken:
+        """The pooled token used by the calling thread's current fetch."""
+        return getattr(self._local, "token", None) or self.token_pool.tokens[0]
+
+    @property
+    def github(self) -> Github:
+        """PyGithub client for the calling thread's current token."""
+        return self.current_token.github
+
+    @property
+    def rate_limiter(self):
+        """Rate limiter for the calling thread's current token."""
+        return self.current_token.rate_limiter
+
+    def _use_token(self, resource: str = "core") -> PooledToken:
+        """Route the calling thread's next requests to the healthiest token."""
+        self._local.token = self.token_pool.acquire(resource)
+        return self._local.token
+
     def _check_rate_limit_status(self):
         """Check and log current rate limit status."""
-        try:
-            rate_limit = self.github.get_rate_limit()
-            core_limit = rate_limit.core
-            logger.info(
-                f"Rate limit status: {core_limit.remaining}/{core_limit.limit} requests remaining"
-            )
-            if core_limit.remaining < 100:
-                reset_time = core_limit.reset
-                logger.warning(f"Low rate limit remaining! Resets at {reset_time}")
-        except Exception as e:
-            logger.warning(f"Could not check rate limit status: {e}")
+        for pooled in self.token_pool.tokens:
+            try:
+                rate_limit = pooled.github.get_rate_limit()
+                for resource in ("core", "search", "graphql"):
+                    rate = getattr(rate_limit, resource)
+                    pooled.rate_limiter.update(
+                        resource, rate.remaining, rate.limit, to_timestamp(rate.reset)
+                    )
 
-    def _wait_for_rate_limit(self):
-        """Implement rate limiting to avoid hitting GitHub API limits."""
-        current_time = datetime.now()
-        time_since_last = (current_time - self.last_request_time).total_seconds()
+                core_limit = rate_limit.core
+                logger.info(
+                    f"Rate limit status ({pooled.label}): {core_limit.remaining}/{core_limit.limit} requests remaining"
+                )
+                if core_limit.remaining < 100:
+                    reset_time = core_limit.reset
+                    logger.warning(
+                        f"Low rate limit remaining for {pooled.label}! Resets at {reset_time}"
+                    )
+            except Exception as e:
+                logger.warning(
+                    f"Could not check rate limit status for {pooled.label}: {e}"
+                )
+
+    def _wait_for_rate_limit(self, resource: str = "core"):
+        """Take one request from the rate limit budget, sleeping only if exhausted.
 
-        # Ensure we don't exceed the rate limit
-        min_interval = 3600 / config.requests_per_hour  # seconds between requests
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
+        Must be called before every GitHub API request so all calls are counted.
+        """
+        self.rate_limiter.acquire(resource)
+        self._increment("request_count")
+
+    def _github_call(self, func, *args, **kwargs):
+        """Run a PyGithub call under the rate limiter and sync its budget."""
+        self._wait_for_rate_limit()
+        with self.scheduler.slot(GITHUB_HOST):
+            result = func(*args, **kwargs)
+        self._sync_rate_limit_from_client()
+        return result
+
+    def _sync_rate_limit_from_client(self):
+        """Refresh the core bucket from the headers PyGithub last received."""
+        try:
+            remaining, limit = self.github.rate_limiting
+            reset_at = self.github.rate_limiting_resettime
+        except Exception:
+            return
+        if limit > 0:
+            self.rate_limiter.update("core", remaining, limit, reset_at or None)
+
+    def graphql_client(self, pooled: PooledToken) -> GitHubGraphQLClient:
+        """Build a GraphQL client for a pooled token that honours host politeness."""
+        return GitHubGraphQLClient(
+            pooled.token, self.session, pooled.rate_limiter, self.scheduler
+        )
 
-        self.last_request_time = datetime.now()
-        self.request_count += 1
+    def _increment(self, counter: str):
+        """Increment a statistics counter safely from any worker thread."""
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
 
     def parse_github_url(self, url: str) -> Tuple[str, str]:
         """Parse GitHub URL to extract owner and repository name."""
-        # Handle different URL formats
-        if url.startswith("https://swiftpackageindex.com/"):
-            # Extract from Swift Package Index URL format
-            path_parts = (
-                url.replace("https://swiftpackageindex.com/", "")
-                .replace(".git", "")
-                .split("/")
-            )
-            if len(path_parts) >= 2:
-                return path_parts[0], path_parts[1]
+        parsed = parse_repository_url(url)
+        if parsed is None:
+            raise ValueError(f"Unable to parse GitHub URL: {url}")
+        return parsed
+
+    def prefetch_repository_metadata(self, urls: List[str]) -> int:
+        """Fetch metadata for many repositories through batched GraphQL queries.
+
+        Results are held until fetch_repository_metadata is called for each URL,
+        which then skips the per-repository REST calls. Returns the number of
+        repositories that were prefetched.
+        """
+        if not self.token_pool.authenticated:
+            logger.warning("GraphQL prefetch requires a GitHub token, using REST")
+            return 0
 
-        # Handle direct GitHub URLs
-        parsed = urlparse(url)
-        if "github.com" in parsed.netloc:
-            path_parts = parsed.path.strip("/").replace(".git", "").split("/")
-            if len(path_parts) >= 2:
-                return path_parts[0], path_parts[1]
+        repositories = {}
+        for url in urls:
+            try:
+                repositories[self.parse_github_url(url)] = url
+            except ValueError as e:
+                logger.warning(str(e))
+
+        keys = list(repositories.keys())
+        prefetched = 0
+        batch_size = config.graphql_batch_size
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i : i + batch_size]
+            pooled = self._use_token("graphql")
+            graphql = self.graphql_client(pooled)
+            self._wait_for_rate_limit("graphql")
+            try:
+                results = graphql.fetch_repositories(batch)
+                self._prefetch_manifest_texts(graphql, results)
+            except Exception as e:
+                logger.warning(f"GraphQL batch failed, falling back to REST: {e}")
+                continue
+
+            with self._prefetch_lock:
+                for key, metadata in results.items():
+                    self._prefetched[repositories[key]] = metadata
+            prefetched += len(results)
 
-        raise ValueError(f"Unable to parse GitHub URL: {url}")
+        logger.info(f"Prefetched metadata for {prefetched}/{len(urls)} repositories")
+        return prefetched
+
+    def _prefetch_manifest_texts(
+        self, graphql: GitHubGraphQLClient, results: Dict[Tuple[str, str], Dict]
+    ):
+        """Download Package.swift text only for blob SHAs not in the store.
+
+        Repositories whose manifest could not be downloaded are dropped from
+        the results so they take the REST path instead.
+        """
+        missing = [
+            key
+            for key, metadata in results.items()
+            if metadata
+            and metadata["package_swift_sha"]
+            and self.manifests.get(metadata["package_swift_sha"]) is None
+        ]
+        if not missing:
+            return
+
+        self._wait_for_rate_limit("graphql")
+        manifests = graphql.fetch_manifests(missing)
+        for key in missing:
+            if key not in manifests:
+                del results[key]
+                continue
+            sha, content = manifests[key]
+            results[key]["package_swift_sha"] = sha
+            results[key]["package_swift_content"] = content
+
+    def _take_prefetched(self, url: str) -> Tuple[bool, Optional[Dict]]:
+        """Pop prefetched metadata for a URL, returning (found, metadata)."""
+        with self._prefetch_lock:
+            if url in self._prefetched:
+                return True, self._prefetched.pop(url)
+        return False, None
+
+    def fetch_repository_metadata(
+        self, url: str, plan: Optional[FetchPlan] = None
+    ) -> Optional[Dict]:
+        """Fetch the planned stages for a repository, GitHub first, then SPI.
+
+        Only the stages in the plan are fetched (all of them without a plan).
+        The returned dict lists the executed stages under "fetched_stages".
+        """
+        plan = plan or FetchPlan()
+        metadata = self.fetch_github_stages(url, plan)
+        if metadata is not None and plan.spi:
+            self.fetch_spi_stage(metadata)
+        return metadata
 
-    def fetch_repository_metadata(self, url: str) -> Optional[Dict]:
+    def fetch_github_stages(self, url: str, plan: FetchPlan) -> Optional[Dict]:
+        """Fetch the GitHub stages of a plan, failing over to another token on
+        rate limits. The SPI stage is left to fetch_spi_stage.
+        """
+        attempts = len(self.token_pool)
+        for attempt in range(attempts):
+            pooled = self._use_token()
+            try:
+                return self._fetch_repository_metadata(url, plan)
+            except RateLimitExceededException:
+                if attempt + 1 < attempts and self.token_pool.has_available():
+                    logger.warning(
+                        f"{pooled.label} exhausted, retrying {url} with another token"
+                    )
+                    continue
+                raise
+
+    def _fetch_repository_metadata(self, url: str, plan: FetchPlan) -> Optional[Dict]:
         """Fetch repository metadata from GitHub API with enhanced error handling."""
         start_time = time.time()
 
         try:
             owner, repo_name = self.parse_github_url(url)
-            logger.info(f"Fetching metadata for {owner}/{repo_name}")
+            logger.info(f"Fetching {', '.join(plan.stages)} for {owner}/{repo_name}")
 
-            self._wait_for_rate_limit()
+            metadata = {"url": url, "owner": owner, "name": repo_name}
+            fetched_stages = []
+            manifest_sha = None
+            manifest_content = None
+            repo = None
 
-            # Get repository information with retry logic
-            repo = self._get_repo_with_retry(f"{owner}/{repo_name}")
-            if not repo:
-                self.error_count += 1
-                return None
+            was_prefetched, prefetched = self._take_prefetched(url)
+            if was_prefetched:
+                if not prefetched:
+                    logger.warning(
+                        f"Repository {owner}/{repo_name} not found (GraphQL)"
+                    )
+                    self._increment("error_count")
+                    return None
 
-            # Extract basic metadata with error handling
-            metadata = self._extract_basic_metadata(url, owner, repo_name, repo)
+                metadata.update(prefetched)
+                manifest_sha = metadata.pop("package_swift_sha")
+                manifest_content = metadata.pop("package_swift_content")
+                self.issue_counts.prime(
+                    owner,
+                    repo_name,
+                    metadata["issues_count"],
+                    metadata["updated_at"],
+                    metadata["pushed_at"],
+                )
+                fetched_stages += ["metadata", "issues"]
+            elif plan.metadata:
+                # Get repository information with retry logic
+                repo = self._get_repo_with_retry(f"{owner}/{repo_name}")
+                if not repo:
+                    self._increment("error_count")
+                    return None
 
-            # Try to fetch Package.swift content
-            package_swift_content = self._fetch_package_swift_safe(repo)
-            metadata["has_package_swift"] = package_swift_content is not None
-            metadata["package_swift_content"] = package_swift_content
+                # Extract basic metadata with error handling
+                metadata = self._extract_basic_metadata(url, owner, repo_name, repo)
+                fetched_stages.append("metadata")
+
+            if plan.issues and "issues" not in fetched_stages:
+                # The provider serves counts from cache unless the repository
+                # changed since the last count; without fresh metadata the
+                # stored timestamps identify the cached count
+                metadata["issues_count"] = self.issue_counts.get_count(
+                    owner,
+                    repo_name,
+                    metadata.get("updated_at", plan.updated_at),
+                    metadata.get("pushed_at", plan.pushed_at),
+                    fallback=metadata.get("open_issues_count"),
+                )
+                fetched_stages.append("issues")
 
-            if package_swift_content:
-                try:
-                    metadata["swift_tools_version"] = self._extract_swift_tools_version(
-                        package_swift_content
+            # A push since the last fetch may have changed Package.swift
+            pushed = (
+                "metadata" in fetched_stages
+                and metadata.get("pushed_at") != plan.pushed_at
+            )
+            if plan.manifest or pushed:
+                if was_prefetched:
+                    manifest = (
+                        self._resolve_manifest(manifest_sha, manifest_content)
+                        if manifest_sha
+                        else None
                     )
-                    dependencies = self._extract_dependencies(package_swift_content)
-                    metadata["dependencies_json"] = json.dumps(dependencies)
-                    metadata["dependencies_count"] = len(dependencies)
-                except Exception as e:
-                    logger.warning(
-                        f"Error parsing Package.swift for {owner}/{repo_name}: {e}"
+                else:
+                    manifest = self._fetch_package_swift_safe(
+                        f"{owner}/{repo_name}", repo
                     )
-                    metadata["dependencies_count"] = 0
 
-            # Check Android support from Swift Package Index
-            try:
-                android_support = self.check_android_support_spi(owner, repo_name)
-                if android_support is not None:
-                    metadata["android_compatible"] = android_support
-                    logger.info(
-                        f"Updated Android support status for {owner}/{repo_name}: {android_support}"
-                    )
-            except Exception as e:
-                logger.warning(
-                    f"Error checking Android support for {owner}/{repo_name}: {e}"
-                )
+                metadata["has_package_swift"] = manifest is not None
+                metadata["package_swift_content"] = None
+
+                if manifest:
+                    metadata["package_swift_content"] = manifest["content"]
+                    metadata["package_swift_sha"] = manifest["sha"]
+                    metadata["swift_tools_version"] = manifest["swift_tools_version"]
+                    if manifest["dependencies"] is None:
+                        metadata["dependencies_count"] = 0
+                    else:
+                        metadata["dependencies_json"] = json.dumps(
+                            manifest["dependencies"]
+                        )
+                        metadata["dependencies_count"] = len(manifest["dependencies"])
+                fetched_stages.append("manifest")
 
             # Add processing metadata
+            metadata["fetched_stages"] = fetched_stages
             metadata["fetch_duration"] = time.time() - start_time
 
-            self.success_count += 1
+            self._increment("success_count")
             logger.info(
                 f"Successfully fetched metadata for {owner}/{repo_name} in {metadata['fetch_duration']:.2f}s"
             )
@@ -156,21 +416,47 @@ class GitHubFetcher:
             self._handle_rate_limit_exceeded()
             raise
         except GithubException as e:
-            self.error_count += 1
+            self._increment("error_count")
             logger.error(
                 f"GitHub API error for {url}: {e.status} - {e.data.get('message', str(e))}"
             )
             return None
         except Exception as e:
-            self.error_count += 1
+            self._increment("error_count")
             logger.error(f"Unexpected error fetching metadata for {url}: {str(e)}")
             return None
 
+    def fetch_spi_stage(self, metadata: Dict):
+        """Check Android support on Swift Package Index and merge the result.
+
+        Runs separately from the GitHub stages so that one repository's SPI
+        page can be fetched while the next repository's GitHub requests run.
+        """
+        owner, repo_name = metadata["owner"], metadata["name"]
+        try:
+            android_support, missing = self.check_android_support_spi(owner, repo_name)
+            if android_support is not None:
+                metadata["android_compatible"] = android_support
+                metadata["fetched_stages"].append("spi")
+                logger.info(
+                    f"Updated Android support status for {owner}/{repo_name}: {android_support}"
+                )
+            elif missing:
+                # Not listed on SPI is a definite answer; only failures stay due
+                metadata["fetched_stages"].append("spi")
+        except Exception as e:
+            logger.warning(
+                f"Error checking Android support for {owner}/{repo_name}: {e}"
+            )
+
     def _get_repo_with_retry(self, repo_path: str, max_retries: int = 3):
         """Get repository with retry logic for transient errors."""
         for attempt in range(max_retries):
             try:
-                return self.github.get_repo(repo_path)
+                if self.http_cache:
+                    raw_data = self._conditional_get_json(f"/repos/{repo_path}")
+                    return self.github.create_from_raw_data(GithubRepository, raw_data)
+                return self._github_call(self.github.get_repo, repo_path)
             except GithubException as e:
                 if e.status == 404:
                     logger.warning(f"Repository {repo_path} not found (404)")
@@ -186,6 +472,51 @@ class GitHubFetcher:
                     raise
         return None
 
+    def _conditional_get_json(self, path: str):
+        """GET a REST API resource, revalidating any cached copy with ETags.
+
+        A 304 response reuses the stored payload. Errors are raised as the same
+        GithubException types PyGithub would raise so callers handle both paths
+        identically.
+        """
+        url = f"{config.github_api_base_url}{path}"
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.current_token.token:
+            headers["Authorization"] = f"token {self.current_token.token}"
+
+        cached = self.http_cache.get(url)
+        headers.update(self.http_cache.conditional_headers(cached))
+
+        self._wait_for_rate_limit()
+        with self.scheduler.slot(GITHUB_HOST):
+            response = self.session.get(url, headers=headers, timeout=15)
+        self.rate_limiter.update_from_headers(response.headers)
+
+        if response.status_code == 304 and cached:
+            self.http_cache.record_hit()
+            return cached["payload"]
+
+        self.http_cache.record_miss()
+
+        if response.status_code == 200:
+            payload = response.json()
+            self.http_cache.store(url, response.headers, payload)
+            return payload
+
+        try:
+            data = response.json()
+        except ValueError:
+            data = {"message": response.text}
+
+        if (
+            response.status_code in (403, 429)
+            and response.headers.get("X-RateLimit-Remaining") == "0"
+        ):
+            raise RateLimitExceededException(
+                response.status_code, data, dict(response.headers)
+            )
+        raise GithubException(response.status_code, data, dict(response.headers))
+
     def _extract_basic_metadata(
         self, url: str, owner: str, repo_name: str, repo
     ) -> Dict:
@@ -225,12 +556,6 @@ class GitHubFetcher:
         except Exception:
             metadata["license_name"] = None
 
-        # Handle issues count separately as it's expensive
-        try:
-            metadata["issues_count"] = repo.get_issues(state="all").totalCount
-        except Exception:
-            metadata["issues_count"] = metadata["open_issues_count"]
-
         return metadata
 
     def _handle_rate_limit_exceeded(self):
@@ -238,22 +563,49 @@ class GitHubFetcher:
         try:
             rate_limit = self.github.get_rate_limit()
             reset_time = rate_limit.core.reset
+            self.rate_limiter.mark_exhausted("core", reset_time)
             wait_seconds = (reset_time - datetime.now()).total_seconds()
             logger.error(
-                f"Rate limit exceeded. Reset in {wait_seconds:.0f} seconds at {reset_time}"
+                f"Rate limit exceeded for {self.current_token.label}. Reset in {wait_seconds:.0f} seconds at {reset_time}"
             )
         except Exception:
+            self.rate_limiter.mark_exhausted("core")
             logger.error(
                 "Rate limit exceeded. Please wait before making more requests."
             )
 
-    def _fetch_package_swift_safe(self, repo) -> Optional[str]:
-        """Safely fetch Package.swift file content with better error handling."""
+    def _fetch_package_swift_safe(
+        self, repo_path: str, repo: Optional[GithubRepository] = None
+    ) -> Optional[Dict]:
+        """Safely fetch the parsed Package.swift manifest with better error handling.
+
+        repo_path is "owner/name"; repo is only used, if already loaded, when
+        the HTTP cache is off.
+        """
         try:
-            package_file = repo.get_contents("Package.swift")
-            content = package_file.decoded_content.decode("utf-8")
-            logger.debug(f"Successfully fetched Package.swift ({len(content)} chars)")
-            return content
+            if self.http_cache:
+                # Unchanged files answer 304 with the cached payload, whose blob
+                # SHA then resolves from the manifest store without decoding
+                package_file = self._conditional_get_json(
+                    f"/repos/{repo_path}/contents/Package.swift"
+                )
+                sha = package_file.get("sha")
+                encoded = package_file["content"]
+                manifest = self._resolve_manifest(
+                    sha, lambda: base64.b64decode(encoded).decode("utf-8")
+                )
+            else:
+                # A lazy repository object builds the contents URL without a GET
+                repo = repo or self.github.get_repo(repo_path, lazy=True)
+                package_file = self._github_call(repo.get_contents, "Package.swift")
+                manifest = self._resolve_manifest(
+                    package_file.sha,
+                    lambda: package_file.decoded_content.decode("utf-8"),
+                )
+            logger.debug(
+                f"Resolved Package.swift {manifest['sha'][:7]} ({len(manifest['content'])} chars)"
+            )
+            return manifest
         except GithubException as e:
             if e.status == 404:
                 logger.debug("No Package.swift file found")
@@ -266,59 +618,99 @@ class GitHubFetcher:
             logger.warning(f"Unexpected error fetching Package.swift: {e}")
             return None
 
-    def _extract_swift_tools_version(self, package_content: str) -> Optional[str]:
-        """Extract Swift tools version from Package.swift content."""
-        for line in package_content.split("\n"):
-            if "swift-tools-version" in line:
-                # Extract version from comment like "// swift-tools-version:5.7"
-                parts = line.split(":")
-                if len(parts) > 1:
-                    return parts[1].strip()
-        return None
+    def _resolve_manifest(self, sha: Optional[str], content) -> Dict:
+        """Get a parsed manifest by blob SHA, decoding and parsing only on a miss.
 
-    def _extract_dependencies(self, package_content: str) -> List[Dict]:
-        """Extract dependencies from Package.swift content (basic parsing)."""
-        dependencies = []
-        # This is a simple regex-based approach - could be improved with proper parsing
-        import re
-
-        # Look for .package patterns
-        package_patterns = re.findall(r"\.package\([^)]+\)", package_content)
-
-        for pattern in package_patterns:
-            dep_info = {}
+        content is either the manifest text or a callable producing it, so the
+        decode is skipped entirely when the SHA is already known.
+        """
+        manifest = self.manifests.lookup(sha)
+        if manifest is not None:
+            return manifest
 
-            # Extract URL
-            url_match = re.search(r'url:\s*["\']([^"\']+)["\']', pattern)
-            if url_match:
-                dep_info["url"] = url_match.group(1)
+        if callable(content):
+            content = content()
+        sha = sha or git_blob_sha(content)
 
-            # Extract version requirements
-            version_match = re.search(r'from:\s*["\']([^"\']+)["\']', pattern)
-            if version_match:
-                dep_info["version_requirement"] = f"from: {version_match.group(1)}"
+        try:
+            swift_tools_version, dependencies = self.parser.parse_manifest(content)
+        except Exception as e:
+            logger.warning(f"Error parsing Package.swift {sha[:7]}: {e}")
+            # Not stored, so the next fetch retries the parse
+            return {
+                "sha": sha,
+                "content": content,
+                "swift_tools_version": None,
+                "dependencies": None,
+            }
 
-            if dep_info:
-                dependencies.append(dep_info)
+        return self.manifests.store(sha, content, swift_tools_version, dependencies)
 
-        return dependencies
+    def check_android_support_spi(
+        self, owner: str, repo_name: str
+    ) -> Tuple[Optional[bool], bool]:
+        """Check Android support status from Swift Package Index with multiple strategies.
 
-    def check_android_support_spi(self, owner: str, repo_name: str) -> Optional[bool]:
-        """Check Android support status from Swift Package Index with multiple strategies."""
+        Returns (verdict, missing from SPI). A verdict of None with missing
+        False means the check failed and should be retried.
+        """
         # Strategy 1: Try Swift Package Index website
-        android_support = self._scrape_spi_website(owner, repo_name)
-        if android_support is not None:
-            return android_support
+        android_support, missing = self._scrape_spi_website(owner, repo_name)
+        if android_support is not None or missing:
+            return android_support, missing
 
         # Strategy 2: Check Package.swift for platform declarations (if we have the content)
         # This will be handled separately in the main processing flow
 
         # Strategy 3: Heuristic based on package characteristics
         # For now, return None if we can't determine from SPI
-        return None
+        return None, False
 
-    def _scrape_spi_website(self, owner: str, repo_name: str) -> Optional[bool]:
-        """Scrape Swift Package Index website for Android support indicators."""
+    def _scrape_spi_website(
+        self, owner: str, repo_name: str
+    ) -> Tuple[Optional[bool], bool]:
+        """Scrape Swift Package Index website for Android support indicators.
+
+        Returns (verdict, missing from SPI). Verdicts are served from the SPI
+        cache until they expire. A page that is downloaded again unchanged
+        reuses the previous verdict unparsed.
+        """
+        key = f"{owner}/{repo_name}".lower()
+        stale = None
+        if self.spi_cache:
+            cached = self.spi_cache.get(key)
+            if cached is not None:
+                self.spi_cache.record_hit()
+                return cached["verdict"], cached.get("missing", False)
+            self.spi_cache.record_miss()
+            stale = self.spi_cache.get(key, include_expired=True)
+
+        content, missing = self._download_spi_page(owner, repo_name)
+        if missing:
+            if self.spi_cache:
+                self.spi_cache.store(key, None, missing=True)
+            return None, True
+        if content is None:
+            return None, False
+
+        if (
+            stale
+            and stale["verdict"] is not None
+            and stale["page_hash"] == page_hash(content)
+        ):
+            logger.debug(f"SPI page for {owner}/{repo_name} unchanged")
+            android_support = stale["verdict"]
+        else:
+            android_support = self._parse_spi_page(content, owner, repo_name)
+
+        if self.spi_cache and android_support is not None:
+            self.spi_cache.store(key, android_support, content)
+        return android_support, False
+
+    def _download_spi_page(
+        self, owner: str, repo_name: str
+    ) -> Tuple[Optional[bytes], bool]:
+        """Download a package's SPI page. Returns (content, missing from SPI)."""
         spi_url = f"https://swiftpackageindex.com/{owner}/{repo_name}"
 
         try:
@@ -341,17 +733,19 @@ class GitHubFetcher:
                 }
 
                 try:
-                    # Add delay to be respectful
-                    time.sleep(1)
-                    response = self.session.get(spi_url, headers=headers, timeout=15)
+                    # Respect the SPI spacing shared by all workers
+                    with self.scheduler.slot(SPI_HOST):
+                        response = self.session.get(
+                            spi_url, headers=headers, timeout=15
+                        )
 
                     if response.status_code == 200:
-                        return self._parse_spi_page(response.content, owner, repo_name)
+                        return response.content, False
                     elif response.status_code == 404:
                         logger.debug(
                             f"Package {owner}/{repo_name} not found on Swift Package Index"
                         )
-                        return None
+                        return None, True
                     elif response.status_code == 403:
                         logger.debug(
                             f"Access denied for {owner}/{repo_name}, trying next user agent"
@@ -373,271 +767,44 @@ class GitHubFetcher:
             logger.warning(
                 f"All attempts failed to fetch SPI page for {owner}/{repo_name}"
             )
-            return None
+            return None, False
 
         except Exception as e:
             logger.warning(f"Error fetching SPI page for {owner}/{repo_name}: {e}")
-            return None
+            return None, False
 
     def _parse_spi_page(
         self, content: bytes, owner: str, repo_name: str
     ) -> Optional[bool]:
         """Parse Swift Package Index page content for Android support indicators.
 
-        Looks for platform compatibility badges and checks their visual state:
-        - Green background indicates supported platform
-        - Grey/disabled background indicates unsupported platform
+        Only the compatibility matrix is parsed; see src.spi_extractor.
         """
-        try:
-            soup = BeautifulSoup(content, "html.parser")
-
-            # Strategy 1: Look for platform compatibility badges/buttons with Android text
-            # These usually have classes like 'badge', 'platform', 'btn', etc.
-            android_elements = soup.find_all(
-                ["span", "div", "button", "a"],
-                string=lambda text: text and "android" in text.lower(),
-            )
-
-            for element in android_elements:
-                # Check the element and its parents for styling indicators
-                elements_to_check = [element] + list(element.parents)[
-                    :3
-                ]  # Check element + up to 3 parents
-
-                for elem in elements_to_check:
-                    # Get style attribute
-                    style = elem.get("style", "").lower()
-
-                    # Get class attributes
-                    class_attr = elem.get("class", [])
-                    if isinstance(class_attr, str):
-                        class_attr = [class_attr]
-                    classes = " ".join(class_attr).lower()
-
-                    # Check for green indicators (supported) - Swift Package Index specific
-                    green_indicators = [
-                        "green",
-                        "success",
-                        "enabled",
-                        "supported",
-                        "active",
-                        # Swift Package Index enabled Android colors
-                        "rgb(14, 191, 76)",
-                        "rgb(255, 255, 255)",
-                        "#0ebf4c",
-                        "#ffffff",
-                        # Swift Package Index CSS classes - be specific to avoid matching "incompatible"
-                        "result compatible",
-                        # Additional common green variations
-                        "rgb(34, 197, 94)",
-                        "rgb(22, 163, 74)",
-                        "#22c55e",
-                        "#16a34a",
-                        "bg-green",
-                        "text-green",
-                        "border-green",
-                    ]
-
-                    # Check for grey/disabled indicators (not supported) - Swift Package Index specific
-                    grey_indicators = [
-                        "grey",
-                        "gray",
-                        "disabled",
-                        "inactive",
-                        "muted",
-                        "unavailable",
-                        "incompatible",
-                        # Swift Package Index disabled Android colors
-                        "rgb(25, 25, 35)",
-                        "rgb(154, 154, 154)",
-                        "#191923",
-                        "#9a9a9a",
-                        # Swift Package Index CSS classes
-                        "result incompatible",
-                        "incompatible",
-                        "result unknown",
-                        "unknown",
-                        # Additional common grey variations
-                        "rgb(156, 163, 175)",
-                        "rgb(107, 114, 128)",
-                        "#9ca3af",
-                        "#6b7280",
-                        "bg-gray",
-                        "text-gray",
-                        "border-gray",
-                        "opacity-50",
-                        "opacity-25",
-                    ]
-
-                    # Check style and classes for indicators
-                    content_to_check = f"{style} {classes}"
-
-                    if any(
-                        indicator in content_to_check for indicator in green_indicators
-                    ):
-                        logger.info(
-                            f"Found Android with green/supported styling for {owner}/{repo_name}"
-                        )
-                        return True
-                    elif any(
-                        indicator in content_to_check for indicator in grey_indicators
-                    ):
-                        logger.info(
-                            f"Found Android with grey/disabled styling for {owner}/{repo_name}"
-                        )
-                        return False
-
-            # Strategy 2: Look for platform grids/lists and check Android element styling
-            platform_containers = soup.find_all(
-                ["div", "ul", "ol"],
-                class_=lambda x: x
-                and any(
-                    keyword in str(x).lower()
-                    for keyword in ["platform", "compatibility", "support", "badge"]
-                ),
-            )
-
-            for container in platform_containers:
-                # Find all elements in container that might contain Android
-                child_elements = container.find_all(
-                    ["span", "div", "li", "button", "a"]
-                )
-
-                for child in child_elements:
-                    text = child.get_text().lower()
-                    if "android" in text:
-                        # Check styling of this specific child
-                        style = child.get("style", "").lower()
-                        classes = " ".join(child.get("class", [])).lower()
-                        content_to_check = f"{style} {classes}"
-
-                        green_indicators = [
-                            "green",
-                            "success",
-                            "enabled",
-                            "supported",
-                            "active",
-                            # Swift Package Index enabled colors
-                            "rgb(14, 191, 76)",
-                            "rgb(255, 255, 255)",
-                            "#0ebf4c",
-                            "#ffffff",
-                            # Swift Package Index CSS classes - be specific to avoid matching "incompatible"
-                            "result compatible",
-                            # Additional variations
-                            "rgb(34, 197, 94)",
-                            "#22c55e",
-                            "bg-green",
-                        ]
-                        grey_indicators = [
-                            "grey",
-                            "gray",
-                            "disabled",
-                            "inactive",
-                            "muted",
-                            "incompatible",
-                            # Swift Package Index disabled colors
-                            "rgb(25, 25, 35)",
-                            "rgb(154, 154, 154)",
-                            "#191923",
-                            "#9a9a9a",
-                            # Swift Package Index CSS classes
-                            "result incompatible",
-                            "incompatible",
-                            "result unknown",
-                            "unknown",
-                            # Additional variations
-                            "rgb(156, 163, 175)",
-                            "#9ca3af",
-                            "bg-gray",
-                            "opacity-50",
-                        ]
-
-                        if any(
-                            indicator in content_to_check
-                            for indicator in green_indicators
-                        ):
-                            logger.info(
-                                f"Found Android with green styling in platform container for {owner}/{repo_name}"
-                            )
-                            return True
-                        elif any(
-                            indicator in content_to_check
-                            for indicator in grey_indicators
-                        ):
-                            logger.info(
-                                f"Found Android with grey styling in platform container for {owner}/{repo_name}"
-                            )
-                            return False
-
-            # Strategy 3: Look for images/icons with Android in alt/title and check parent styling
-            images = soup.find_all("img")
-            for img in images:
-                alt_text = img.get("alt", "").lower()
-                title = img.get("title", "").lower()
-                src = img.get("src", "").lower()
-
-                if any("android" in text for text in [alt_text, title, src]):
-                    # Check parent elements for styling
-                    for parent in list(img.parents)[:3]:
-                        style = parent.get("style", "").lower()
-                        classes = " ".join(parent.get("class", [])).lower()
-                        content_to_check = f"{style} {classes}"
-
-                        if any(
-                            indicator in content_to_check
-                            for indicator in ["green", "success", "enabled"]
-                        ):
-                            logger.info(
-                                f"Found Android icon with green parent styling for {owner}/{repo_name}"
-                            )
-                            return True
-                        elif any(
-                            indicator in content_to_check
-                            for indicator in ["grey", "gray", "disabled"]
-                        ):
-                            logger.info(
-                                f"Found Android icon with grey parent styling for {owner}/{repo_name}"
-                            )
-                            return False
-
-            # Strategy 4: Fallback - if we found Android mentioned but no clear styling indicators,
-            # look for general patterns that might indicate support
-            page_text = soup.get_text().lower()
-            if "android" in page_text:
-                # Look for positive indicators near Android mentions
-                if any(
-                    phrase in page_text
-                    for phrase in [
-                        "android support",
-                        "supports android",
-                        "android compatible",
-                    ]
-                ):
-                    logger.info(
-                        f"Found positive Android support text for {owner}/{repo_name}"
-                    )
-                    return True
-
-            # No clear Android support indicators found
-            logger.debug(
-                f"No clear Android support indicators found for {owner}/{repo_name}"
-            )
-            return False  # Default to False (not supported) instead of None
-
-        except Exception as e:
-            logger.warning(
-                f"Error parsing SPI page content for {owner}/{repo_name}: {e}"
-            )
-            return None
+        android_support = self.parser.parse_spi_page(content)
+        logger.debug(f"SPI Android verdict for {owner}/{repo_name}: {android_support}")
+        return android_support
 
 
 class DataProcessor:
     """Processes repository data and updates the database with enhanced progress tracking."""
 
-    def __init__(self):
-        self.fetcher = GitHubFetcher()
+    def __init__(
+        self,
+        use_graphql: bool = False,
+        incremental: bool = False,
+        parse_workers: int = 0,
+        new_state: str = DEFAULT_STATE,
+    ):
+        self.fetcher = GitHubFetcher(parse_workers)
         self.db = SessionLocal()
+        self.writer = BulkResultWriter(self.db, config.write_batch_size)
+        self.use_graphql = use_graphql
+        self.incremental = incremental
+        self.new_state = new_state  # State of repositories stored for the first time
+        # Probes are cheap, so incremental runs may revisit metadata sooner
+        self.planner = FetchPlanner(
+            {"metadata": config.probe_interval_hours} if incremental else None
+        )
         self.processed_count = 0
         self.success_count = 0
         self.error_count = 0
@@ -649,172 +816,231 @@ class DataProcessor:
 
         try:
             df = pd.read_csv(config.csv_file_path, header=None, names=["url"])
-            urls = df["url"].str.strip('"').tolist()
-            logger.info(f"Loaded {len(urls)} repository URLs from CSV")
+            rows = df["url"].str.strip('"').tolist()
+            # Use stored spellings so no repository is fetched under two URLs
+            urls = RepositoryResolver.from_database(self.db).canonicalize(rows)
+            logger.info(
+                f"Loaded {len(urls)} repository URLs from CSV "
+                f"({len(rows) - len(urls)} duplicate or unrecognized)"
+            )
             return urls
         except Exception as e:
             logger.error(f"Error loading CSV file: {str(e)}")
             return []
 
-    def process_repository(self, url: str) -> str:
-        """Process a single repository. Returns 'success', 'error', or 'skipped'."""
-        start_time = datetime.now()
+    def get_existing_repositories(self, urls: List[str]) -> Dict[str, Repository]:
+        """Load the stored repository rows for a list of URLs in one query."""
+        repos = self.db.query(Repository).filter(Repository.url.in_(urls)).all()
+        return {repo.url: repo for repo in repos}
 
-        try:
-            # Check if repository already exists
-            existing_repo = (
-                self.db.query(Repository).filter(Repository.url == url).first()
-            )
+    def is_recently_fetched(self, existing_repo: Optional[Repository]) -> bool:
+        """Check whether every field group of a repository is still fresh."""
+        return self.planner.plan(existing_repo).is_empty()
 
-            # Skip if recently processed (within last 24 hours)
-            if existing_repo and existing_repo.last_fetched:
-                time_since_fetch = datetime.now() - existing_repo.last_fetched
-                if time_since_fetch < timedelta(hours=24):
-                    logger.debug(f"Skipping {url} - recently processed")
-                    return "skipped"
+    def filter_unchanged(
+        self, urls: List[str], existing_repos: Dict[str, Repository]
+    ) -> List[str]:
+        """Return the URLs whose metadata did not change, using a cheap probe.
 
-            # Fetch metadata
-            metadata = self.fetcher.fetch_repository_metadata(url)
-            if not metadata:
-                self._log_processing_error(url, "Failed to fetch metadata", start_time)
-                return "error"
+        Only stored repositories whose metadata stage is due are probed.
+        """
+        from src.change_probe import ChangeProbe
+
+        candidates = [
+            url
+            for url in urls
+            if url in existing_repos and self.planner.plan(existing_repos[url]).metadata
+        ]
+        if not candidates:
+            return []
 
-            # Update or create repository record
-            try:
-                if existing_repo:
-                    for key, value in metadata.items():
-                        if hasattr(existing_repo, key):  # Only set existing attributes
-                            setattr(existing_repo, key, value)
-                    existing_repo.last_fetched = datetime.now()
-                    existing_repo.processing_status = "completed"
-                    existing_repo.fetch_error = None
-                else:
-                    # Filter metadata to only include valid Repository fields
-                    valid_fields = {
-                        key: value
-                        for key, value in metadata.items()
-                        if hasattr(Repository, key)
-                    }
-
-                    repo = Repository(**valid_fields)
-                    repo.last_fetched = datetime.now()
-                    repo.processing_status = "completed"
-                    repo.linux_compatible = (
-                        True  # All repos in our CSV are Linux compatible
-                    )
-                    # android_compatible will be set from metadata if detected, otherwise defaults to False
-                    if "android_compatible" not in valid_fields:
-                        repo.android_compatible = False  # Default for repos in our CSV
-                    self.db.add(repo)
-
-                # Update current_state based on android_compatible
-                repo_obj = existing_repo if existing_repo else repo
-                if repo_obj.android_compatible:
-                    repo_obj.current_state = "android_supported"
-                elif (
-                    repo_obj.current_state == "android_supported"
-                    and not repo_obj.android_compatible
-                ):
-                    # Reset incorrectly marked repositories
-                    repo_obj.current_state = "tracking"
+        probes = ChangeProbe(self.fetcher).probe(candidates)
+        unchanged = [
+            url
+            for url in candidates
+            if not ChangeProbe.has_changed(existing_repos[url], probes.get(url))
+        ]
 
-                self.db.commit()
+        logger.info(
+            f"Change probe: {len(unchanged)} of {len(candidates)} repositories unchanged"
+        )
+        return unchanged
 
-                # Log successful processing
-                duration = (datetime.now() - start_time).total_seconds()
-                log_entry = ProcessingLog(
-                    repository_url=url,
-                    action="fetch_metadata",
-                    status="success",
-                    message=f"Successfully processed {metadata.get('owner')}/{metadata.get('name')}",
-                    duration_seconds=duration,
-                )
-                self.db.add(log_entry)
-                self.db.commit()
+    def mark_unchanged(self, url: str, existing_repo: Repository):
+        """Mark metadata and manifest fresh without re-running those stages.
 
-                logger.info(f"Successfully processed {url} in {duration:.1f}s")
-                return "success"
+        Issue counts and Swift Package Index results can change without a
+        push, so they keep following their own TTLs.
+        """
+        now = datetime.now()
+        existing_repo.last_fetched_metadata = now
+        existing_repo.last_fetched_manifest = now
 
-            except Exception as db_error:
-                logger.error(f"Database error for {url}: {db_error}")
-                self.db.rollback()
-                self._log_processing_error(
-                    url, f"Database error: {str(db_error)}", start_time
-                )
-                return "error"
+        self.writer.add_log(
+            repository_url=url,
+            action="probe_changes",
+            status="unchanged",
+            message=f"No changes since last fetch of {existing_repo.owner}/{existing_repo.name}",
+            duration_seconds=0,
+        )
 
-        except Exception as e:
-            logger.error(f"Unexpected error processing {url}: {e}")
-            self._log_processing_error(url, str(e), start_time)
+    def store_repository_metadata(
+        self,
+        url: str,
+        metadata: Optional[Dict],
+        existing_repo: Optional[Repository],
+        start_time: datetime,
+    ) -> str:
+        """Queue fetched metadata for a repository. Returns 'success' or 'error'.
+
+        Rows are written in batches by self.writer; database errors surface
+        when the batch is flushed and are logged per repository there.
+        """
+        if not metadata:
+            self._log_processing_error(url, "Failed to fetch metadata", start_time)
             return "error"
 
+        fetched_at = datetime.now()
+        row = dict(metadata)
+        for stage in metadata.get("fetched_stages", []):
+            row[f"last_fetched_{stage}"] = fetched_at
+        row["last_fetched"] = fetched_at
+        row["processing_status"] = "completed"
+        row["fetch_error"] = None
+
+        # The manifest text only changes together with its blob SHA
+        if (
+            existing_repo
+            and existing_repo.package_swift_sha
+            and existing_repo.package_swift_sha == metadata.get("package_swift_sha")
+        ):
+            row.pop("package_swift_content", None)
+
+        # Update current_state based on android_compatible
+        if existing_repo:
+            android_compatible = row.get(
+                "android_compatible", existing_repo.android_compatible
+            )
+            current_state = existing_repo.current_state
+        else:
+            # New repositories default to linux compatible, not android compatible
+            android_compatible = row.get("android_compatible", False)
+            current_state = self.new_state
+            row["current_state"] = current_state
+            # Crawled dependencies are not from the Linux-compatible CSV
+            if current_state == PackageState.DEPENDENCY.value:
+                row["linux_compatible"] = False
+        if android_compatible:
+            row["current_state"] = "android_supported"
+        elif current_state == "android_supported":
+            # Reset incorrectly marked repositories
+            row["current_state"] = "tracking"
+
+        self.writer.upsert_repository(row)
+
+        # Log successful processing
+        duration = (datetime.now() - start_time).total_seconds()
+        self.writer.add_log(
+            repository_url=url,
+            action="fetch_metadata",
+            status="success",
+            message=f"Successfully processed {metadata.get('owner')}/{metadata.get('name')}",
+            duration_seconds=duration,
+        )
+
+        logger.info(f"Successfully processed {url} in {duration:.1f}s")
+        return "success"
+
     def _log_processing_error(self, url: str, error_message: str, start_time: datetime):
         """Log processing error to database and logs."""
         duration = (datetime.now() - start_time).total_seconds()
 
         # Update repository record with error
-        existing_repo = self.db.query(Repository).filter(Repository.url == url).first()
-        if existing_repo:
-            existing_repo.processing_status = "error"
-            existing_repo.fetch_error = error_message
-            existing_repo.last_fetched = datetime.now()
+        self.writer.mark_error(url, error_message, datetime.now())
 
         # Log error
-        log_entry = ProcessingLog(
+        self.writer.add_log(
             repository_url=url,
             action="fetch_metadata",
             status="error",
             message=error_message,
             duration_seconds=duration,
         )
-        self.db.add(log_entry)
-        self.db.commit()
 
         logger.error(f"Error processing {url}: {error_message}")
 
-    def process_batch(self, urls: List[str]) -> Dict[str, int]:
-        """Process a batch of repositories with progress tracking."""
+    def process_batch(self, urls: List[str], concurrency: int = 1) -> Dict[str, int]:
+        """Process a batch of repositories with progress tracking.
+
+        concurrency is the number of repositories in the GitHub stage at once.
+        """
         if not self.start_time:
             self.start_time = time.time()
 
-        results = {"success": 0, "error": 0, "skipped": 0}
-        batch_start = time.time()
-
-        # Use tqdm for progress bar
-        progress_bar = tqdm(urls, desc="Processing repositories", unit="repo")
-
-        for url in progress_bar:
-            result = self.process_repository(url)
-
-            if result == "success":
-                results["success"] += 1
-                self.success_count += 1
-            elif result == "error":
-                results["error"] += 1
-                self.error_count += 1
-            else:  # skipped
-                results["skipped"] += 1
-
-            self.processed_count += 1
+        # Scores that the batch can change, judged on the dependencies before it
+        scorer = PriorityScorer(self.db)
+        batch_urls = list(urls)
+        affected_ids = scorer.affected_ids(
+            batch_urls, DependencyGraph.from_database(self.db)
+        )
 
-            # Update progress bar with current stats
-            progress_bar.set_postfix(
-                {
-                    "Success": results["success"],
-                    "Errors": results["error"],
-                    "Skipped": results["skipped"],
-                }
-            )
+        unchanged_urls = []
+        if self.use_graphql or self.incremental:
+            existing_repos = self.get_existing_repositories(urls)
+
+            if self.incremental:
+                for url in self.filter_unchanged(urls, existing_repos):
+                    self.mark_unchanged(url, existing_repos[url])
+                    # Repositories with nothing else due are finished
+                    if self.is_recently_fetched(existing_repos[url]):
+                        existing_repos[url].last_fetched = datetime.now()
+                        unchanged_urls.append(url)
+                self.db.commit()
+                finished = set(unchanged_urls)
+                urls = [url for url in urls if url not in finished]
+
+            if self.use_graphql:
+                self.fetcher.prefetch_repository_metadata(
+                    [
+                        url
+                        for url in urls
+                        if self.planner.plan(existing_repos.get(url)).metadata
+                    ]
+                )
 
-            # Small delay between repositories
-            time.sleep(1)
+        # Even at concurrency 1 the GitHub and SPI stages overlap; host spacing
+        # replaces the old fixed delay between repositories
+        try:
+            results = ConcurrentCollector(self, concurrency).process_batch(urls)
+        finally:
+            # Results still buffered when a batch ends or is interrupted
+            self.writer.flush()
+        for _ in unchanged_urls:
+            self.record_result(results, "unchanged")
 
-        progress_bar.close()
+        try:
+            # One graph of the dependencies after the batch serves both calls
+            graph = DependencyGraph.from_database(self.db)
+            scorer.rescore(affected_ids | scorer.affected_ids(batch_urls, graph), graph)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error updating priority scores: {e}")
+        return results
 
-        batch_duration = time.time() - batch_start
-        logger.info(f"Batch completed in {batch_duration:.1f}s: {results}")
+    def record_result(self, results: Dict[str, int], result: str):
+        """Tally a per-repository result into batch results and running totals."""
+        if result == "success":
+            results["success"] += 1
+            self.success_count += 1
+        elif result == "error":
+            results["error"] += 1
+            self.error_count += 1
+        elif result == "unchanged":
+            results["unchanged"] = results.get("unchanged", 0) + 1
+        else:  # skipped
+            results["skipped"] += 1
 
-        return results
+        self.processed_count += 1
 
     def get_processing_stats(self) -> Dict[str, any]:
         """Get current processing statistics."""
@@ -835,6 +1061,18 @@ class DataProcessor:
                 "success_count": self.fetcher.success_count,
                 "error_count": self.fetcher.error_count,
                 "request_count": self.fetcher.request_count,
+                "rate_limits": self.fetcher.token_pool.status(),
+                "hosts": self.fetcher.scheduler.stats(),
+            },
+            "cache_stats": {
+                "http": (
+                    self.fetcher.http_cache.stats() if self.fetcher.http_cache else None
+                ),
+                "issue_counts": self.fetcher.issue_counts.cache.stats(),
+                "manifests": self.fetcher.manifests.stats(),
+                "spi": (
+                    self.fetcher.spi_cache.stats() if self.fetcher.spi_cache else None
+                ),
             },
         }
 
@@ -842,12 +1080,16 @@ class DataProcessor:
         self, all_urls: List[str], chunk_size: int = 250
     ) -> List[str]:
         """Get the oldest repositories that need refreshing, up to chunk_size."""
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
-            # Get repositories ordered by staleness (never fetched first, then oldest first)
+            # Get repositories with any stage due, ordered by staleness (never
+            # fetched first, then oldest first)
             stale_repos = (
                 db.query(Repository)
                 .filter(Repository.url.in_(all_urls))
+                .filter(
+                    or_(*[self.planner.due_filter(stage) for stage in FETCH_STAGES])
+                )
                 .order_by(
                     Repository.last_fetched.asc().nullsfirst(),  # Never fetched first
                     Repository.updated_at.asc().nullsfirst(),  # Then oldest updates
@@ -876,7 +1118,9 @@ class DataProcessor:
         finally:
             db.close()
 
-    def process_chunk(self, all_urls: List[str], chunk_size: int = 250) -> dict:
+    def process_chunk(
+        self, all_urls: List[str], chunk_size: int = 250, concurrency: int = 1
+    ) -> dict:
         """Process a chunk of repositories (up to chunk_size) that need refreshing."""
 
         # Get repositories that need refreshing
@@ -889,70 +1133,31 @@ class DataProcessor:
         logger.info(f"Processing {len(urls_to_process)} repositories in chunk")
 
         # Process the chunk using existing batch method
-        results = self.process_batch(urls_to_process)
+        results = self.process_batch(urls_to_process, concurrency=concurrency)
 
         logger.info(
-            f"Chunk completed: {results['success']} success, {results['error']} errors"
+            f"Chunk completed: {results['success']} success, {results['error']} errors, "
+            f"{results.get('unchanged', 0)} unchanged"
         )
 
         return {
             "success": results["success"],
             "error": results["error"],
+            "unchanged": results.get("unchanged", 0),
             "processed": len(urls_to_process),
             "total_available": len(all_urls),
         }
 
     def get_refresh_status(self) -> dict:
         """Get status of repositories by freshness."""
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
-            total_repos = db.query(Repository).count()
-
-            # Count by staleness
-            now = datetime.utcnow()
-            one_day_ago = now - timedelta(days=1)
-            one_week_ago = now - timedelta(days=7)
-
-            fresh_repos = (
-                db.query(Repository)
-                .filter(Repository.last_fetched > one_day_ago)
-                .count()
-            )
-
-            recent_repos = (
-                db.query(Repository)
-                .filter(
-                    Repository.last_fetched <= one_day_ago,
-                    Repository.last_fetched > one_week_ago,
-                )
-                .count()
-            )
-
-            stale_repos = (
-                db.query(Repository)
-                .filter(Repository.last_fetched <= one_week_ago)
-                .count()
-            )
-
-            never_fetched = (
-                db.query(Repository).filter(Repository.last_fetched.is_(None)).count()
-            )
-
-            completed_repos = (
-                db.query(Repository)
-                .filter(Repository.processing_status == "completed")
-                .count()
-            )
-
+            stats = get_stats(db)
             return {
-                "total_repositories": total_repos,
-                "completed_repositories": completed_repos,
-                "freshness": {
-                    "fresh_1_day": fresh_repos,
-                    "recent_1_week": recent_repos,
-                    "stale_older": stale_repos,
-                    "never_fetched": never_fetched,
-                },
+                "total_repositories": stats["total_repositories"],
+                "completed_repositories": stats["completed_repositories"],
+                "freshness": stats["freshness"],
+                "due_stages": self.planner.due_counts(db),
             }
 
         finally:
@@ -963,4 +1168,12 @@ class DataProcessor:
         if self.processed_count > 0:
             stats = self.get_processing_stats()
             logger.info(f"Final processing stats: {stats}")
+        if self.fetcher.http_cache:
+            self.fetcher.http_cache.close()
+        self.fetcher.issue_counts.close()
+        self.fetcher.manifests.close()
+        if self.fetcher.spi_cache:
+            self.fetcher.spi_cache.close()
+        self.fetcher.parser.close()
+        self.writer.close()
         self.db.close()
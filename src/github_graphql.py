@@ -0,0 +1,231 @@
+"""
+GitHub GraphQL client for batched repository metadata fetches.
+"""
+
+import logging
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from src.config import config
+from src.host_scheduler import GITHUB_HOST, HostScheduler
+from src.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def parse_github_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GitHub API timestamp into the naive UTC datetime PyGithub returns."""
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+
+
+# Fields fetched for every repository alias in a batched query. Issue and pull
+# request counts are both requested because the REST API counts pull requests
+# as issues, and the metadata dicts keep the REST semantics. Only the blob SHA
+# of Package.swift is requested here; its text is fetched separately for
+# manifests that are not already in the manifest store.
+REPOSITORY_FIELDS = """
+    description
+    stargazerCount
+    forkCount
+    createdAt
+    updatedAt
+    pushedAt
+    primaryLanguage { name }
+    licenseInfo { name }
+    defaultBranchRef { name }
+    openIssues: issues(states: OPEN) { totalCount }
+    allIssues: issues { totalCount }
+    openPullRequests: pullRequests(states: OPEN) { totalCount }
+    allPullRequests: pullRequests { totalCount }
+    packageSwift: object(expression: "HEAD:Package.swift") {
+        ... on Blob { oid }
+    }
+"""
+
+# Cheap fields used to detect whether a repository changed since its last fetch
+PROBE_FIELDS = """
+    stargazerCount
+    pushedAt
+"""
+
+MANIFEST_FIELDS = """
+    packageSwift: object(expression: "HEAD:Package.swift") {
+        ... on Blob { oid text isTruncated }
+    }
+"""
+
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL request fails as a whole."""
+
+    pass
+
+
+class GitHubGraphQLClient:
+    """Minimal GitHub GraphQL client that batches repositories into one query.
+
+    Callers acquire the graphql budget before executing; the client feeds the
+    response headers back into the shared rate limiter when one is given, and
+    requests wait for a GitHub slot when a host scheduler is given.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        scheduler: Optional[HostScheduler] = None,
+    ):
+        self.token = token
+        self.session = session or requests.Session()
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
+        self.url = f"{config.github_api_base_url}/graphql"
+
+    def execute(self, query: str, variables: Dict) -> Dict:
+        """Execute a GraphQL query and return the response body."""
+        slot = self.scheduler.slot(GITHUB_HOST) if self.scheduler else nullcontext()
+        with slot:
+            response = self.session.post(
+                self.url,
+                json={"query": query, "variables": variables},
+                headers={"Authorization": f"bearer {self.token}"},
+                timeout=30,
+            )
+        if self.rate_limiter:
+            self.rate_limiter.update_from_headers(response.headers, "graphql")
+
+        if response.status_code != 200:
+            raise GraphQLError(
+                f"GraphQL request failed with HTTP {response.status_code}: {response.text[:200]}"
+            )
+
+        body = response.json()
+        if body.get("data") is None:
+            raise GraphQLError(
+                f"GraphQL request returned no data: {body.get('errors')}"
+            )
+        return body
+
+    def fetch_repositories(
+        self, repositories: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Optional[Dict]]:
+        """Fetch metadata for several repositories with one aliased query.
+
+        Returns a mapping of (owner, name) to a metadata dict in the same shape
+        as the REST fetch path, or None when the repository does not exist.
+        Package.swift is identified by its blob SHA only; use fetch_manifests
+        to download the text of manifests that are not cached yet.
+        """
+        data = self._execute_batch(repositories, REPOSITORY_FIELDS)
+        return {
+            (owner, name): (self._node_to_metadata(owner, name, node) if node else None)
+            for (owner, name), node in data.items()
+        }
+
+    def fetch_manifests(
+        self, repositories: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Tuple[str, str]]:
+        """Fetch Package.swift text for several repositories.
+
+        Returns a mapping of (owner, name) to (blob SHA, text). Manifests that
+        are missing or too large for GraphQL are left out, so callers fall back
+        to the REST path for them.
+        """
+        data = self._execute_batch(repositories, MANIFEST_FIELDS)
+        results = {}
+        for (owner, name), node in data.items():
+            blob = (node or {}).get("packageSwift") or {}
+            if blob.get("isTruncated"):
+                logger.debug(f"Package.swift for {owner}/{name} truncated by GraphQL")
+                continue
+            if blob.get("text") is not None:
+                results[(owner, name)] = (blob["oid"], blob["text"])
+        return results
+
+    def fetch_probes(
+        self, repositories: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Optional[Dict]]:
+        """Fetch star count and last push time for several repositories.
+
+        Returns a mapping of (owner, name) to {"stars", "pushed_at"}, or None
+        when the repository does not exist.
+        """
+        data = self._execute_batch(repositories, PROBE_FIELDS)
+        return {
+            key: (
+                {
+                    "stars": node.get("stargazerCount") or 0,
+                    "pushed_at": parse_github_datetime(node.get("pushedAt")),
+                }
+                if node
+                else None
+            )
+            for key, node in data.items()
+        }
+
+    def _execute_batch(
+        self, repositories: List[Tuple[str, str]], fields: str
+    ) -> Dict[Tuple[str, str], Optional[Dict]]:
+        """Query the same fields for several repositories using aliases."""
+        if not repositories:
+            return {}
+
+        variable_defs = []
+        selections = []
+        variables = {}
+        for index, (owner, name) in enumerate(repositories):
+            variable_defs.append(f"$owner{index}: String!, $name{index}: String!")
+            selections.append(
+                f"repo{index}: repository(owner: $owner{index}, name: $name{index}) "
+                f"{{{fields}}}"
+            )
+            variables[f"owner{index}"] = owner
+            variables[f"name{index}"] = name
+
+        query = f"query({', '.join(variable_defs)}) {{\n{chr(10).join(selections)}\n}}"
+        body = self.execute(query, variables)
+
+        # Per-repository errors (e.g. NOT_FOUND) come back alongside partial data
+        for error in body.get("errors", []):
+            logger.debug(f"GraphQL error: {error.get('type')} - {error.get('message')}")
+
+        data = body["data"]
+        return {
+            repository: data.get(f"repo{index}")
+            for index, repository in enumerate(repositories)
+        }
+
+    def _node_to_metadata(self, owner: str, name: str, node: Dict) -> Dict:
+        """Convert a GraphQL repository node into a REST-shaped metadata dict."""
+        open_issues = node["openIssues"]["totalCount"]
+        open_pull_requests = node["openPullRequests"]["totalCount"]
+
+        metadata = {
+            "owner": owner,
+            "name": name,
+            "description": node.get("description"),
+            "stars": node.get("stargazerCount") or 0,
+            "forks": node.get("forkCount") or 0,
+            # REST's watchers_count mirrors the star count, so keep that meaning
+            "watchers": node.get("stargazerCount") or 0,
+            "open_issues_count": open_issues + open_pull_requests,
+            "issues_count": node["allIssues"]["totalCount"]
+            + node["allPullRequests"]["totalCount"],
+            "created_at": parse_github_datetime(node.get("createdAt")),
+            "updated_at": parse_github_datetime(node.get("updatedAt")),
+            "pushed_at": parse_github_datetime(node.get("pushedAt")),
+            "language": (node.get("primaryLanguage") or {}).get("name"),
+            "default_branch": (node.get("defaultBranchRef") or {}).get("name")
+            or "main",
+            "license_name": (node.get("licenseInfo") or {}).get("name"),
+            "package_swift_sha": (node.get("packageSwift") or {}).get("oid"),
+            "package_swift_content": None,
+        }
+
+        return metadata
@@ -0,0 +1,93 @@
+"""
+Per-host politeness scheduling for outbound HTTP requests.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict
+from urllib.parse import urlparse
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+GITHUB_HOST = urlparse(config.github_api_base_url).netloc
+SPI_HOST = "swiftpackageindex.com"
+
+
+@dataclass
+class HostPolicy:
+    """Politeness budget for one host."""
+
+    min_interval: float = 0.0  # Seconds between the starts of two requests
+    max_in_flight: int = 1  # Requests allowed to be outstanding at once
+
+
+class HostScheduler:
+    """Spaces out and caps concurrent requests separately for each host.
+
+    Each host has its own spacing and in-flight limit, so waiting on one host
+    never delays requests to another. Hosts without a policy are unrestricted.
+    """
+
+    def __init__(self, policies: Dict[str, HostPolicy]):
+        self.policies = policies
+        self._slots = {
+            host: threading.BoundedSemaphore(max(1, policy.max_in_flight))
+            for host, policy in policies.items()
+        }
+        self._next_start = {host: 0.0 for host in policies}
+        self._requests = {host: 0 for host in policies}
+        self._waited = {host: 0.0 for host in policies}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "HostScheduler":
+        """Build a scheduler for GitHub and Swift Package Index from config."""
+        return cls(
+            {
+                GITHUB_HOST: HostPolicy(
+                    config.github_request_interval, config.github_max_in_flight
+                ),
+                SPI_HOST: HostPolicy(
+                    config.spi_request_interval, config.spi_max_in_flight
+                ),
+            }
+        )
+
+    @contextmanager
+    def slot(self, host: str):
+        """Hold a request slot for a host, waiting for spacing and capacity."""
+        policy = self.policies.get(host)
+        if policy is None:
+            yield
+            return
+
+        started = time.monotonic()
+        with self._slots[host]:
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_start[host])
+                self._next_start[host] = start_at + policy.min_interval
+                self._requests[host] += 1
+
+            if start_at > now:
+                time.sleep(start_at - now)
+
+            with self._lock:
+                self._waited[host] += time.monotonic() - started
+            yield
+
+    def stats(self) -> Dict[str, Dict]:
+        """Get request counts and total politeness wait per host."""
+        with self._lock:
+            return {
+                host: {
+                    "requests": self._requests[host],
+                    "wait_seconds": round(self._waited[host], 1),
+                }
+                for host in self.policies
+            }
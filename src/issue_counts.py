@@ -0,0 +1,126 @@
+"""
+Cached total issue counts for repositories.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from src.cache import DiskCache
+from src.config import config
+from src.host_scheduler import GITHUB_HOST
+
+logger = logging.getLogger(__name__)
+
+ISSUE_COUNT_QUERY = """
+query($owner: String!, $name: String!) {
+    repository(owner: $owner, name: $name) {
+        issues { totalCount }
+        pullRequests { totalCount }
+    }
+}
+"""
+
+
+class IssueCountProvider:
+    """Supplies total issue counts from the cheapest available source.
+
+    Counts barely move day to day, so they are cached with a long TTL and only
+    refetched when the repository's pushed_at/updated_at changed. Fresh counts
+    come from a GraphQL totalCount query when a token is available (which uses
+    the separate graphql budget), otherwise from the search API. Both include
+    pull requests, matching the REST get_issues(state="all") semantics.
+    """
+
+    def __init__(self, fetcher):
+        self.fetcher = fetcher
+        self.cache = DiskCache(
+            config.issue_count_cache_path,
+            "issue_counts",
+            max_entries=config.issue_count_cache_max_entries,
+            ttl_seconds=config.issue_count_ttl_hours * 3600,
+        )
+
+    def get_count(
+        self,
+        owner: str,
+        name: str,
+        updated_at: Optional[datetime],
+        pushed_at: Optional[datetime],
+        fallback: Optional[int] = None,
+    ) -> Optional[int]:
+        """Get the total issue count, refetching only if the repository changed."""
+        key = f"{owner}/{name}".lower()
+        entry = self.cache.get(key)
+        stamps = (_stamp(updated_at), _stamp(pushed_at))
+        if entry and (entry["updated_at"], entry["pushed_at"]) == stamps:
+            self.cache.record_hit()
+            return entry["count"]
+
+        self.cache.record_miss()
+        try:
+            count = self._fetch_count(owner, name)
+        except Exception as e:
+            logger.debug(f"Could not fetch issue count for {owner}/{name}: {e}")
+            count = None
+
+        if count is None:
+            return fallback
+
+        self.prime(owner, name, count, updated_at, pushed_at)
+        return count
+
+    def prime(
+        self,
+        owner: str,
+        name: str,
+        count: int,
+        updated_at: Optional[datetime],
+        pushed_at: Optional[datetime],
+    ):
+        """Store a count obtained elsewhere, e.g. from a batched GraphQL fetch."""
+        self.cache.set(
+            f"{owner}/{name}".lower(),
+            {
+                "count": count,
+                "updated_at": _stamp(updated_at),
+                "pushed_at": _stamp(pushed_at),
+            },
+        )
+
+    def _fetch_count(self, owner: str, name: str) -> Optional[int]:
+        """Fetch a fresh count from GraphQL, or from search without a token."""
+        pooled = self.fetcher.current_token
+        if pooled.token:
+            self.fetcher._wait_for_rate_limit("graphql")
+            client = self.fetcher.graphql_client(pooled)
+            body = client.execute(ISSUE_COUNT_QUERY, {"owner": owner, "name": name})
+            repository = body["data"].get("repository")
+            if not repository:
+                return None
+            return (
+                repository["issues"]["totalCount"]
+                + repository["pullRequests"]["totalCount"]
+            )
+
+        self.fetcher._wait_for_rate_limit("search")
+        with self.fetcher.scheduler.slot(GITHUB_HOST):
+            response = self.fetcher.session.get(
+                f"{config.github_api_base_url}/search/issues",
+                params={"q": f"repo:{owner}/{name}", "per_page": 1},
+                headers={"Accept": "application/vnd.github+json"},
+                timeout=15,
+            )
+        pooled.rate_limiter.update_from_headers(response.headers, "search")
+        if response.status_code != 200:
+            return None
+        return response.json().get("total_count")
+
+    def close(self):
+        """Close the underlying cache."""
+        self.cache.close()
+
+
+def _stamp(value: Optional[datetime]) -> Optional[str]:
+    """Normalize a timestamp for comparison with cached values."""
+    return value.isoformat() if value else None
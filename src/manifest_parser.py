@@ -0,0 +1,309 @@
+"""
+Package.swift manifest parsing.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+from src.repository_keys import url_key
+
+
+def extract_swift_tools_version(package_content: str) -> Optional[str]:
+    """Extract Swift tools version from Package.swift content."""
+    for line in package_content.split("\n"):
+        if "swift-tools-version" in line:
+            # Extract version from comment like "// swift-tools-version:5.7"
+            parts = line.split(":")
+            if len(parts) > 1:
+                return parts[1].strip()
+    return None
+
+
+class Token(NamedTuple):
+    kind: str  # ident, string, number, op
+    value: str  # Identifier/operator text, or a string's contents
+    start: int
+    end: int
+
+
+# One scanner for everything but the bodies of strings and block comments,
+# which need their own handling (interpolation, nesting)
+_SCANNER = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<line_comment>//[^\n]*)
+    | (?P<block_comment>/\*)
+    | (?P<raw_string>\#+")
+    | (?P<multiline_string>""\")
+    | (?P<string>")
+    | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<number>\d[\w.]*)
+    | (?P<op>\.\.<|\.\.\.|.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# Runs of string characters that need no special handling
+_STRING_CHARS = re.compile(r'[^"\\\n]+')
+_COMMENT_DELIMITERS = re.compile(r"/\*|\*/")
+
+
+def _scan_block_comment(text: str, pos: int) -> int:
+    """Return the end of a (possibly nested) block comment opened at pos."""
+    depth = 0
+    for match in _COMMENT_DELIMITERS.finditer(text, pos):
+        depth += 1 if match.group() == "/*" else -1
+        if depth == 0:
+            return match.end()
+    return len(text)
+
+
+def _scan_interpolation(text: str, pos: int) -> int:
+    """Return the end of a \\( ... ) interpolation whose body starts at pos."""
+    depth = 1
+    while pos < len(text):
+        match = _SCANNER.match(text, pos)
+        kind, pos = match.lastgroup, match.end()
+        if kind == "string":
+            _, pos = _scan_string(text, pos)
+        elif kind == "block_comment":
+            pos = _scan_block_comment(text, match.start())
+        elif kind == "op" and match.group() == "(":
+            depth += 1
+        elif kind == "op" and match.group() == ")":
+            depth -= 1
+            if depth == 0:
+                return pos
+    return pos
+
+
+def _scan_string(text: str, pos: int):
+    """Scan a string body starting after its opening quote.
+
+    Returns (contents, end). Escapes are kept as written and
+    interpolations are kept as their source text.
+    """
+    start = pos
+    while pos < len(text):
+        run = _STRING_CHARS.match(text, pos)
+        if run:
+            pos = run.end()
+            continue
+        char = text[pos]
+        if char == '"':
+            return text[start:pos], pos + 1
+        if char == "\n":  # Unterminated
+            return text[start:pos], pos
+        # Backslash: an interpolation or an escaped character
+        if text.startswith("\\(", pos):
+            pos = _scan_interpolation(text, pos + 2)
+        else:
+            pos += 2
+    return text[start:pos], pos
+
+
+def tokenize(text: str) -> List[Token]:
+    """Split Swift source into tokens, dropping whitespace and comments."""
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _SCANNER.match(text, pos)
+        kind, start, pos = match.lastgroup, match.start(), match.end()
+        if kind in ("space", "line_comment"):
+            continue
+        if kind == "block_comment":
+            pos = _scan_block_comment(text, start)
+        elif kind == "string":
+            value, pos = _scan_string(text, pos)
+            tokens.append(Token("string", value, start, pos))
+        elif kind == "multiline_string":
+            end = text.find('"""', pos)
+            end = len(text) if end < 0 else end
+            tokens.append(Token("string", text[pos:end].strip("\n"), start, end + 3))
+            pos = end + 3
+        elif kind == "raw_string":
+            closing = '"' + match.group()[:-1]
+            end = text.find(closing, pos)
+            end = len(text) if end < 0 else end
+            tokens.append(Token("string", text[pos:end], start, end + len(closing)))
+            pos = end + len(closing)
+        else:
+            tokens.append(Token(kind, match.group(), start, pos))
+    return tokens
+
+
+def _split_arguments(tokens: List[Token], start: int):
+    """Split the call arguments after the '(' at tokens[start].
+
+    Returns ([(label, argument tokens)], index after the closing ')').
+    """
+    arguments, current, depth = [], [], 0
+    i = start + 1
+    while i < len(tokens):
+        token = tokens[i]
+        if token.kind == "op" and token.value in "([":
+            depth += 1
+        elif token.kind == "op" and token.value in ")]":
+            if depth == 0:
+                break
+            depth -= 1
+        elif token.kind == "op" and token.value == "," and depth == 0:
+            arguments.append(current)
+            current = []
+            i += 1
+            continue
+        current.append(token)
+        i += 1
+    if current:
+        arguments.append(current)
+
+    labeled = []
+    for argument in arguments:
+        if (
+            len(argument) > 2
+            and argument[0].kind == "ident"
+            and argument[1].value == ":"
+        ):
+            labeled.append((argument[0].value, argument[2:]))
+        else:
+            labeled.append((None, argument))
+    return labeled, i + 1
+
+
+def _argument_value(text: str, argument: List[Token]) -> str:
+    """A single string literal's contents, or else the argument's source."""
+    if len(argument) == 1 and argument[0].kind in ("string", "number"):
+        return argument[0].value
+    return text[argument[0].start : argument[-1].end].strip()
+
+
+# Labels naming the package, and labels that carry its requirement
+_SOURCE_LABELS = ("url", "path", "id", "name")
+_REQUIREMENT_LABELS = ("from", "exact", "branch", "revision", "majorVersion")
+
+
+def _requirement(text: str, label: Optional[str], argument: List[Token]):
+    """Describe a requirement argument as 'kind: value', or None."""
+    if label in _REQUIREMENT_LABELS:
+        return f"{label}: {_argument_value(text, argument)}"
+    if label is not None:
+        return None
+
+    # .upToNextMajor(from: "1.0.0"), .exact("1.2.3"), .branch("main"), ...
+    if (
+        len(argument) >= 3
+        and argument[0].value == "."
+        and argument[1].kind == "ident"
+        and argument[2].value == "("
+    ):
+        inner, _ = _split_arguments(argument, 2)
+        values = [_argument_value(text, tokens) for _, tokens in inner if tokens]
+        return f"{argument[1].value}: {', '.join(values)}"
+
+    # "1.0.0"..<"2.0.0" and "1.0.0"..."2.0.0"
+    if any(token.value in ("..<", "...") for token in argument):
+        range_text = "".join(token.value for token in argument)
+        return f"range: {range_text}"
+
+    if len(argument) == 1 and argument[0].kind == "string":
+        return f"exact: {argument[0].value}"
+    return None
+
+
+def _parse_dependencies(package_content: str) -> List[Dict]:
+    """Find every .package(...) call and describe its source and requirement."""
+    tokens = tokenize(package_content)
+    dependencies = []
+    seen = set()
+
+    i = 0
+    while i < len(tokens) - 2:
+        if not (
+            tokens[i].kind == "op"
+            and tokens[i].value == "."
+            and tokens[i + 1].value in ("package", "Package")
+            and tokens[i + 2].value == "("
+        ):
+            i += 1
+            continue
+
+        arguments, i = _split_arguments(tokens, i + 2)
+        dep_info = {}
+        requirements = []
+        for label, argument in arguments:
+            if not argument:
+                continue
+            if label in _SOURCE_LABELS:
+                dep_info[label] = _argument_value(package_content, argument)
+            elif label == "minor" and requirements:
+                # .Package(url:, majorVersion: 1, minor: 2) from Swift 3 manifests
+                requirements[
+                    -1
+                ] += f", minor: {_argument_value(package_content, argument)}"
+            else:
+                requirement = _requirement(package_content, label, argument)
+                if requirement:
+                    requirements.append(requirement)
+
+        # Only calls naming a package are dependencies (not .package in targets)
+        if not any(key in dep_info for key in ("url", "path", "id")):
+            continue
+        if requirements:
+            dep_info["version_requirement"] = "; ".join(requirements)
+        # An interpolated URL is only known at build time, so it has no key
+        url = dep_info.get("url")
+        repo_key = url_key(url) if url and "\\(" not in url else None
+        if repo_key:
+            dep_info["key"] = repo_key
+
+        # #if branches often repeat a dependency verbatim
+        key = tuple(sorted(dep_info.items()))
+        if key not in seen:
+            seen.add(key)
+            dependencies.append(dep_info)
+
+    return dependencies
+
+
+class _ManifestMemo:
+    """Thread-safe LRU of parsed dependencies keyed by manifest hash."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+            return entry
+
+    def put(self, digest: bytes, dependencies: List[Dict]):
+        with self._lock:
+            self._entries[digest] = dependencies
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_memo = _ManifestMemo()
+
+
+def extract_dependencies(package_content: str) -> List[Dict]:
+    """Extract dependencies from Package.swift content.
+
+    Each dependency has its url, path or registry id (and name: when given),
+    plus version_requirement as "kind: value" for from/exact/branch/revision,
+    upToNextMajor/upToNextMinor and ranges. GitHub dependencies also carry
+    their canonical owner/name key. Identical manifests are parsed once per
+    process.
+    """
+    digest = hashlib.sha1(package_content.encode("utf-8")).digest()
+    dependencies = _memo.get(digest)
+    if dependencies is None:
+        dependencies = _parse_dependencies(package_content)
+        _memo.put(digest, dependencies)
+    return [dict(dependency) for dependency in dependencies]
@@ -2,6 +2,7 @@
 Database models for Swift Package support data.
 """
 
+import logging
 import re
 from datetime import datetime
 from enum import Enum
@@ -15,12 +16,23 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    bindparam,
+    case,
     create_engine,
+    event,
+    func,
+    inspect,
+    select,
+    text,
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from src.config import config
+from src.repository_keys import repository_key
+
+logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
@@ -68,6 +80,12 @@ class ValidationError(Exception):
     pass
 
 
+def _default_repo_key(context):
+    """Derive repo_key from the owner and name being inserted."""
+    parameters = context.get_current_parameters()
+    return repository_key(parameters.get("owner"), parameters.get("name"))
+
+
 class Repository(Base):
     """Model for storing repository information."""
 
@@ -77,6 +95,7 @@ class Repository(Base):
     url = Column(String(500), unique=True, nullable=False)
     owner = Column(String(100), nullable=False)
     name = Column(String(100), nullable=False)
+    repo_key = Column(String(201), default=_default_repo_key)  # Lowercase owner/name
 
     # Repository metadata
     description = Column(Text)
@@ -99,11 +118,16 @@ class Repository(Base):
     # Swift Package specific
     has_package_swift = Column(Boolean, default=False)
     package_swift_content = Column(Text)
+    package_swift_sha = Column(String(40))  # Git blob SHA of Package.swift
     swift_tools_version = Column(String(20))
 
     # Dependency information
     dependencies_count = Column(Integer, default=0)
     dependencies_json = Column(Text)  # JSON string of dependencies
+    transitive_dependents = Column(Integer, default=0)  # Dataset packages relying on it
+
+    # Migration priority (0-100, see src/priority.py)
+    priority_score = Column(Float)
 
     # Support status
     linux_compatible = Column(
@@ -120,6 +144,10 @@ class Repository(Base):
 
     # Processing metadata
     last_fetched = Column(DateTime)
+    last_fetched_metadata = Column(DateTime)
+    last_fetched_issues = Column(DateTime)
+    last_fetched_manifest = Column(DateTime)
+    last_fetched_spi = Column(DateTime)
     fetch_error = Column(Text)
     processing_status = Column(
         String(20), default="pending"
@@ -159,6 +187,12 @@ class Repository(Base):
         old_state = self.current_state
         self.current_state = new_state
 
+        # Only the state factor of this repository's score changes
+        if self.processing_status == "completed":
+            from src.priority import score_repository
+
+            self.priority_score = score_repository(self)
+
         # Log the transition
         if session:
             transition = StateTransition(
@@ -171,6 +205,7 @@ class Repository(Base):
                 issue_number=issue_number,
             )
             session.add(transition)
+            record_transition(session, new_state, issue_number)
 
         return old_state, new_state
 
@@ -208,19 +243,282 @@ class StateTransition(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class TransitionSummary(Base):
+    """Running totals of state transitions per target state.
+
+    Kept up to date by Repository.transition_state in the same session as
+    the transition, so reading the transaction breakdown does not scan
+    state_transitions. Rows are in the order each state was first reached.
+    """
+
+    __tablename__ = "transition_summary"
+
+    id = Column(Integer, primary_key=True)
+    to_state = Column(String(20), nullable=False, unique=True)
+    total = Column(Integer, nullable=False, default=0)
+    github_issue = Column(Integer, nullable=False, default=0)  # From GitHub issues
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CrawlFrontier(Base):
+    """Packages found as dependencies of stored packages, queued for collection.
+
+    One row per repo_key, so a package reached through several dependents is
+    queued once, at the smallest depth it was found. Rows persist between
+    crawler runs.
+    """
+
+    __tablename__ = "crawl_frontier"
+
+    id = Column(Integer, primary_key=True)
+    repo_key = Column(String(201), nullable=False, unique=True)
+    url = Column(String(500), nullable=False)
+    depth = Column(Integer, nullable=False)  # Dependency hops from a tracked package
+    discovered_from = Column(String(201))  # repo_key of the dependent that queued it
+    status = Column(String(20), default="pending")  # pending, fetched, error, skipped
+    attempts = Column(Integer, default=0)  # Failed fetches so far
+    discovered_at = Column(DateTime, default=datetime.utcnow)
+    fetched_at = Column(DateTime)  # Last fetch attempt
+
+
+def record_transition(session, to_state, issue_number=None):
+    """Count one transition in the summary, within the caller's transaction."""
+    from_issue = 1 if issue_number else 0
+    stmt = sqlite_insert(TransitionSummary).values(
+        to_state=to_state,
+        total=1,
+        github_issue=from_issue,
+        updated_at=datetime.utcnow(),
+    )
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[TransitionSummary.to_state],
+            set_={
+                "total": TransitionSummary.total + 1,
+                "github_issue": TransitionSummary.github_issue + from_issue,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+def rebuild_transition_summary(session) -> int:
+    """Recompute the transition summary from state_transitions.
+
+    Returns the number of transitions counted. The caller commits.
+    """
+    from_issue = (StateTransition.issue_number.isnot(None)) & (
+        StateTransition.issue_number != ""
+    )
+    rows = (
+        session.query(
+            StateTransition.to_state,
+            func.count(),
+            func.sum(case((from_issue, 1), else_=0)),
+        )
+        .group_by(StateTransition.to_state)
+        .order_by(func.min(StateTransition.id))
+        .all()
+    )
+
+    now = datetime.utcnow()
+    session.query(TransitionSummary).delete()
+    session.add_all(
+        TransitionSummary(
+            to_state=to_state, total=total, github_issue=github_issue, updated_at=now
+        )
+        for to_state, total, github_issue in rows
+    )
+    return sum(total for _, total, _ in rows)
+
+
 # Database indexes for performance
 Index("idx_repo_owner_name", Repository.owner, Repository.name)
+Index("idx_repo_key", Repository.repo_key, unique=True)
 Index("idx_repo_state", Repository.current_state)
 Index("idx_repo_stars", Repository.stars)
 Index("idx_repo_last_fetched", Repository.last_fetched)
+Index("idx_repo_priority", Repository.priority_score)
 Index("idx_transition_repo_id", StateTransition.repository_id)
 Index("idx_transition_date", StateTransition.created_at)
+Index("idx_log_created_at", ProcessingLog.created_at)
+Index("idx_frontier_status_depth", CrawlFrontier.status, CrawlFrontier.depth)
+
+# SQLite connection profiles, selected with DATABASE_PROFILE. "default" lets
+# status checks and exports read while a collection is writing; "ci" also
+# skips fsyncs on throwaway runners; "compat" keeps the rollback journal for
+# filesystems without shared-memory support.
+SQLITE_PROFILES = {
+    "default": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # KiB
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,  # ms
+    },
+    "ci": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    "compat": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 30000,
+    },
+}
+
+
+def _create_engine(read_only: bool = False):
+    """Create an engine that applies the configured profile to each connection."""
+    db_engine = create_engine(config.database_url, echo=False)
+    if db_engine.dialect.name != "sqlite":
+        return db_engine
+
+    if config.database_profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Invalid DATABASE_PROFILE: {config.database_profile} "
+            f"(use one of {', '.join(SQLITE_PROFILES)})"
+        )
+    pragmas = dict(SQLITE_PROFILES[config.database_profile])
+    if read_only:
+        # The journal mode is persistent and owned by writers
+        pragmas.pop("journal_mode", None)
+        pragmas["query_only"] = "ON"
+
+    @event.listens_for(db_engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return db_engine
+
 
 # Database setup
-engine = create_engine(config.database_url, echo=False)
+engine = _create_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only sessions for status, analysis and exports
+read_engine = _create_engine(read_only=True)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+
+
+def backfill_repository_keys(connection) -> int:
+    """Set repo_key on stored repositories that have none.
+
+    When several rows spell the same repository, the completed row with the
+    lowest id gets the key and the others keep NULL (the key is unique).
+    Returns the number of such duplicate rows.
+    """
+    table = Repository.__table__
+    rows = connection.execute(
+        select(table.c.id, table.c.owner, table.c.name)
+        .where(table.c.repo_key.is_(None))
+        .order_by((table.c.processing_status != "completed"), table.c.id)
+    ).all()
+    taken = set(
+        connection.execute(
+            select(table.c.repo_key).where(table.c.repo_key.isnot(None))
+        ).scalars()
+    )
+
+    updates, duplicates = [], 0
+    for row_id, owner, name in rows:
+        key = repository_key(owner, name)
+        if key is None or key in taken:
+            duplicates += 1
+            continue
+        taken.add(key)
+        updates.append({"b_id": row_id, "b_key": key})
+
+    if updates:
+        connection.execute(
+            table.update()
+            .where(table.c.id == bindparam("b_id"))
+            .values(repo_key=bindparam("b_key")),
+            updates,
+        )
+    if duplicates:
+        logger.warning(
+            f"{duplicates} repositories duplicate another row's owner/name "
+            f"and were left without a repo_key"
+        )
+    return duplicates
+
+
+def upgrade_schema():
+    """Add tables, columns and indexes introduced after a database was created.
+
+    The nightly workflow reuses the committed database, so new nullable
+    columns are added in place rather than requiring a rebuild.
+    """
+    inspector = inspect(engine)
+    existing_tables = inspector.get_table_names()
+
+    # Tables added since; a new summary starts from the existing ledger
+    missing = [
+        table
+        for table in Base.metadata.sorted_tables
+        if table.name not in existing_tables
+    ]
+    if existing_tables and missing:
+        Base.metadata.create_all(bind=engine, tables=missing)
+        if TransitionSummary.__table__ in missing:
+            with Session(engine) as session:
+                rebuild_transition_summary(session)
+                session.commit()
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {
+                column["name"] for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    )
+                )
+                if column is Repository.__table__.c.repo_key:
+                    backfill_repository_keys(connection)
+                if column is CrawlFrontier.__table__.c.attempts:
+                    # Failures used to be final; give them the remaining attempts
+                    connection.execute(
+                        table.update()
+                        .where(table.c.status == "error")
+                        .values(status="pending", attempts=1)
+                    )
+
+            # Indexes are only created with their table by create_all
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+
+def checkpoint_database():
+    """Fold the write-ahead log back into the database file.
+
+    Run before the database file is copied or committed, so it is complete
+    on its own without the -wal file.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
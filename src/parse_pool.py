@@ -0,0 +1,75 @@
+"""
+Parse stage for CPU-bound Swift Package Index page and manifest parsing.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from src.manifest_parser import extract_dependencies, extract_swift_tools_version
+from src.spi_extractor import extract_android_support
+
+logger = logging.getLogger(__name__)
+
+
+def parse_manifest(content: str) -> Tuple[Optional[str], List[Dict]]:
+    """Parse Package.swift text into (swift_tools_version, dependencies)."""
+    return extract_swift_tools_version(content), extract_dependencies(content)
+
+
+def parse_spi_page(content: bytes) -> Optional[bool]:
+    """Parse a downloaded SPI page into its Android verdict."""
+    return extract_android_support(content)
+
+
+class ParsePool:
+    """Runs parse functions inline or on a pool of worker processes.
+
+    With workers > 0 the raw page bytes or manifest text are sent to a
+    ProcessPoolExecutor and only the compact result (a verdict, or the tools
+    version and dependency list) comes back, so parsing runs outside the GIL
+    of the fetch threads. Each call waits for its own result, so callers see
+    results in request order, and exceptions raised while parsing are
+    re-raised in the caller just as they would be inline.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = max(0, workers)
+        self._executor = None
+        if self.workers:
+            # Spawned workers do not inherit locks held by fetch threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Parsing with {self.workers} worker processes")
+
+    def parse_manifest(self, content: str) -> Tuple[Optional[str], List[Dict]]:
+        """Parse Package.swift text into (swift_tools_version, dependencies)."""
+        return self._run(parse_manifest, content)
+
+    def parse_spi_page(self, content: bytes) -> Optional[bool]:
+        """Parse a downloaded SPI page into its Android verdict."""
+        return self._run(parse_spi_page, content)
+
+    def _run(self, func, payload):
+        """Run a parse function on the pool, or inline without one."""
+        executor = self._executor
+        if executor is None:
+            return func(payload)
+
+        try:
+            return executor.submit(func, payload).result()
+        except BrokenProcessPool:
+            logger.warning("Parse worker pool failed, parsing inline from now on")
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            return func(payload)
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
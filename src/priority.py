@@ -0,0 +1,190 @@
+"""
+Migration priority scoring for tracked repositories.
+"""
+
+import logging
+from datetime import datetime
+from typing import Iterable, Optional, Set
+
+import numpy as np
+from sqlalchemy import bindparam, update
+
+from src.config import config
+from src.dependency_graph import DependencyGraph
+from src.models import Repository
+
+logger = logging.getLogger(__name__)
+
+# How much of its score a repository keeps in each state; packages that
+# already support Android or need no work score 0
+STATE_FACTORS = {
+    "tracking": 1.0,
+    "dependency": 1.0,
+    "unknown": 0.8,
+    "in_progress": 0.6,
+    "blocked": 0.4,
+    "android_supported": 0.0,
+    "archived": 0.0,
+    "irrelevant": 0.0,
+}
+
+# Values at which a log-scaled component reaches its full weight. Fixed
+# scales keep a repository's score independent of every other row, so
+# single rows can be rescored on their own.
+STARS_SCALE = 10_000
+FORKS_SCALE = 1_000
+DEPENDENTS_SCALE = 100
+
+
+def _log_scaled(values: np.ndarray, scale: float) -> np.ndarray:
+    return np.minimum(np.log1p(np.maximum(values, 0)) / np.log1p(scale), 1.0)
+
+
+def priority_scores(
+    stars: np.ndarray,
+    forks: np.ndarray,
+    pushed_at: np.ndarray,
+    dependents: np.ndarray,
+    states: np.ndarray,
+    now: Optional[datetime] = None,
+) -> np.ndarray:
+    """Score repositories from 0 to 100 in one vectorized pass.
+
+    Each component is scaled to 0-1: stars, forks and transitive dependents
+    logarithmically, activity as exponential decay since the last push (0
+    when never pushed). The weighted mean of the components is multiplied
+    by the state factor.
+    """
+    now = np.datetime64(now or datetime.utcnow(), "s")
+    pushed = np.asarray(pushed_at, dtype="datetime64[s]")
+    age_days = (now - pushed).astype("timedelta64[s]").astype(float) / 86400
+    activity = np.where(
+        np.isnat(pushed),
+        0.0,
+        0.5 ** (np.maximum(age_days, 0) / config.priority_activity_half_life_days),
+    )
+
+    weights = np.array(
+        [
+            config.priority_weight_stars,
+            config.priority_weight_forks,
+            config.priority_weight_activity,
+            config.priority_weight_dependents,
+        ]
+    )
+    components = np.vstack(
+        [
+            _log_scaled(np.asarray(stars, dtype=float), STARS_SCALE),
+            _log_scaled(np.asarray(forks, dtype=float), FORKS_SCALE),
+            activity,
+            _log_scaled(np.asarray(dependents, dtype=float), DEPENDENTS_SCALE),
+        ]
+    )
+    factors = np.array([STATE_FACTORS.get(state, 1.0) for state in states])
+    return np.round(100 * factors * (weights @ components) / weights.sum(), 2)
+
+
+def score_repository(repo: Repository, now: Optional[datetime] = None) -> float:
+    """Score a single repository from its stored fields."""
+    return float(
+        priority_scores(
+            [repo.stars or 0],
+            [repo.forks or 0],
+            [repo.pushed_at],
+            [repo.transitive_dependents or 0],
+            [repo.current_state],
+            now,
+        )[0]
+    )
+
+
+class PriorityScorer:
+    """Computes and stores priority scores and transitive dependent counts.
+
+    rescore() with no ids scores every completed repository; with ids it
+    only touches those rows. A repository's transitive dependents change
+    when the dependencies of anything that depends on it change, so after
+    collecting a batch the affected rows are the batch itself and
+    everything it depends on, before and after the batch (affected_ids).
+    Both methods load the dependency graph unless one is passed in, so a
+    caller can build it once and share it.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def affected_ids(
+        self, urls: Iterable[str], graph: Optional[DependencyGraph] = None
+    ) -> Set[int]:
+        """Ids of repositories whose score may change when urls change."""
+        if graph is None:
+            graph = DependencyGraph.from_database(self.db)
+        wanted = set(urls)
+        nodes = [i for i, url in enumerate(graph.attributes["url"]) if url in wanted]
+        if not nodes:
+            return set()
+        reached = graph.transitive_dependencies(nodes)
+        return {int(graph.ids[i]) for i in np.union1d(nodes, reached)}
+
+    def rescore(
+        self,
+        ids: Optional[Set[int]] = None,
+        graph: Optional[DependencyGraph] = None,
+    ) -> int:
+        """Recompute scores for ids (all completed repositories if None).
+
+        graph must reflect the current dependencies. Returns the number of
+        repositories scored.
+        """
+        if graph is None:
+            graph = DependencyGraph.from_database(self.db)
+        if ids is None:
+            dependents = dict(
+                zip(graph.ids.tolist(), graph.transitive_dependent_counts())
+            )
+        else:
+            positions = {int(node_id): i for i, node_id in enumerate(graph.ids)}
+            dependents = {
+                node_id: len(graph.transitive_dependents(positions[node_id]))
+                for node_id in ids
+                if node_id in positions
+            }
+
+        query = self.db.query(
+            Repository.id,
+            Repository.stars,
+            Repository.forks,
+            Repository.pushed_at,
+            Repository.current_state,
+        ).filter(Repository.processing_status == "completed")
+        if ids is not None:
+            query = query.filter(Repository.id.in_(list(ids)))
+        rows = query.all()
+        if not rows:
+            return 0
+
+        repo_ids, stars, forks, pushed_at, states = zip(*rows)
+        counts = [dependents.get(node_id, 0) for node_id in repo_ids]
+        scores = priority_scores(
+            [s or 0 for s in stars],
+            [f or 0 for f in forks],
+            pushed_at,
+            counts,
+            states,
+        )
+
+        self.db.connection().execute(
+            update(Repository)
+            .where(Repository.id == bindparam("b_id"))
+            .values(
+                priority_score=bindparam("b_score"),
+                transitive_dependents=bindparam("b_dependents"),
+            ),
+            [
+                {"b_id": node_id, "b_score": float(score), "b_dependents": int(count)}
+                for node_id, score, count in zip(repo_ids, scores, counts)
+            ],
+        )
+        self.db.commit()
+        logger.info(f"Rescored {len(rows)} repositories")
+        return len(rows)
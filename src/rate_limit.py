@@ -0,0 +1,160 @@
+"""
+Header-driven rate limiting for GitHub API calls.
+"""
+
+import calendar
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitBucket:
+    """Remaining request budget for one GitHub API resource."""
+
+    limit: int
+    remaining: int
+    reset_at: Optional[float] = None  # Unix timestamp when the budget refills
+
+
+class RateLimiter:
+    """Token-bucket limiter refilled from GitHub's X-RateLimit-* headers.
+
+    Each API resource (core, search, graphql) has its own bucket. Acquiring a
+    token only sleeps when that bucket is exhausted, and then only until the
+    reset time GitHub reported. Every response refreshes the bucket from its
+    headers, so the local estimate never drifts far from the real quota.
+    """
+
+    def __init__(self, default_limits: Dict[str, int], reserve: int = 0):
+        self.default_limits = default_limits
+        self.reserve = reserve
+        self._buckets: Dict[str, RateLimitBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, resource: str) -> RateLimitBucket:
+        """Get the bucket for a resource, creating it from defaults if needed."""
+        bucket = self._buckets.get(resource)
+        if bucket is None:
+            limit = self.default_limits.get(resource, self.default_limits["core"])
+            bucket = RateLimitBucket(limit=limit, remaining=limit)
+            self._buckets[resource] = bucket
+        return bucket
+
+    def _try_acquire(self, resource: str, cost: int) -> float:
+        """Take tokens if available. Returns 0, or the seconds to wait."""
+        with self._lock:
+            bucket = self._bucket(resource)
+            now = time.time()
+
+            # The window has rolled over, so the full budget is available again
+            if bucket.reset_at is not None and now >= bucket.reset_at:
+                bucket.remaining = bucket.limit
+                bucket.reset_at = None
+
+            # Small buckets (search, unauthenticated) keep a proportional reserve
+            reserve = min(self.reserve, bucket.limit // 10)
+            if bucket.remaining - cost >= reserve:
+                bucket.remaining -= cost
+                return 0
+
+            if bucket.reset_at is None:
+                # Exhausted without a known reset time, so probe again shortly
+                return 60
+            return max(bucket.reset_at - now, 1)
+
+    def acquire(self, resource: str = "core", cost: int = 1):
+        """Block until a request against the resource fits in the budget."""
+        while True:
+            wait = self._try_acquire(resource, cost)
+            if not wait:
+                return
+            logger.warning(
+                f"GitHub {resource} rate limit exhausted, sleeping {wait:.0f}s until reset"
+            )
+            time.sleep(wait)
+
+    def update(
+        self,
+        resource: str,
+        remaining: int,
+        limit: Optional[int] = None,
+        reset_at: Optional[float] = None,
+    ):
+        """Refresh a bucket with the budget GitHub reported."""
+        with self._lock:
+            bucket = self._bucket(resource)
+            if limit is not None and limit > 0:
+                bucket.limit = limit
+
+            # Responses can arrive out of order; ignore ones from an older window
+            if (
+                reset_at is not None
+                and bucket.reset_at is not None
+                and reset_at < bucket.reset_at
+            ):
+                return
+
+            bucket.remaining = remaining
+            if reset_at is not None:
+                bucket.reset_at = reset_at
+
+    def update_from_headers(
+        self, headers: Mapping[str, str], resource: Optional[str] = None
+    ):
+        """Refresh a bucket from X-RateLimit-* response headers, if present."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+
+        resource = headers.get("X-RateLimit-Resource", resource or "core")
+        limit = headers.get("X-RateLimit-Limit")
+        reset = headers.get("X-RateLimit-Reset")
+        try:
+            self.update(
+                resource,
+                int(remaining),
+                int(limit) if limit else None,
+                float(reset) if reset else None,
+            )
+        except ValueError:
+            logger.debug(f"Ignoring malformed rate limit headers: {dict(headers)}")
+
+    def mark_exhausted(self, resource: str, reset: Optional[datetime] = None):
+        """Empty a bucket after GitHub rejected a request for rate limiting."""
+        self.update(resource, 0, reset_at=to_timestamp(reset) if reset else None)
+
+    def available(self, resource: str = "core") -> int:
+        """Get the usable budget for a resource, accounting for window resets."""
+        with self._lock:
+            bucket = self._bucket(resource)
+            if bucket.reset_at is not None and time.time() >= bucket.reset_at:
+                return bucket.limit
+            return max(bucket.remaining - min(self.reserve, bucket.limit // 10), 0)
+
+    def reset_at(self, resource: str = "core") -> Optional[float]:
+        """Get the timestamp at which a resource's budget refills, if known."""
+        with self._lock:
+            return self._bucket(resource).reset_at
+
+    def status(self) -> Dict[str, Dict]:
+        """Get a snapshot of every tracked bucket."""
+        with self._lock:
+            return {
+                resource: {
+                    "limit": bucket.limit,
+                    "remaining": bucket.remaining,
+                    "reset_at": bucket.reset_at,
+                }
+                for resource, bucket in self._buckets.items()
+            }
+
+
+def to_timestamp(value: datetime) -> float:
+    """Convert a PyGithub reset datetime (naive UTC or aware) to a timestamp."""
+    return calendar.timegm(value.utctimetuple())
@@ -0,0 +1,97 @@
+"""
+Canonical repository keys, so one repository is stored and fetched once
+however its URL is spelled.
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# https://github.com/o/n(.git), github.com/o/n, git@github.com:o/n.git,
+# ssh://git@github.com/o/n and https://swiftpackageindex.com/o/n(.git).
+# Owner and name must be whole path segments of the characters GitHub
+# allows, so interpolated or otherwise invalid segments never match.
+_REPOSITORY_URL = re.compile(
+    r"(?:^|[/@.])(?:github\.com|swiftpackageindex\.com)[:/]+"
+    r"([A-Za-z0-9_-][A-Za-z0-9._-]*)/([A-Za-z0-9._-]+)(?=[/?#\s]|$)",
+    re.IGNORECASE,
+)
+
+
+def parse_repository_url(url: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Return (owner, name) as spelled in a GitHub or SPI URL, or None."""
+    if not url:
+        return None
+    match = _REPOSITORY_URL.search(url.strip())
+    if not match:
+        return None
+    owner, name = match.groups()
+    # Only a trailing ".git" is a suffix; names like "swift.gitignore" keep theirs
+    if name.lower().endswith(".git"):
+        name = name[: -len(".git")]
+    return (owner, name) if name else None
+
+
+def repository_key(owner: Optional[str], name: Optional[str]) -> Optional[str]:
+    """Lowercase owner/name key; GitHub owners and names are case-insensitive."""
+    if not owner or not name:
+        return None
+    return f"{owner.strip()}/{name.strip()}".lower()
+
+
+def url_key(url: Optional[str]) -> Optional[str]:
+    """Canonical key of a repository URL, or None if it is not a GitHub URL."""
+    parsed = parse_repository_url(url)
+    return repository_key(*parsed) if parsed else None
+
+
+class RepositoryResolver:
+    """In-memory map from canonical key to the URL a repository is stored under.
+
+    Built with one query over the repo_key index, after which resolving a URL
+    is a dictionary lookup.
+    """
+
+    def __init__(self, urls: Optional[Dict[str, str]] = None):
+        self._urls = dict(urls or {})
+
+    @classmethod
+    def from_database(cls, db) -> "RepositoryResolver":
+        from src.models import Repository
+
+        return cls(
+            db.query(Repository.repo_key, Repository.url).filter(
+                Repository.repo_key.isnot(None)
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __contains__(self, url: str) -> bool:
+        return self.resolve(url) is not None
+
+    def resolve(self, url: str) -> Optional[str]:
+        """URL the same repository is stored under, or None if it is new."""
+        return self._urls.get(url_key(url))
+
+    def canonicalize(self, urls: Iterable[str]) -> List[str]:
+        """Map URLs to their stored spelling, keeping one URL per repository.
+
+        New repositories keep their first spelling and are registered, so
+        later spellings of them resolve to it. URLs that name no GitHub
+        repository are dropped.
+        """
+        canonical, seen = [], set()
+        for url in urls:
+            key = url_key(url)
+            if key is None:
+                logger.warning(f"Skipping unrecognized repository URL: {url}")
+                continue
+            if key in seen:
+                continue
+            seen.add(key)
+            canonical.append(self._urls.setdefault(key, url))
+        return canonical
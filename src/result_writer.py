@@ -0,0 +1,157 @@
+"""
+Batched persistence of collection results.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.models import ProcessingLog, Repository
+
+logger = logging.getLogger(__name__)
+
+REPOSITORY_COLUMNS = frozenset(Repository.__table__.columns.keys()) - {"id"}
+
+
+class BulkResultWriter:
+    """Buffers repository rows and processing logs and writes them in batches.
+
+    Repositories are written with INSERT ... ON CONFLICT(url) DO UPDATE, so
+    new and existing rows take the same path, and log rows with one bulk
+    INSERT, all in a single transaction per batch_size repositories. Rows
+    only update the columns they contain, so callers leave out anything that
+    must keep its stored value. Call flush() (or close()) before exiting;
+    buffered results are otherwise lost.
+    """
+
+    def __init__(self, db, batch_size: int = 50):
+        self.db = db
+        self.batch_size = max(1, batch_size)
+        self._rows: Dict[str, Dict] = {}
+        self._errors: Dict[str, Dict] = {}
+        self._logs: List[Dict] = []
+
+    @property
+    def pending(self) -> int:
+        """Number of repositories waiting to be written."""
+        return len(self._rows) + len(self._errors)
+
+    def upsert_repository(self, row: Dict):
+        """Buffer a repository row keyed by url, merging with any pending row."""
+        row = {key: value for key, value in row.items() if key in REPOSITORY_COLUMNS}
+        self._rows.setdefault(row["url"], {}).update(row)
+        self._errors.pop(row["url"], None)
+        self._maybe_flush()
+
+    def mark_error(self, url: str, error_message: str, failed_at: datetime):
+        """Buffer an error status for a stored repository (no-op if not stored)."""
+        self._errors[url] = {
+            "b_url": url,
+            "b_error": error_message,
+            "b_failed_at": failed_at,
+        }
+        self._maybe_flush()
+
+    def add_log(self, **fields):
+        """Buffer a ProcessingLog row."""
+        fields.setdefault("created_at", datetime.utcnow())
+        self._logs.append(fields)
+
+    def _maybe_flush(self):
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered in one transaction."""
+        if not (self._rows or self._errors or self._logs):
+            return
+
+        rows, errors, logs = self._rows, self._errors, self._logs
+        self._rows, self._errors, self._logs = {}, {}, []
+
+        try:
+            self._write(list(rows.values()), list(errors.values()), logs)
+            self.db.commit()
+            logger.debug(
+                f"Wrote {len(rows)} repositories, {len(errors)} errors and {len(logs)} log rows"
+            )
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Bulk write failed, retrying row by row: {e}")
+            self._write_individually(list(rows.values()), list(errors.values()), logs)
+
+    def _write(self, rows: List[Dict], errors: List[Dict], logs: List[Dict]):
+        """Execute the batched statements on the session's connection."""
+        connection = self.db.connection()
+
+        # executemany needs one column set per statement
+        groups: Dict[tuple, List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for columns, group in groups.items():
+            stmt = sqlite_insert(Repository)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Repository.url],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in columns
+                    if column != "url"
+                },
+            )
+            connection.execute(stmt, group)
+
+        if errors:
+            connection.execute(
+                update(Repository)
+                .where(Repository.url == bindparam("b_url"))
+                .values(
+                    processing_status="error",
+                    fetch_error=bindparam("b_error"),
+                    last_fetched=bindparam("b_failed_at"),
+                ),
+                errors,
+            )
+
+        if logs:
+            # Log rows differ in which optional columns they set
+            columns = set().union(*logs)
+            connection.execute(
+                insert(ProcessingLog),
+                [{column: log.get(column) for column in columns} for log in logs],
+            )
+
+    def _write_individually(
+        self, rows: List[Dict], errors: List[Dict], logs: List[Dict]
+    ):
+        """Write rows one transaction at a time so one bad row cannot sink a batch."""
+        for row in rows:
+            try:
+                self._write([row], [], [])
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Database error for {row['url']}: {e}")
+                logs.append(
+                    {
+                        "repository_url": row["url"],
+                        "action": "fetch_metadata",
+                        "status": "error",
+                        "message": f"Database error: {e}",
+                        "duration_seconds": 0,
+                        "created_at": datetime.utcnow(),
+                    }
+                )
+
+        try:
+            self._write([], errors, logs)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Could not write {len(logs)} processing log rows: {e}")
+
+    def close(self):
+        """Flush any buffered results."""
+        self.flush()
@@ -0,0 +1,360 @@
+"""
+Swift Package Index compatibility extraction.
+"""
+
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Indicator lists used by the platform badge checks. Each list is compiled into
+# one alternation, which matches exactly when any(indicator in text) would.
+ELEMENT_GREEN_INDICATORS = [
+    "green",
+    "success",
+    "enabled",
+    "supported",
+    "active",
+    # Swift Package Index enabled Android colors
+    "rgb(14, 191, 76)",
+    "rgb(255, 255, 255)",
+    "#0ebf4c",
+    "#ffffff",
+    # Swift Package Index CSS classes - be specific to avoid matching "incompatible"
+    "result compatible",
+    # Additional common green variations
+    "rgb(34, 197, 94)",
+    "rgb(22, 163, 74)",
+    "#22c55e",
+    "#16a34a",
+    "bg-green",
+    "text-green",
+    "border-green",
+]
+ELEMENT_GREY_INDICATORS = [
+    "grey",
+    "gray",
+    "disabled",
+    "inactive",
+    "muted",
+    "unavailable",
+    "incompatible",
+    # Swift Package Index disabled Android colors
+    "rgb(25, 25, 35)",
+    "rgb(154, 154, 154)",
+    "#191923",
+    "#9a9a9a",
+    # Swift Package Index CSS classes
+    "result incompatible",
+    "result unknown",
+    "unknown",
+    # Additional common grey variations
+    "rgb(156, 163, 175)",
+    "rgb(107, 114, 128)",
+    "#9ca3af",
+    "#6b7280",
+    "bg-gray",
+    "text-gray",
+    "border-gray",
+    "opacity-50",
+    "opacity-25",
+]
+CONTAINER_GREEN_INDICATORS = [
+    "green",
+    "success",
+    "enabled",
+    "supported",
+    "active",
+    "rgb(14, 191, 76)",
+    "rgb(255, 255, 255)",
+    "#0ebf4c",
+    "#ffffff",
+    "result compatible",
+    "rgb(34, 197, 94)",
+    "#22c55e",
+    "bg-green",
+]
+CONTAINER_GREY_INDICATORS = [
+    "grey",
+    "gray",
+    "disabled",
+    "inactive",
+    "muted",
+    "incompatible",
+    "rgb(25, 25, 35)",
+    "rgb(154, 154, 154)",
+    "#191923",
+    "#9a9a9a",
+    "result incompatible",
+    "result unknown",
+    "unknown",
+    "rgb(156, 163, 175)",
+    "#9ca3af",
+    "bg-gray",
+    "opacity-50",
+]
+ICON_GREEN_INDICATORS = ["green", "success", "enabled"]
+ICON_GREY_INDICATORS = ["grey", "gray", "disabled"]
+CONTAINER_KEYWORDS = ["platform", "compatibility", "support", "badge"]
+SUPPORT_PHRASES = ["android support", "supports android", "android compatible"]
+
+
+def _compile(indicators: List[str]) -> "re.Pattern":
+    """Compile indicator substrings into a single alternation."""
+    return re.compile("|".join(re.escape(indicator) for indicator in indicators))
+
+
+ELEMENT_GREEN = _compile(ELEMENT_GREEN_INDICATORS)
+ELEMENT_GREY = _compile(ELEMENT_GREY_INDICATORS)
+CONTAINER_GREEN = _compile(CONTAINER_GREEN_INDICATORS)
+CONTAINER_GREY = _compile(CONTAINER_GREY_INDICATORS)
+ICON_GREEN = _compile(ICON_GREEN_INDICATORS)
+ICON_GREY = _compile(ICON_GREY_INDICATORS)
+CONTAINER_CLASS = _compile(CONTAINER_KEYWORDS)
+SUPPORT_PHRASE = _compile(SUPPORT_PHRASES)
+
+# Tokens of an HTML document, in the order html.parser would see them
+HTML_TOKEN = re.compile(
+    r"<!--.*?-->"
+    r"|<![^>]*>"
+    r"|<\?[^>]*>"
+    r"|<(/?)([a-zA-Z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>",
+    re.S,
+)
+RAW_TEXT_END = {
+    "script": re.compile(r"</script", re.I),
+    "style": re.compile(r"</style", re.I),
+}
+ANDROID = re.compile("android")
+MATRIX_CLASS = re.compile(r"""class\s*=\s*["'][^"']*compatibility""", re.I)
+
+# Elements html.parser closes immediately, so they never become parents
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "basefont",
+    "bgsound",
+    "br",
+    "col",
+    "command",
+    "embed",
+    "frame",
+    "hr",
+    "image",
+    "img",
+    "input",
+    "isindex",
+    "keygen",
+    "link",
+    "menuitem",
+    "meta",
+    "nextid",
+    "param",
+    "source",
+    "spacer",
+    "track",
+    "wbr",
+}
+
+
+def extract_android_support(content: bytes) -> Optional[bool]:
+    """Determine Android support from a Swift Package Index page.
+
+    Only the compatibility matrix is parsed. Pages that never mention
+    Android are answered without parsing at all, and pages whose Android
+    mentions are not all inside the matrix are parsed in full. Either way
+    the verdict comes from the platform styling checks, then the page text.
+    """
+    if b"android" not in content.lower():
+        return False
+
+    try:
+        fragment = slice_compatibility_matrix(content.decode("utf-8"))
+    except UnicodeDecodeError:
+        fragment = None
+    if fragment == "":
+        # Android only appears in markup, scripts or comments
+        return False
+    if fragment is None:
+        logger.debug("Compatibility matrix not isolated, using full page parse")
+
+    try:
+        soup = BeautifulSoup(content if fragment is None else fragment, "html.parser")
+        verdict = _match_platform_styling(soup)
+        if verdict is not None:
+            return verdict
+
+        # Every support phrase mentions Android, so this is the legacy text check
+        return bool(SUPPORT_PHRASE.search(soup.get_text().lower()))
+    except Exception as e:
+        logger.warning(f"Error parsing SPI page content: {e}")
+        return None
+
+
+def slice_compatibility_matrix(document: str) -> Optional[str]:
+    """Cut out the compatibility matrix that holds every Android mention.
+
+    Only mentions the badge checks can see count: text, comments and image
+    alt/title/src attributes. The page is tokenized with a regex instead of
+    being parsed, and the fragment is wrapped in copies of its ancestors'
+    start tags so parent lookups see the same elements as in the full page.
+
+    Returns an empty string when the page has no such mention, and None when
+    mentions exist outside a single compatibility matrix.
+    """
+    mentions = [match.start() for match in ANDROID.finditer(document.lower())]
+    next_mention = 0
+
+    # Open elements as (tag name, start tag, start offset, content offset)
+    stack: List[Tuple[str, str, int, int]] = []
+    chain = None  # Open elements from the document root down to the matrix
+    closed = {}  # Start offset -> (close start, close end) for chain elements
+    position = 0
+
+    def mentions_before(offset: int) -> bool:
+        """Consume mentions before an offset, returning whether there were any."""
+        nonlocal next_mention
+        found = False
+        while next_mention < len(mentions) and mentions[next_mention] < offset:
+            next_mention += 1
+            found = True
+        return found
+
+    def claim() -> bool:
+        """Attribute a mention to the outermost open matrix element."""
+        nonlocal chain
+        depth = next(
+            (
+                index
+                for index, element in enumerate(stack)
+                if MATRIX_CLASS.search(element[1])
+            ),
+            None,
+        )
+        if depth is None:
+            return False
+        if chain is None:
+            chain = stack[: depth + 1]
+        return chain == stack[: depth + 1]
+
+    while True:
+        # Searching from the last position skips script and style contents
+        match = HTML_TOKEN.search(document, position)
+        if match is None:
+            break
+
+        # Text mentions between the previous token and this one
+        if mentions_before(match.start()) and not claim():
+            return None
+
+        position = match.end()
+        closing, name = match.group(1), match.group(2)
+        in_tag = mentions_before(match.end())
+        if not name:
+            # Comments become strings too; doctypes and instructions do not
+            if in_tag and match.group(0).startswith("<!--") and not claim():
+                return None
+            continue
+        name = name.lower()
+
+        if not closing:
+            if in_tag and name == "img" and not claim():
+                return None
+            if match.group(3).rstrip().endswith("/") or name in VOID_ELEMENTS:
+                continue
+            stack.append((name, match.group(0), match.start(), match.end()))
+            if name in RAW_TEXT_END:
+                end = RAW_TEXT_END[name].search(document, position)
+                position = end.start() if end else len(document)
+                mentions_before(position)
+            continue
+
+        # End tags close the most recent open element with the same name;
+        # anything opened inside it is closed implicitly at this point
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index][0] == name:
+                for element in stack[index + 1 :]:
+                    closed.setdefault(element[2], (match.start(), match.start()))
+                closed.setdefault(stack[index][2], (match.start(), match.end()))
+                del stack[index:]
+                break
+
+    if mentions_before(len(document)) and not claim():
+        return None
+    if chain is None:
+        return ""
+
+    end_of_document = (len(document), len(document))
+    root_start = chain[-1][2]
+    root_end = closed.get(root_start, end_of_document)[1]
+
+    # Wrap the fragment in its ancestors. An ancestor whose only child is the
+    # next element must stay that way, since that decides its .string
+    opening, closing_tags = [], []
+    for parent, child in zip(chain, chain[1:]):
+        parent_close = closed.get(parent[2], end_of_document)[0]
+        child_end = closed.get(child[2], end_of_document)[1]
+        only_child = not (
+            document[parent[3] : child[2]] or document[child_end:parent_close]
+        )
+        separator = "" if only_child else "\n"
+        opening.append(parent[1] + separator)
+        closing_tags.insert(0, separator + f"</{parent[0]}>")
+
+    return "".join(opening + [document[root_start:root_end]] + closing_tags)
+
+
+def _match_platform_styling(soup: BeautifulSoup) -> Optional[bool]:
+    """Run the badge, platform container and icon checks on a parsed page."""
+    # Platform badges/buttons with Android text, checked with up to 3 parents
+    android_elements = soup.find_all(
+        ["span", "div", "button", "a"],
+        string=lambda text: text and "android" in text.lower(),
+    )
+    for element in android_elements:
+        for elem in [element] + list(element.parents)[:3]:
+            verdict = _styling_verdict(elem, ELEMENT_GREEN, ELEMENT_GREY)
+            if verdict is not None:
+                return verdict
+
+    # Android entries inside platform grids/lists
+    platform_containers = soup.find_all(
+        ["div", "ul", "ol"],
+        class_=lambda x: x and CONTAINER_CLASS.search(str(x).lower()),
+    )
+    for container in platform_containers:
+        for child in container.find_all(["span", "div", "li", "button", "a"]):
+            if "android" in child.get_text().lower():
+                verdict = _styling_verdict(child, CONTAINER_GREEN, CONTAINER_GREY)
+                if verdict is not None:
+                    return verdict
+
+    # Android icons, judged by their parents' styling
+    for img in soup.find_all("img"):
+        attributes = [img.get(key, "").lower() for key in ("alt", "title", "src")]
+        if any("android" in text for text in attributes):
+            for parent in list(img.parents)[:3]:
+                verdict = _styling_verdict(parent, ICON_GREEN, ICON_GREY)
+                if verdict is not None:
+                    return verdict
+
+    return None
+
+
+def _styling_verdict(element, green: "re.Pattern", grey: "re.Pattern"):
+    """True for green styling, False for grey, None when neither is present."""
+    class_attr = element.get("class", [])
+    if isinstance(class_attr, str):
+        class_attr = [class_attr]
+    content_to_check = (
+        f"{element.get('style', '').lower()} {' '.join(class_attr).lower()}"
+    )
+
+    if green.search(content_to_check):
+        return True
+    if grey.search(content_to_check):
+        return False
+    return None
@@ -0,0 +1,130 @@
+"""
+Aggregate repository and transition statistics for the status dashboards.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func
+
+from src.models import (
+    PACKAGE_STATES,
+    Repository,
+    StateTransition,
+    TransitionSummary,
+)
+
+
+def _count_if(condition):
+    """SUM of rows matching a condition, for use inside an aggregate query."""
+    return func.sum(case((condition, 1), else_=0))
+
+
+def get_transition_summary(db) -> Dict[str, Any]:
+    """Read transition totals from the maintained summary table.
+
+    Costs one row per state, however many transitions have been recorded.
+    by_state is in the order each state was first reached.
+    """
+    stats = {"total": 0, "github_issue": 0, "manual": 0, "by_state": {}}
+    for row in db.query(TransitionSummary).order_by(TransitionSummary.id):
+        stats["total"] += row.total
+        stats["github_issue"] += row.github_issue
+        stats["by_state"][row.to_state] = row.total
+    stats["manual"] = stats["total"] - stats["github_issue"]
+    return stats
+
+
+def recent_transitions(db, limit: int = 20) -> List[Dict[str, Any]]:
+    """Get the latest transitions, newest first, with repository names."""
+    rows = (
+        db.query(StateTransition, Repository.owner, Repository.name)
+        .outerjoin(Repository, Repository.id == StateTransition.repository_id)
+        .order_by(StateTransition.id.desc())
+        .limit(limit)
+    )
+    transitions = []
+    for transition, owner, name in rows:
+        transaction_data = {
+            "repository_url": transition.repository_url,
+            "owner": owner,
+            "name": name,
+            "from_state": transition.from_state,
+            "to_state": transition.to_state,
+            "reason": transition.reason,
+            "changed_by": transition.changed_by,
+            "date": (
+                transition.created_at.isoformat() if transition.created_at else None
+            ),
+        }
+        if transition.issue_number:
+            transaction_data["github_issue"] = transition.issue_number
+        transitions.append(transaction_data)
+    return transitions
+
+
+def get_stats(db, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Compute every status dashboard figure without loading rows.
+
+    Repositories are aggregated with one GROUP BY over (processing_status,
+    current_state) and transitions are read from the summary table.
+    """
+    now = now or datetime.utcnow()
+    one_day_ago = now - timedelta(days=1)
+    one_week_ago = now - timedelta(days=7)
+    rated = Repository.stars != 0
+
+    groups = db.query(
+        Repository.processing_status,
+        Repository.current_state,
+        func.count(),
+        _count_if(Repository.has_package_swift.is_(True)),
+        func.sum(case((rated, Repository.stars))),
+        func.count(case((rated, Repository.stars))),
+        _count_if(Repository.last_fetched > one_day_ago),
+        _count_if(
+            (Repository.last_fetched <= one_day_ago)
+            & (Repository.last_fetched > one_week_ago)
+        ),
+        _count_if(Repository.last_fetched <= one_week_ago),
+        _count_if(Repository.last_fetched.is_(None)),
+    ).group_by(Repository.processing_status, Repository.current_state)
+
+    stats = {
+        "total_repositories": 0,
+        "processing_status": {"completed": 0, "error": 0, "pending": 0},
+        "completed_repositories": 0,
+        "average_stars": None,
+        "with_package_swift": 0,
+        "states": {state: 0 for state in PACKAGE_STATES},
+        "freshness": {
+            "fresh_1_day": 0,
+            "recent_1_week": 0,
+            "stale_older": 0,
+            "never_fetched": 0,
+        },
+    }
+    freshness_keys = list(stats["freshness"])
+    star_total = star_count = 0
+
+    for status, state, count, with_manifest, stars, rated_count, *fresh in groups:
+        stats["total_repositories"] += count
+        statuses = stats["processing_status"]
+        statuses[status] = statuses.get(status, 0) + count
+        for key, value in zip(freshness_keys, fresh):
+            stats["freshness"][key] += value or 0
+
+        if status != "completed":
+            continue
+        stats["completed_repositories"] += count
+        stats["with_package_swift"] += with_manifest or 0
+        stats["states"][state] = stats["states"].get(state, 0) + count
+        star_total += stars or 0
+        star_count += rated_count
+
+    # Repositories without stars are left out of the average
+    if star_count:
+        stats["average_stars"] = star_total / star_count
+
+    stats["transitions"] = get_transition_summary(db)
+    return stats
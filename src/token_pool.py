@@ -0,0 +1,92 @@
+"""
+Pool of GitHub API tokens with per-token rate limit tracking.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from github import Github
+
+from src.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledToken:
+    """A GitHub client together with the rate limit budget of its token."""
+
+    label: str  # Safe to log, never the token itself
+    token: Optional[str]
+    github: Github
+    rate_limiter: RateLimiter
+
+
+class TokenPool:
+    """Routes requests to the token with the most remaining quota.
+
+    Each token gets its own PyGithub client and RateLimiter, so throughput
+    grows with the number of tokens. When a token hits its limit it is marked
+    exhausted and subsequent requests fail over to the healthiest remaining one.
+    """
+
+    def __init__(
+        self, tokens: List[str], requests_per_hour: int = 5000, reserve: int = 0
+    ):
+        self._lock = threading.Lock()
+        self.tokens: List[PooledToken] = []
+
+        for index, token in enumerate(tokens or [None]):
+            if token:
+                limits = {
+                    "core": requests_per_hour,
+                    "search": 30,
+                    "graphql": requests_per_hour,
+                }
+            else:
+                limits = {"core": 60, "search": 10, "graphql": 0}
+            self.tokens.append(
+                PooledToken(
+                    label=f"token-{index + 1}" if token else "anonymous",
+                    token=token,
+                    github=Github(token) if token else Github(),
+                    rate_limiter=RateLimiter(limits, reserve=reserve),
+                )
+            )
+
+        logger.info(f"Token pool initialized with {len(self.tokens)} token(s)")
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def authenticated(self) -> bool:
+        """Whether the pool holds at least one real token."""
+        return any(pooled.token for pooled in self.tokens)
+
+    def acquire(self, resource: str = "core") -> PooledToken:
+        """Pick the healthiest token for a resource.
+
+        If every token is exhausted, the one that resets first is returned and
+        its rate limiter will sleep until the reset.
+        """
+        with self._lock:
+            return max(
+                self.tokens,
+                key=lambda pooled: (
+                    pooled.rate_limiter.available(resource),
+                    -(pooled.rate_limiter.reset_at(resource) or 0),
+                ),
+            )
+
+    def has_available(self, resource: str = "core") -> bool:
+        """Whether any token still has budget left for a resource."""
+        return any(
+            pooled.rate_limiter.available(resource) > 0 for pooled in self.tokens
+        )
+
+    def status(self) -> Dict[str, Dict]:
+        """Get the rate limit status of every token in the pool."""
+        return {pooled.label: pooled.rate_limiter.status() for pooled in self.tokens}
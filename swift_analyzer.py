@@ -13,12 +13,17 @@ from src.config import config
 from src.cli import (
     init_database,
     show_status,
-    export_data,
+    print_export_summary,
+    rebuild_summary,
     set_package_state,
     list_states,
 )
+from src.dependency_graph import DependencyGraph
 from src.fetcher import DataProcessor
-from src.analyzer import PackageAnalyzer
+from src.models import SessionLocal, checkpoint_database, upgrade_schema
+from src.priority import PriorityScorer
+from src.analyzer import ANALYSIS_COLUMNS, PackageAnalyzer
+from src.exporter import export_repositories
 
 
 def setup_command(args):
@@ -45,9 +50,27 @@ def collect_command(args):
     else:
         print(f"Using batch size: {args.batch_size}")
 
+    if args.concurrency > 1:
+        print(f"Using concurrency: {args.concurrency} parallel GitHub fetches")
+
+    if args.parse_workers > 0:
+        print(f"Using {args.parse_workers} parse worker processes")
+
+    if args.graphql:
+        print(
+            f"Using batched GraphQL metadata fetch ({config.graphql_batch_size}/query)"
+        )
+
+    if args.incremental:
+        print("Using incremental refresh (unchanged repositories are only probed)")
+
     print("Running simplified chunked data collection...")
 
-    processor = DataProcessor()
+    processor = DataProcessor(
+        use_graphql=args.graphql,
+        incremental=args.incremental,
+        parse_workers=args.parse_workers,
+    )
     urls = processor.load_csv_repositories()
 
     if not urls:
@@ -55,7 +78,9 @@ def collect_command(args):
         return
 
     # Process chunk (batch_size determines chunk size)
-    results = processor.process_chunk(urls, chunk_size=args.batch_size)
+    results = processor.process_chunk(
+        urls, chunk_size=args.batch_size, concurrency=args.concurrency
+    )
 
     processor.close()
 
@@ -63,11 +88,13 @@ def collect_command(args):
     print(f"  Processed: {results.get('processed', 0)} repositories")
     print(f"  Success: {results['success']}")
     print(f"  Errors: {results['error']}")
+    if args.incremental:
+        print(f"  Unchanged: {results.get('unchanged', 0)}")
     print(f"  Total available: {results.get('total_available', 0)}")
 
     if results.get("processed", 0) > 0:
         print(
-            f"  Success rate: {(results['success'] / results.get('processed', 1)) * 100:.1f}%"
+            f"  Success rate: {((results['success'] + results.get('unchanged', 0)) / results.get('processed', 1)) * 100:.1f}%"
         )
 
     # Show freshness status
@@ -78,11 +105,54 @@ def collect_command(args):
     print(f"  Stale (> 7 days): {status['freshness']['stale_older']}")
     print(f"  Never fetched: {status['freshness']['never_fetched']}")
 
+    print(f"\nStages due for refresh:")
+    for stage, count in status["due_stages"].items():
+        print(f"  {stage.capitalize()}: {count}")
+
     # Show updated status
     print("\nUpdated repository status:")
     show_status(args)
 
 
+def crawl_command(args):
+    """Discover and collect dependencies of tracked packages, breadth first."""
+    from src.crawler import DependencyCrawler
+
+    if not config.github_token and args.budget == config.crawl_request_budget:
+        # Stay within the unauthenticated hourly limit
+        args.budget = 50
+        print(f"Using reduced request budget: {args.budget} (no GitHub token)")
+    print(
+        f"Crawling dependencies up to depth {args.max_depth} "
+        f"with a budget of {args.budget} GitHub requests"
+    )
+
+    processor = DataProcessor(
+        use_graphql=args.graphql,
+        parse_workers=args.parse_workers,
+        new_state="dependency",
+    )
+    try:
+        crawler = DependencyCrawler(processor, args.max_depth, args.budget)
+        results = crawler.run(args.batch_size, concurrency=args.concurrency)
+        frontier = crawler.frontier_status()
+    finally:
+        processor.close()
+
+    print(f"\nCrawl completed:")
+    print(f"  Newly queued: {results['queued']}")
+    print(f"  Fetched: {results['fetched']}")
+    print(f"  Errors: {results['error']}")
+    print(f"  GitHub requests: {results['requests']}/{args.budget}")
+
+    print(f"\nDependency frontier:")
+    if not frontier:
+        print("  No dependencies outside the dataset found yet")
+    for depth, statuses in frontier.items():
+        counts = ", ".join(f"{status}: {count}" for status, count in statuses.items())
+        print(f"  Depth {depth}: {counts}")
+
+
 def analyze_command(args):
     """Generate comprehensive analysis, reports, and exports."""
     # Set output directory default
@@ -91,9 +161,30 @@ def analyze_command(args):
 
     print("Running comprehensive analysis with all outputs...")
 
+    # Refresh every priority score first; the activity component decays
+    # with time even for repositories that were not collected. The graph
+    # does not depend on scores, so the dependency analysis reuses it
+    db = SessionLocal()
+    try:
+        graph = DependencyGraph.from_database(db)
+        PriorityScorer(db).rescore(graph=graph)
+    finally:
+        db.close()
+
     analyzer = PackageAnalyzer()
 
     try:
+        # Read the repositories once: the same pass writes every export
+        # format and loads the rows the analysis needs
+        outputs = {
+            "csv": f"{args.output_dir}/swift_packages.csv",
+            "json": f"{args.output_dir}/swift_packages.json",
+        }
+        summary = export_repositories(
+            analyzer.db, outputs, keep_columns=ANALYSIS_COLUMNS
+        )
+        analyzer.use_repositories(summary["repositories"] if summary else [])
+
         # Show current statistics
         print("\nCurrent Statistics:")
         popularity = analyzer.generate_popularity_analysis()
@@ -101,20 +192,31 @@ def analyze_command(args):
             print(f"📊 Total Repositories: {popularity['total_repositories']}")
             print(f"⭐ Average Stars: {popularity['star_statistics']['mean']:.1f}")
 
-        # Export data in both formats
+        priorities = analyzer.generate_priority_analysis(limit=5)
+        if "error" not in priorities:
+            print("\nTop Migration Priorities:")
+            for repo in priorities["top_priorities"]:
+                print(
+                    f"  {repo['owner']}/{repo['name']}: {repo['priority_score']:.1f} "
+                    f"({repo['stars']} stars, {repo['transitive_dependents']} dependents)"
+                )
+
+        dependencies = analyzer.generate_dependency_analysis(limit=5, graph=graph)
+        if "error" not in dependencies:
+            print(
+                f"🔗 Dependencies between tracked packages: {dependencies['internal_dependencies']}"
+            )
+            print("\nHighest Dependency Impact:")
+            for package in dependencies["most_depended_upon"]:
+                print(
+                    f"  {package['package']}: {package['transitive_dependents']} dependents "
+                    f"({package['direct_dependents']} direct)"
+                )
+
+        # Report the exports in both formats
         print("\nExporting data...")
-
-        # Export CSV
-        csv_args = argparse.Namespace(
-            format="csv", output=f"{args.output_dir}/swift_packages.csv"
-        )
-        export_data(csv_args)
-
-        # Export JSON
-        json_args = argparse.Namespace(
-            format="json", output=f"{args.output_dir}/swift_packages.json"
-        )
-        export_data(json_args)
+        for output in outputs.values():
+            print_export_summary(summary, output)
 
         print(f"\nAnalysis complete! All outputs available in: {args.output_dir}/")
 
@@ -137,6 +239,11 @@ def list_states_command(args):
     list_states(args)
 
 
+def rebuild_summary_command(args):
+    """Rebuild the transition summary table."""
+    rebuild_summary(args)
+
+
 def main():
     """Main CLI entry point with flag-based commands."""
     parser = argparse.ArgumentParser(
@@ -149,10 +256,16 @@ Examples:
   swift-analyzer --collect                            # Fetch data with smart chunked processing
   swift-analyzer --collect --test                     # Test with small batch
   swift-analyzer --collect --batch-size 250           # Large batch refresh
+  swift-analyzer --collect --batch-size 1065 --concurrency 8  # Full concurrent refresh
+  swift-analyzer --collect --concurrency 8 --parse-workers 4  # Parse on 4 cores
+  swift-analyzer --collect --graphql                  # Batched GraphQL metadata fetch
+  swift-analyzer --collect --incremental              # Refresh only changed repositories
+  swift-analyzer --crawl --max-depth 2 --budget 500   # Collect dependencies of tracked packages
   swift-analyzer --analyze                            # Generate all analysis and exports
   swift-analyzer --status                             # Check processing status
   
   swift-analyzer --list-states                        # Show available package states
+  swift-analyzer --rebuild-summary                    # Recount transitions after manual edits
   swift-analyzer --set-state --owner apple --name swift-format --state migrated --reason "Successfully ported"
   swift-analyzer --set-state --url https://github.com/apple/swift-format --state in_progress
 
@@ -174,6 +287,11 @@ Automation:
     command_group.add_argument(
         "--collect", action="store_true", help="Fetch repository data from GitHub"
     )
+    command_group.add_argument(
+        "--crawl",
+        action="store_true",
+        help="Discover and collect dependencies of tracked packages",
+    )
     command_group.add_argument(
         "--analyze",
         action="store_true",
@@ -194,6 +312,11 @@ Automation:
         action="store_true",
         help="List available package states",
     )
+    command_group.add_argument(
+        "--rebuild-summary",
+        action="store_true",
+        help="Recompute the transition summary from the state transition ledger",
+    )
 
     # Collect options
     parser.add_argument(
@@ -202,10 +325,46 @@ Automation:
         default=config.repositories_per_batch,
         help=f"Repositories per batch (default: {config.repositories_per_batch})",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=config.collection_concurrency,
+        help=f"Repositories in the GitHub stage at once (default: {config.collection_concurrency})",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=config.parse_workers,
+        help=f"Processes for parsing SPI pages and manifests, 0 = inline (default: {config.parse_workers})",
+    )
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="Fetch metadata in batched GraphQL queries (requires GitHub token)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Probe for changes first and only fully refresh changed repositories",
+    )
     parser.add_argument(
         "--test", action="store_true", help="Run small test batch (3 repositories)"
     )
 
+    # Crawl options
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=config.crawl_max_depth,
+        help=f"Dependency hops below tracked packages to crawl (default: {config.crawl_max_depth})",
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=config.crawl_request_budget,
+        help=f"GitHub requests one crawl may use (default: {config.crawl_request_budget})",
+    )
+
     # Analyze options
     parser.add_argument(
         "--output-dir",
@@ -263,10 +422,15 @@ Automation:
 
     # Execute the appropriate command
     try:
+        # Bring databases created by older versions up to the current schema
+        upgrade_schema()
+
         if args.setup:
             setup_command(args)
         elif args.collect:
             collect_command(args)
+        elif args.crawl:
+            crawl_command(args)
         elif args.analyze:
             analyze_command(args)
         elif args.status:
@@ -275,12 +439,17 @@ Automation:
             set_state_command(args)
         elif args.list_states:
             list_states_command(args)
+        elif args.rebuild_summary:
+            rebuild_summary_command(args)
     except KeyboardInterrupt:
         print("\nOperation cancelled by user")
         sys.exit(1)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        # Leave a self-contained database file for the workflows to commit
+        checkpoint_database()
 
 
 if __name__ == "__main__":